@@ -1,5 +1,6 @@
 import streamlit as st
-import pandas as pd
+
+from aggregates import churn_kpis, get_cube
 
 # ------------------ PAGE CONFIG ------------------
 st.set_page_config(
@@ -7,23 +8,21 @@ st.set_page_config(
     layout="wide"
 )
 
-# ------------------ LOAD RAW DATA ------------------
-@st.cache_data
-def load_data():
-    # 🔁 Update path if required
-    return pd.read_csv(r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\indian_bank_customer_churn.csv")
-
-df = load_data()
+# ------------------ LOAD AGGREGATES ------------------
+# Small precomputed cube, built once per dataset version
+cube = get_cube()
 
 # ------------------ KPI CALCULATIONS ------------------
-total_customers = df.shape[0]
-churned_customers = df[df["Churn"] == 1].shape[0]
-retained_customers = df[df["Churn"] == 0].shape[0]
+kpis = churn_kpis(cube)
+
+total_customers = kpis["total_customers"]
+churned_customers = kpis["churned_customers"]
+retained_customers = kpis["retained_customers"]
 
-active_customers = df[df["Is_Active_Member"] == 1].shape[0]
-inactive_customers = df[df["Is_Active_Member"] == 0].shape[0]
+active_customers = kpis["active_customers"]
+inactive_customers = kpis["inactive_customers"]
 
-churn_rate = round((churned_customers / total_customers) * 100, 2)
+churn_rate = kpis["churn_rate"]
 
 # ------------------ HEADER ------------------
 st.title("🏦 AI-Powered Bank Customer Churn Prediction")
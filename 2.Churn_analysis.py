@@ -1,24 +1,18 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
+import churn_db
+from aggregates import box_figure, churn_box, counts_by, get_cube
+
 # ------------------ PAGE CONFIG ------------------
 st.set_page_config(
     page_title="Churn Analysis & Visuals",
     layout="wide"
 )
 
-# ------------------ LOAD RAW DATA ------------------
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\indian_bank_customer_churn.csv"
-    )
-
-df = load_data()
-
-# Map churn labels for readability
-df["Churn_Label"] = df["Churn"].map({0: "Retained", 1: "Churned"})
+# ------------------ LOAD AGGREGATES ------------------
+# Charts are drawn from a small precomputed cube, not from raw customer rows
+cube = get_cube()
 
 # ------------------ HEADER ------------------
 st.title("📊 Churn Analysis & Visual Insights")
@@ -35,7 +29,7 @@ st.divider()
 # ================== 1️⃣ OVERALL CHURN DISTRIBUTION ==================
 st.header("1️⃣ Overall Churn Distribution")
 
-churn_counts = df["Churn_Label"].value_counts().reset_index()
+churn_counts = counts_by(cube, "Churn")[["Churn_Label", "Customers"]]
 churn_counts.columns = ["Churn Status", "Customer Count"]
 
 fig_churn = px.pie(
@@ -57,9 +51,10 @@ st.divider()
 # ================== 2️⃣ CHURN BY GENDER ==================
 st.header("2️⃣ Churn by Gender")
 
-fig_gender = px.histogram(
-    df,
+fig_gender = px.bar(
+    counts_by(cube, "Gender"),
     x="Gender",
+    y="Customers",
     color="Churn_Label",
     barmode="group",
     title="Churn Distribution by Gender",
@@ -83,9 +78,10 @@ st.divider()
 # ================== 3️⃣ CHURN BY GEOGRAPHY ==================
 st.header("3️⃣ Churn by Geography")
 
-fig_geo = px.histogram(
-    df,
+fig_geo = px.bar(
+    counts_by(cube, "State"),
     x="State",
+    y="Customers",
     color="Churn_Label",
     barmode="group",
     title="Churn Distribution by Geography",
@@ -109,9 +105,10 @@ st.divider()
 # ================== 4️⃣ CHURN VS ACTIVE MEMBER ==================
 st.header("4️⃣ Churn vs Active Membership")
 
-fig_active = px.histogram(
-    df,
+fig_active = px.bar(
+    counts_by(cube, "Is_Active_Member"),
     x="Is_Active_Member",
+    y="Customers",
     color="Churn_Label",
     barmode="group",
     title="Churn vs Active Membership",
@@ -136,12 +133,11 @@ st.divider()
 # ================== 5️⃣ CREDIT SCORE VS CHURN ==================
 st.header("5️⃣ Credit Score vs Churn")
 
-fig_credit = px.box(
-    df,
-    x="Churn_Label",
-    y="Credit_Score",
+# Quartiles, whiskers and a capped outlier sample are computed server-side
+fig_credit = box_figure(
+    *churn_box(cube, "Credit_Score"),
     title="Credit Score Distribution by Churn Status",
-    labels={"Churn_Label": "Customer Status"}
+    y_title="Credit_Score"
 )
 
 st.plotly_chart(fig_credit, use_container_width=True)
@@ -155,12 +151,10 @@ st.divider()
 # ================== 6️⃣ ESTIMATED SALARY VS CHURN ==================
 st.header("6️⃣ Estimated Salary vs Churn")
 
-fig_salary = px.box(
-    df,
-    x="Churn_Label",
-    y="Estimated_Salary_INR",
+fig_salary = box_figure(
+    *churn_box(cube, "Estimated_Salary_INR"),
     title="Estimated Salary Distribution by Churn Status",
-    labels={"Churn_Label": "Customer Status"}
+    y_title="Estimated_Salary_INR"
 )
 
 st.plotly_chart(fig_salary, use_container_width=True)
@@ -169,6 +163,67 @@ st.markdown(
     "🔍 **Insight:** Estimated salary alone does not strongly differentiate churn behavior."
 )
 
+# ================== 7️⃣ SEGMENT EXPLORER ==================
+st.divider()
+st.header("7️⃣ Segment Explorer")
+
+all_option = "All"
+s1, s2, s3, s4 = st.columns(4)
+with s1:
+    seg_state = st.selectbox("State", [all_option] + sorted(cube["counts"]["State"].astype(str).unique()))
+with s2:
+    seg_account = st.selectbox(
+        "Account Type", [all_option] + sorted(cube["counts"]["Account_Type"].astype(str).unique())
+    )
+with s3:
+    seg_active = st.selectbox("Active Member", [all_option, "Yes", "No"])
+with s4:
+    seg_gender = st.selectbox("Gender", [all_option] + sorted(cube["counts"]["Gender"].astype(str).unique()))
+
+segment = {
+    col: value for col, value in (
+        ("State", seg_state), ("Account_Type", seg_account),
+        ("Is_Active_Member", {"Yes": 1, "No": 0}.get(seg_active, all_option)),
+        ("Gender", seg_gender),
+    ) if value != all_option
+}
+
+if churn_db.available():
+    # Filtered COUNT / SUM run inside the store, on the segment index
+    from artifacts import get_artifacts
+
+    conn = churn_db.get_connection()
+    model_version = get_artifacts().model_version
+    seg = churn_db.segment_stats(
+        conn, segment,
+        model_version=model_version if churn_db.has_predictions(conn, model_version) else None
+    )
+    seg_source = f"embedded store · {seg['seconds'] * 1000:.1f} ms"
+else:
+    counts = cube["counts"]
+    mask = None
+    for col, value in segment.items():
+        match = counts[col].astype(str) == str(value)
+        mask = match if mask is None else mask & match
+    rows = counts if mask is None else counts[mask]
+    customers = int(rows["Customers"].sum())
+    churned = int(rows.loc[rows["Churn"] == 1, "Customers"].sum())
+    seg = {"customers": customers, "churned": churned, "avg_probability": None,
+           "churn_rate": churned / customers if customers else 0.0}
+    seg_source = "precomputed cube"
+
+m1, m2, m3, m4 = st.columns(4)
+with m1:
+    st.metric("👥 Customers", f"{seg['customers']:,}")
+with m2:
+    st.metric("❌ Churned", f"{seg['churned']:,}")
+with m3:
+    st.metric("📉 Churn Rate", f"{seg['churn_rate']:.2%}")
+with m4:
+    st.metric("🔮 Avg. Predicted Risk",
+              f"{seg['avg_probability']:.2%}" if seg["avg_probability"] is not None else "—")
+st.caption(f"Answered from the {seg_source}")
+
 # ------------------ FINAL NOTE ------------------
 st.divider()
 
@@ -1,5 +1,7 @@
 import streamlit as st
-import pandas as pd
+
+import churn_db
+from data_access import load_featured
 
 # ------------------ PAGE CONFIG ------------------
 st.set_page_config(
@@ -8,13 +10,13 @@ st.set_page_config(
 )
 
 # ------------------ LOAD FEATURED DATA ------------------
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\indian_bank_customer_churn_featured1.csv"
-    )
-
-df = load_data()
+if churn_db.available():
+    # Only the preview rows leave the embedded store
+    preview, n_columns = churn_db.featured_preview(churn_db.get_connection())
+else:
+    # Raw frame shared with the other pages + the four engineered columns
+    df = load_featured()
+    preview, n_columns = df.head(10), df.shape[1]
 
 # ------------------ HEADER ------------------
 st.title("🧠 Feature Engineering & Preprocessing")
@@ -87,7 +89,7 @@ with col2:
     st.metric("Engineered Features Added", 4)
 
 with col3:
-    st.metric("Total Features After Engineering", df.shape[1])
+    st.metric("Total Features After Engineering", n_columns)
 
 st.divider()
 
@@ -98,7 +100,7 @@ st.markdown(
     "Below is a preview of the dataset after feature engineering:"
 )
 
-st.dataframe(df.head(10), use_container_width=True)
+st.dataframe(preview, use_container_width=True)
 
 st.divider()
 
@@ -1,20 +1,30 @@
+import plotly.graph_objects as go
 import streamlit as st
-import pandas as pd
-import numpy as np
-import pickle
+import time
 
-# ---------------- LOAD ARTIFACTS ----------------
-with open(r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\xgb_model.pkl", "rb") as f:
-    model = pickle.load(f)
-
-with open(r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\scaler.pkl", "rb") as f:
-    scaler = pickle.load(f)
+from artifacts import get_artifacts, artifact_stats
+from audit_log import get_audit_log
+from batch_scoring import score_file
+from explain import get_explainer
+from micro_batcher import get_batcher
 
-with open(r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\encoder.pkl", "rb") as f:
-    encoder = pickle.load(f)
+rerun_start = time.perf_counter()
 
-with open(r"C:\Users\dhama\Desktop\IndiaBankChurnPrediction\model_features.pkl", "rb") as f:
-    final_feature_names = pickle.load(f)
+# ---------------- LOAD ARTIFACTS ----------------
+# Shared across sessions and pages; reloaded only when the files on disk change
+artifacts = get_artifacts()
+
+model = artifacts.model
+transformer = artifacts.transformer
+predictor = artifacts.predictor
+# Decision cut-off and action bands chosen by thresholds.py, saved in the bundle
+thresholds = artifacts.thresholds
+# Shared across sessions: concurrent predictions are coalesced into one booster call
+batcher = get_batcher(artifacts)
+# TreeSHAP reason codes; repeated customers come from its LRU cache
+explainer = get_explainer(artifacts)
+# Every score is recorded; a background thread writes the records to disk
+audit_log = get_audit_log()
 
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(
@@ -57,58 +67,40 @@ state = st.selectbox(
 
 account_type = st.selectbox("🏦 Account Type", ["Savings", "Salary"])
 
-# ---------------- FEATURE ENGINEERING ----------------
+# ---------------- RAW INPUT ----------------
 has_cc = 1 if has_cc == "Yes" else 0
 active = 1 if active == "Yes" else 0
 
-balance_to_salary = balance / salary if salary > 0 else 0
-tenure_numproducts = tenure * num_products
-low_credit_score = 1 if credit_score < 600 else 0
-highbalance_lowactivity = 1 if (balance > 100000 and active == 0) else 0
-
-# ---------------- CREATE INPUT DF ----------------
-input_df = pd.DataFrame({
-    "Age": [age],
-    "Tenure_Years": [tenure],
-    "Balance_INR": [balance],
-    "Num_Products": [num_products],
-    "Has_Credit_Card": [has_cc],
-    "Is_Active_Member": [active],
-    "Estimated_Salary_INR": [salary],
-    "Credit_Score": [credit_score],
-    "Balance_to_Salary": [balance_to_salary],
-    "Tenure_NumProducts": [tenure_numproducts],
-    "Low_Credit_Score": [low_credit_score],
-    "HighBalance_LowActivity": [highbalance_lowactivity],
-    "Gender": [gender],
-    "State": [state],
-    "Account_Type": [account_type]
-})
-
-# ---------------- PREPROCESS ----------------
-num_cols = [
-    "Age", "Tenure_Years", "Balance_INR", "Num_Products",
-    "Has_Credit_Card", "Is_Active_Member",
-    "Estimated_Salary_INR", "Credit_Score",
-    "Balance_to_Salary", "Tenure_NumProducts",
-    "Low_Credit_Score", "HighBalance_LowActivity"
-]
-
-cat_cols = ["Gender", "State", "Account_Type"]
-
-X_num = scaler.transform(input_df[num_cols])
-X_cat = encoder.transform(input_df[cat_cols])
-
-X_final = np.concatenate([X_num, X_cat], axis=1)
-X_final = pd.DataFrame(X_final, columns=final_feature_names)
+customer = {
+    "Age": age,
+    "Tenure_Years": tenure,
+    "Balance_INR": balance,
+    "Num_Products": num_products,
+    "Has_Credit_Card": has_cc,
+    "Is_Active_Member": active,
+    "Estimated_Salary_INR": salary,
+    "Credit_Score": credit_score,
+    "Gender": gender,
+    "State": state,
+    "Account_Type": account_type
+}
 
 # ---------------- PREDICTION ----------------
 st.divider()
 
 if st.button("🔍 Predict Churn", use_container_width=True):
     with st.spinner("Analyzing customer behavior..."):
-        prob = model.predict_proba(X_final)[0][1]
-        prediction = model.predict(X_final)[0]
+        # Fast path: float32 feature row (no pandas / sklearn), scored via the shared batcher
+        feature_row = predictor.feature_row(customer)
+        try:
+            prob = float(batcher.predict(feature_row)[0])
+        except (RuntimeError, TimeoutError):
+            # Another session reloaded the model mid-run, or the shared worker is stuck:
+            # score this row with our own copy
+            prob = float(model.get_booster().inplace_predict(feature_row)[0])
+        prediction = int(prob > predictor.threshold)
+        contributions = explainer.explain_row(feature_row)
+        audit_log.log(customer, prob, prediction, artifacts.model_version, "live_page")
 
     st.subheader("📊 Prediction Result")
 
@@ -119,9 +111,110 @@ if st.button("🔍 Predict Churn", use_container_width=True):
 
     st.progress(int(prob * 100))
 
-    if prob > 0.7:
+    if prob > thresholds["high"]:
         st.warning("📢 Recommended Action: Immediate retention strategy required.")
-    elif prob > 0.4:
+    elif prob > thresholds["medium"]:
         st.info("📌 Recommended Action: Monitor customer engagement closely.")
     else:
         st.success("🎉 Customer is stable. No immediate action needed.")
+
+    # ---------------- REASON CODES ----------------
+    st.subheader("🧭 Why this prediction?")
+
+    reasons = [
+        explainer.group_names[i] for i in explainer.top_reasons(contributions)[0]
+        if contributions[i] > 0
+    ]
+    if reasons:
+        st.markdown("Top factors **raising** churn risk: " + ", ".join(f"**{r}**" for r in reasons))
+    else:
+        st.markdown("No factor raises this customer's churn risk above the baseline.")
+
+    order = contributions.argsort()
+    reason_fig = go.Figure(go.Bar(
+        x=contributions[order],
+        y=[explainer.group_names[i] for i in order],
+        orientation="h",
+        marker_color=["#d62728" if v > 0 else "#2ca02c" for v in contributions[order]]
+    ))
+    reason_fig.update_layout(
+        xaxis_title="Impact on churn log-odds (SHAP)", height=420,
+        margin=dict(l=0, r=0, t=10, b=0)
+    )
+    st.plotly_chart(reason_fig, use_container_width=True)
+
+# ---------------- BATCH PREDICTION ----------------
+st.divider()
+
+st.subheader("📂 Batch Prediction")
+st.markdown(
+    "Upload a **CSV / Parquet** file with the raw customer columns, or give a file path "
+    "on the server, to score the whole book in chunks."
+)
+
+uploaded_file = st.file_uploader("Upload customer file", type=["csv", "parquet"])
+server_path = st.text_input("...or server-side file path", "")
+with_reasons = st.checkbox("🧭 Add top-3 reason codes (slower: TreeSHAP per customer)")
+
+batch_source = uploaded_file if uploaded_file is not None else server_path.strip()
+
+if st.button("📊 Score File", use_container_width=True, disabled=not batch_source):
+    progress_text = st.empty()
+
+    with st.spinner("Scoring customers in chunks..."):
+        scored_df, batch_stats = score_file(
+            batch_source, model, transformer, threshold=thresholds["decision"],
+            progress=lambda rows: progress_text.text(f"Scored {rows:,} rows..."),
+            explainer=explainer if with_reasons else None,
+            audit=lambda chunk, probs, predictions: audit_log.log(
+                chunk, probs, predictions, artifacts.model_version, "live_page_batch", block=True
+            )
+        )
+
+    progress_text.empty()
+
+    b1, b2, b3, b4 = st.columns(4)
+
+    with b1:
+        st.metric("👥 Rows Scored", f"{batch_stats['rows']:,}")
+
+    with b2:
+        st.metric("⏱️ Time", f"{batch_stats['seconds']:.2f}s")
+
+    with b3:
+        st.metric("⚡ Rows / Second", f"{batch_stats['rows_per_sec']:,.0f}")
+
+    with b4:
+        churn_share = scored_df["Churn_Prediction"].mean() if len(scored_df) else 0
+        st.metric("⚠️ Predicted Churn", f"{churn_share:.1%}")
+
+    st.dataframe(scored_df.head(100), use_container_width=True)
+
+    st.download_button(
+        "⬇️ Download Scored File",
+        scored_df.to_csv(index=False).encode("utf-8"),
+        file_name="churn_predictions.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+
+# ---------------- PERFORMANCE ----------------
+load_stats = artifact_stats()
+
+with st.sidebar.expander("⏱️ Performance"):
+    st.metric("Artifact cold load", f"{artifacts.load_seconds * 1000:.0f} ms")
+    st.metric("Artifact lookup (this rerun)", f"{load_stats['last_lookup_seconds'] * 1000:.2f} ms")
+    st.metric("Page rerun time", f"{(time.perf_counter() - rerun_start) * 1000:.0f} ms")
+    st.caption(f"Loads: {load_stats['loads']} · Cache hits: {load_stats['hits']}")
+
+    explain_stats = explainer.stats()
+    st.caption(f"Explanations cached: {explain_stats['cached']} · "
+               f"Hits: {explain_stats['hits']} · Misses: {explain_stats['misses']}")
+
+    batcher_stats = batcher.stats()
+    st.metric("Avg. micro-batch size", f"{batcher_stats['avg_batch_size']:.1f}")
+    st.metric("Queue wait p99", f"{batcher_stats['queue_wait_ms_p99']:.1f} ms")
+
+    audit_stats = audit_log.stats()
+    st.caption(f"Audit log: {audit_stats['written']:,} written · {audit_stats['queued']:,} queued · "
+               f"{audit_stats['dropped']:,} dropped · last flush {audit_stats['last_flush_ms']:.1f} ms")
@@ -1,7 +1,20 @@
+import os
+
+import pandas as pd
 import streamlit as st
 
+from artifacts import get_artifacts
+from data_access import DATA_DIR, RAW_CSV
+from retention_queue import DEFAULT_PAGE_SIZE, DEFAULT_TOP_K, TIERS, build_queue
+from thresholds import strategy_thresholds
+
 st.set_page_config(page_title="Retention Strategy", layout="wide")
 
+artifacts = get_artifacts()
+# Medium / high risk bands chosen by thresholds.py from the action cost table
+# (this page's original 30% / 60% until they have been chosen)
+thresholds = strategy_thresholds(artifacts.thresholds)
+
 st.title("📌 Customer Retention Strategy Dashboard")
 
 st.markdown("""
@@ -26,7 +39,7 @@ st.divider()
 # ---------------- STRATEGY OUTPUT ----------------
 st.subheader("📊 Recommended Retention Strategy")
 
-if churn_prob < 0.30:
+if churn_prob <= thresholds["medium"]:
     st.success("🟢 **Low Churn Risk Customer**")
 
     st.markdown("""
@@ -40,7 +53,7 @@ if churn_prob < 0.30:
     Increase customer lifetime value (CLV)
     """)
 
-elif churn_prob < 0.60:
+elif churn_prob <= thresholds["high"]:
     st.warning("🟡 **Medium Churn Risk Customer**")
 
     st.markdown("""
@@ -68,6 +81,91 @@ else:
     Prevent customer exit at all costs
     """)
 
+st.caption(
+    f"Risk bands: medium above {thresholds['medium']:.0%}, high above {thresholds['high']:.0%}"
+)
+
+# ---------------- COST CURVES ----------------
+if "curve" in thresholds:
+    with st.expander("💰 How these cut-offs were chosen"):
+        st.markdown(
+            f"Chosen on **{thresholds['holdout_rows']:,}** holdout customers to maximise the "
+            f"expected net value of the retention actions "
+            f"(**₹{thresholds['expected_net_value_inr']:,.0f}**), with a retained customer "
+            f"worth **₹{thresholds['customer_value_inr']:,}**."
+        )
+        st.dataframe(
+            pd.DataFrame(thresholds["action_costs"]).T.rename(
+                columns={"cost_inr": "Cost per customer (INR)", "save_rate": "Churners kept"}
+            ),
+            use_container_width=True
+        )
+        curve = pd.DataFrame(thresholds["curve"]).set_index("threshold")
+        st.line_chart(curve[["net_value_high_inr", "net_value_medium_inr"]])
+        st.line_chart(curve[["precision", "recall", "f1"]])
+
+st.divider()
+
+# ---------------- PORTFOLIO RETENTION QUEUE ----------------
+st.subheader("📋 Portfolio Retention Queue")
+st.markdown(
+    "Score the **whole customer book** with the deployed model, bucket every customer into "
+    "the risk tiers above, and rank the ones worth acting on by **expected saved value** "
+    "(churn probability × customer value × action success rate − action cost)."
+)
+
+default_path = os.path.join(DATA_DIR, RAW_CSV)
+uploaded_book = st.file_uploader("Upload customer book", type=["csv", "parquet"])
+book_path = st.text_input(
+    "...or server-side file path", default_path if os.path.exists(default_path) else ""
+)
+book_source = uploaded_book if uploaded_book is not None else book_path.strip()
+
+q1, q2 = st.columns(2)
+with q1:
+    queue_size = st.number_input("Customers in the queue", 100, 1_000_000, DEFAULT_TOP_K, step=1000)
+with q2:
+    page_size = st.number_input("Rows per page", 100, 100_000, DEFAULT_PAGE_SIZE, step=100)
+
+if st.button("🚀 Build Retention Queue", use_container_width=True, disabled=not book_source):
+    progress_text = st.empty()
+    with st.spinner("Scoring the customer book in chunks..."):
+        # Kept in the session so paging through the queue does not rescore the book
+        st.session_state["retention_queue"] = build_queue(
+            book_source, artifacts, k=int(queue_size), thresholds=thresholds,
+            progress=lambda rows: progress_text.text(f"Scored {rows:,} customers...")
+        )
+    progress_text.empty()
+
+result = st.session_state.get("retention_queue")
+if result is not None and result.model_version == artifacts.model_version:
+    tier_cols = st.columns(4)
+    with tier_cols[0]:
+        st.metric("👥 Customers Scored", f"{result.rows:,}",
+                  f"{result.rows / max(result.seconds, 1e-9):,.0f} rows/s", delta_color="off")
+    for col, tier, icon in zip(tier_cols[1:], reversed(TIERS), ["🔴", "🟡", "🟢"]):
+        with col:
+            st.metric(f"{icon} {tier.title()} Risk", f"{result.tier_counts[tier]:,}",
+                      f"₹{result.tier_value[tier]:,.0f} saved value" if tier != "low" else None,
+                      delta_color="off")
+
+    n_pages = result.n_pages(int(page_size))
+    page_number = st.number_input(f"Page (of {n_pages:,})", 1, n_pages, 1)
+    page = result.page(int(page_number), int(page_size))
+    st.dataframe(page, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        f"⬇️ Download Page {page_number}",
+        page.to_csv(index=False).encode("utf-8"),
+        file_name=f"retention_queue_page_{page_number:05d}.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
+    st.caption(
+        "Every page of a large queue: python retention_queue.py customers.parquet "
+        "--top 100000 --page-size 1000 --output retention_queue/"
+    )
+
 st.divider()
 
 # ---------------- BUSINESS INSIGHTS ----------------
@@ -0,0 +1,217 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import churn_db
+from data_access import DATA_DIR, dataset_version, load_raw
+
+# ------------------ CUBE LAYOUT ------------------
+CUBE_DIMS = ["Churn", "Gender", "State", "Is_Active_Member", "Account_Type"]
+BOX_COLS = ["Credit_Score", "Estimated_Salary_INR"]
+
+# Outlier points kept per box; the rest are summarised by the whiskers
+MAX_OUTLIERS = 200
+
+CHURN_LABELS = {0: "Retained", 1: "Churned"}
+
+_lock = threading.Lock()
+_cubes = {}
+
+
+# ------------------ BUILD ------------------
+def build_cube(df):
+    """Summarise the customer frame into a few hundred rows.
+
+    counts : customers per Churn x Gender x State x Is_Active_Member x Account_Type
+    boxes  : box-plot statistics of Credit_Score and Estimated_Salary_INR per Churn
+    """
+    counts = (
+        df.groupby(CUBE_DIMS, observed=True)
+        .size()
+        .rename("Customers")
+        .reset_index()
+    )
+
+    boxes = {col: box_stats(df, col) for col in BOX_COLS}
+
+    return {"counts": counts, "boxes": boxes}
+
+
+def box_stats(df, value_col, group_col="Churn", max_outliers=MAX_OUTLIERS, seed=42):
+    """Tukey box-plot statistics per group, computed server-side.
+
+    Returns (stats, outliers): stats has q1 / median / q3, the whisker ends
+    (furthest points within 1.5 x IQR) and the outlier count per group;
+    outliers is a capped random sample of the points beyond the whiskers.
+    Rows with a missing value or group are left out.
+    """
+    # factorize codes a missing group as -1, which indexing would fold into the last group
+    df = df[[value_col, group_col]].dropna()
+    values = df[value_col].to_numpy(dtype=np.float64)
+    codes, groups = pd.factorize(df[group_col], sort=True)
+
+    stats = (
+        pd.Series(values)
+        .groupby(codes)
+        .quantile([0.25, 0.5, 0.75])
+        .unstack()
+    )
+    stats.columns = ["q1", "median", "q3"]
+
+    iqr = stats["q3"] - stats["q1"]
+    low_limit = (stats["q1"] - 1.5 * iqr).to_numpy()[codes]
+    high_limit = (stats["q3"] + 1.5 * iqr).to_numpy()[codes]
+    inside = (values >= low_limit) & (values <= high_limit)
+
+    in_range = pd.Series(np.where(inside, values, np.nan))
+    stats["lowerfence"] = in_range.groupby(codes).min()
+    stats["upperfence"] = in_range.groupby(codes).max()
+    stats["count"] = np.bincount(codes, minlength=len(groups))
+    stats["outliers"] = np.bincount(codes[~inside], minlength=len(groups))
+    stats.index = groups
+
+    # Shuffle once, then keep the first `max_outliers` per group
+    outlier_idx = np.flatnonzero(~inside)
+    outlier_idx = np.random.default_rng(seed).permutation(outlier_idx)
+    outliers = (
+        pd.Series(values[outlier_idx], index=groups[codes[outlier_idx]])
+        .groupby(level=0)
+        .head(max_outliers)
+    )
+
+    return stats, outliers
+
+
+def build_cube_from_store(conn):
+    """The same cube, with the GROUP BY and box statistics run inside the SQLite store."""
+    return {
+        "counts": churn_db.cube_counts(conn, CUBE_DIMS),
+        "boxes": {col: churn_db.box_stats(conn, col, MAX_OUTLIERS) for col in BOX_COLS},
+    }
+
+
+def get_cube(data_dir=DATA_DIR, db_path=churn_db.DB_PATH):
+    """Cube for the current dataset version, built once and shared by every page.
+
+    Built inside the embedded store when churn_db.py has ingested the data,
+    otherwise from the raw CSV.
+    """
+    use_store = churn_db.available(db_path)
+    version = churn_db.store_version(db_path) if use_store else dataset_version(data_dir)
+    if version not in _cubes:
+        with _lock:
+            if version not in _cubes:
+                _cubes.clear()
+                if use_store:
+                    _cubes[version] = build_cube_from_store(churn_db.get_connection(db_path))
+                else:
+                    _cubes[version] = build_cube(load_raw(data_dir))
+    return _cubes[version]
+
+
+# ------------------ QUERIES ------------------
+def churn_kpis(cube):
+    counts = cube["counts"]
+    by_churn = counts.groupby("Churn")["Customers"].sum()
+    by_active = counts.groupby("Is_Active_Member")["Customers"].sum()
+
+    total = int(counts["Customers"].sum())
+    churned = int(by_churn.get(1, 0))
+
+    return {
+        "total_customers": total,
+        "churned_customers": churned,
+        "retained_customers": int(by_churn.get(0, 0)),
+        "active_customers": int(by_active.get(1, 0)),
+        "inactive_customers": int(by_active.get(0, 0)),
+        "churn_rate": round(churned / total * 100, 2) if total else 0.0,
+    }
+
+
+def counts_by(cube, dim):
+    """Customer counts per `dim` value and churn status, ready for px.bar."""
+    keys = [dim] if dim == "Churn" else [dim, "Churn"]
+    counts = (
+        cube["counts"]
+        .groupby(keys, observed=True)["Customers"]
+        .sum()
+        .reset_index()
+    )
+    counts["Churn_Label"] = counts["Churn"].map(CHURN_LABELS)
+    return counts
+
+
+def churn_box(cube, col):
+    """Box statistics and outlier sample of `col`, indexed by churn label."""
+    stats, outliers = cube["boxes"][col]
+    stats = stats.rename(index=CHURN_LABELS)
+    outliers = outliers.rename(index=CHURN_LABELS)
+    return stats, outliers
+
+
+def box_figure(stats, outliers, title, y_title):
+    """Plotly box traces from precomputed statistics plus the outlier sample."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        go.Box(
+            x=list(stats.index),
+            q1=stats["q1"],
+            median=stats["median"],
+            q3=stats["q3"],
+            lowerfence=stats["lowerfence"],
+            upperfence=stats["upperfence"],
+            name=y_title,
+            showlegend=False,
+        )
+    )
+    if len(outliers):
+        fig.add_trace(
+            go.Scatter(
+                x=list(outliers.index),
+                y=outliers.to_numpy(),
+                mode="markers",
+                marker={"size": 4, "opacity": 0.5},
+                name="Outliers (sample)",
+                showlegend=False,
+            )
+        )
+    fig.update_layout(title=title, xaxis_title="Customer Status", yaxis_title=y_title)
+    return fig
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    import plotly.express as px
+
+    df = load_raw()
+
+    start = time.perf_counter()
+    cube = build_cube(df)
+    build_seconds = time.perf_counter() - start
+
+    raw_fig = px.histogram(
+        df.assign(Churn_Label=df["Churn"].map(CHURN_LABELS)),
+        x="State", color="Churn_Label", barmode="group"
+    )
+    cube_fig = px.bar(counts_by(cube, "State"), x="State", y="Customers",
+                      color="Churn_Label", barmode="group")
+
+    print(f"Rows: {len(df):,}  |  cube rows: {len(cube['counts']):,}  |  build: {build_seconds:.3f}s")
+    print(f"State chart payload: raw {len(raw_fig.to_json()) / 1e3:,.0f} KB "
+          f"-> cube {len(cube_fig.to_json()) / 1e3:,.1f} KB")
+
+    for col in BOX_COLS:
+        start = time.perf_counter()
+        raw_box = px.box(df.assign(Churn_Label=df["Churn"].map(CHURN_LABELS)),
+                         x="Churn_Label", y=col).to_json()
+        raw_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stats_box = box_figure(*churn_box(cube, col), col, col).to_json()
+        stats_seconds = time.perf_counter() - start
+
+        print(f"{col} box: raw {len(raw_box) / 1e3:,.0f} KB in {raw_seconds:.3f}s "
+              f"-> stats {len(stats_box) / 1e3:,.1f} KB in {stats_seconds:.3f}s")
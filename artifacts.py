@@ -0,0 +1,176 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import warnings
+from dataclasses import dataclass
+
+from fast_predict import FastPredictor
+from features import FeatureTransformer
+from pipeline_bundle import BUNDLE_FILE, load_bundle
+from thresholds import artifact_thresholds
+
+# ------------------ ARTIFACT LOCATION ------------------
+# Defaults to the project folder; set CHURN_ARTIFACT_DIR to point somewhere else
+ARTIFACT_DIR = os.environ.get(
+    "CHURN_ARTIFACT_DIR", os.path.dirname(os.path.abspath(__file__))
+)
+
+# Legacy pickles, used when no bundle file is present
+ARTIFACT_FILES = {
+    "model": "xgb_model.pkl",
+    "scaler": "scaler.pkl",
+    "encoder": "encoder.pkl",
+    "feature_names": "model_features.pkl",
+}
+
+
+@dataclass(frozen=True)
+class ArtifactBundle:
+    model: object
+    transformer: FeatureTransformer
+    predictor: FastPredictor
+    feature_names: list
+    model_version: str
+    # decision / medium / high cut-offs (thresholds.py), defaults without a bundle
+    thresholds: dict
+    version: tuple
+    load_seconds: float
+    # Only set when loaded from the bundle / from the legacy pickles respectively
+    manifest: dict = None
+    scaler: object = None
+    encoder: object = None
+
+
+# ------------------ PROCESS-WIDE REGISTRY ------------------
+# Imported modules live once per process, so every Streamlit session and page
+# (and any batch job in the same interpreter) shares these entries.
+_lock = threading.Lock()
+_bundles = {}
+_stats = {"loads": 0, "hits": 0, "last_load_seconds": None, "last_lookup_seconds": None}
+
+
+def _use_bundle(folder, use_bundle):
+    if use_bundle is None:
+        return os.path.exists(os.path.join(folder, BUNDLE_FILE))
+    return use_bundle
+
+
+def artifact_version(folder=ARTIFACT_DIR, use_bundle=None):
+    """Cheap version key: (file, mtime, size) for every artifact on disk."""
+    names = [BUNDLE_FILE] if _use_bundle(folder, use_bundle) else ARTIFACT_FILES.values()
+    version = []
+    for name in names:
+        info = os.stat(os.path.join(folder, name))
+        version.append((name, info.st_mtime_ns, info.st_size))
+    return tuple(version)
+
+
+def _load_pickles(folder):
+    loaded = {}
+    for key, name in ARTIFACT_FILES.items():
+        with open(os.path.join(folder, name), "rb") as f:
+            loaded[key] = pickle.load(f)
+
+    transformer = FeatureTransformer.from_fitted(loaded["scaler"], loaded["encoder"])
+    if transformer.feature_names != list(loaded["feature_names"]):
+        raise ValueError("model_features.pkl does not match the scaler / encoder column layout")
+
+    with open(os.path.join(folder, ARTIFACT_FILES["model"]), "rb") as f:
+        model_version = hashlib.sha256(f.read()).hexdigest()[:12]
+
+    loaded["feature_names"] = list(loaded["feature_names"])
+    return dict(loaded, transformer=transformer, model_version=model_version)
+
+
+def load_artifacts(folder=ARTIFACT_DIR, version=None, use_bundle=None):
+    """Load the artifacts from disk (no caching).
+
+    Prefers the single churn_pipeline.zip bundle and falls back to the four
+    legacy pickles when it is missing, or when it cannot be read (e.g. written
+    by a newer xgboost) and `use_bundle` was not forced.
+    """
+    start = time.perf_counter()
+    forced = use_bundle
+    use_bundle = _use_bundle(folder, use_bundle)
+    if version is None:
+        version = artifact_version(folder, use_bundle)
+
+    loaded = None
+    if use_bundle:
+        try:
+            model, transformer, manifest = load_bundle(os.path.join(folder, BUNDLE_FILE))
+            loaded = {
+                "model": model,
+                "transformer": transformer,
+                "feature_names": manifest["feature_names"],
+                "model_version": manifest["model_version"],
+                "manifest": manifest,
+            }
+        except Exception as exc:
+            if forced:
+                raise
+            # Keep the version key of the bundle: it is retried once the file changes
+            warnings.warn(f"Could not load {BUNDLE_FILE} ({exc}); using the legacy pickles")
+    if loaded is None:
+        loaded = _load_pickles(folder)
+
+    thresholds = artifact_thresholds(loaded.get("manifest"))
+    return ArtifactBundle(
+        predictor=FastPredictor(loaded["model"], loaded["transformer"], thresholds["decision"]),
+        thresholds=thresholds,
+        version=version,
+        load_seconds=time.perf_counter() - start,
+        **loaded
+    )
+
+
+def get_artifacts(folder=ARTIFACT_DIR):
+    """Return the shared artifact bundle, reloading only when files on disk change."""
+    start = time.perf_counter()
+    folder = os.path.abspath(folder)
+    version = artifact_version(folder)
+
+    bundle = _bundles.get(folder)
+    if bundle is None or bundle.version != version:
+        with _lock:
+            bundle = _bundles.get(folder)
+            if bundle is None or bundle.version != version:
+                bundle = load_artifacts(folder, version)
+                _bundles[folder] = bundle
+                _stats["loads"] += 1
+                _stats["last_load_seconds"] = bundle.load_seconds
+            else:
+                _stats["hits"] += 1
+    else:
+        _stats["hits"] += 1
+
+    _stats["last_lookup_seconds"] = time.perf_counter() - start
+    return bundle
+
+
+def artifact_stats():
+    """Load / hit counters plus the last cold-load and lookup timings."""
+    return dict(_stats)
+
+
+def clear_artifacts():
+    with _lock:
+        _bundles.clear()
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    cold_start = time.perf_counter()
+    get_artifacts()
+    cold = time.perf_counter() - cold_start
+
+    runs = 1000
+    warm_start = time.perf_counter()
+    for _ in range(runs):
+        get_artifacts()
+    warm = (time.perf_counter() - warm_start) / runs
+
+    print(f"Cold load : {cold * 1000:.1f} ms")
+    print(f"Warm rerun: {warm * 1000:.3f} ms per lookup")
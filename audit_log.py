@@ -0,0 +1,412 @@
+import atexit
+import glob
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from data_access import DATA_DIR
+from features import CAT_COLS, RAW_NUM_COLS
+
+# ------------------ CONFIG ------------------
+# One folder per UTC day of append-only Arrow IPC stream segments
+AUDIT_DIR = os.environ.get("CHURN_AUDIT_DIR", os.path.join(DATA_DIR, "audit_log"))
+
+# Records held in memory between flushes; callers never wait for disk unless it fills up
+RING_SIZE = int(os.environ.get("CHURN_AUDIT_RING", 65_536))
+
+# The writer flushes when this many records are waiting, or every FLUSH_SECONDS
+FLUSH_ROWS = 8_192
+FLUSH_SECONDS = 1.0
+
+# A new segment file is started after this many records or seconds (and on a new day)
+SEGMENT_ROWS = 1_000_000
+SEGMENT_SECONDS = 3_600
+
+SEGMENT_SUFFIX = ".arrows"
+
+ID_COL = "Customer_ID"
+META_COLS = ["Timestamp", "Source", "Model_Version", ID_COL]
+OUTPUT_COLS = ["Churn_Probability", "Churn_Prediction"]
+AUDIT_COLS = META_COLS + RAW_NUM_COLS + CAT_COLS + OUTPUT_COLS
+
+# Ring buffer column types: microseconds since the epoch, -1 for "no customer ID"
+RING_DTYPES = dict(
+    {"Timestamp": np.int64, "Source": object, "Model_Version": object, ID_COL: np.int64},
+    **dict.fromkeys(RAW_NUM_COLS, np.float64),
+    **dict.fromkeys(CAT_COLS, object),
+    Churn_Probability=np.float32,
+    Churn_Prediction=np.int8,
+)
+
+MICROS_PER_DAY = 86_400_000_000
+
+
+def audit_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [pa.field("Timestamp", pa.timestamp("us", tz="UTC")),
+         pa.field("Source", pa.string()),
+         pa.field("Model_Version", pa.string()),
+         pa.field(ID_COL, pa.int64())]
+        + [pa.field(col, pa.float64()) for col in RAW_NUM_COLS]
+        + [pa.field(col, pa.string()) for col in CAT_COLS]
+        + [pa.field("Churn_Probability", pa.float32()),
+           pa.field("Churn_Prediction", pa.int8())]
+    )
+
+
+def _day(micros):
+    return datetime.fromtimestamp(micros // 1_000_000, timezone.utc).strftime("%Y-%m-%d")
+
+
+# ------------------ LOGGER ------------------
+class AuditLogger:
+    """Non-blocking prediction audit log.
+
+    log() copies the records into a preallocated columnar ring buffer and
+    returns; one background thread takes whatever is waiting every
+    FLUSH_SECONDS (or as soon as FLUSH_ROWS are queued), converts it to an
+    Arrow record batch and appends it to the current segment outside the
+    lock. Segments are Arrow IPC streams, so every flushed batch is readable
+    right away and a crash loses at most the unflushed tail. When the ring is
+    full, log(block=False) drops and counts the records instead of waiting;
+    batch jobs pass block=True and wait for room.
+    """
+
+    def __init__(self, audit_dir=AUDIT_DIR, capacity=RING_SIZE, flush_rows=FLUSH_ROWS,
+                 flush_seconds=FLUSH_SECONDS, segment_rows=SEGMENT_ROWS,
+                 segment_seconds=SEGMENT_SECONDS):
+        self.audit_dir = audit_dir
+        self.capacity = capacity
+        self.flush_rows = min(flush_rows, capacity)
+        self.flush_seconds = flush_seconds
+        self.segment_rows = segment_rows
+        self.segment_seconds = segment_seconds
+
+        self._ring = {col: np.empty(capacity, dtype=dtype) for col, dtype in RING_DTYPES.items()}
+        self._tail = 0
+        self._size = 0
+        self._cond = threading.Condition()
+        self._flush_requested = False
+        self._stopping = False
+
+        self._segment = None
+        self._segment_seq = 0
+        self._counts = {"logged": 0, "written": 0, "dropped": 0, "segments": 0, "write_errors": 0}
+        self._last_flush_ms = 0.0
+        self._last_error = None
+
+        self._thread = threading.Thread(target=self._run, name="churn-audit-log", daemon=True)
+        self._thread.start()
+
+    # ------------------ CALLER SIDE ------------------
+    def log(self, columns, probs, predictions, model_version, source, block=False):
+        """Queue one record per row of `columns` (a DataFrame or a dict of raw
+        inputs; scalars for a single customer). Returns False if records were
+        dropped because the ring was full and block is False."""
+        probs = np.atleast_1d(np.asarray(probs, dtype=np.float32))
+        n = len(probs)
+        values = {col: np.asarray(columns[col]) for col in RAW_NUM_COLS + CAT_COLS}
+        values[ID_COL] = np.asarray(columns[ID_COL]) if ID_COL in columns else np.int64(-1)
+        values["Timestamp"] = np.int64(time.time_ns() // 1000)
+        values["Source"] = source
+        values["Model_Version"] = model_version
+        values["Churn_Probability"] = probs
+        values["Churn_Prediction"] = np.atleast_1d(np.asarray(predictions))
+
+        done = 0
+        while done < n:
+            with self._cond:
+                free = self.capacity - self._size
+                if free == 0:
+                    if not block:
+                        self._counts["dropped"] += n - done
+                        return False
+                    self._flush_requested = True
+                    self._cond.notify_all()
+                    self._cond.wait()
+                    continue
+
+                m = min(free, n - done)
+                head = (self._tail + self._size) % self.capacity
+                first = min(m, self.capacity - head)
+                self._put(head, values, done, first)
+                if m > first:
+                    self._put(0, values, done + first, m - first)
+                self._size += m
+                self._counts["logged"] += m
+                if self._size >= self.flush_rows:
+                    self._cond.notify_all()
+            done += m
+        return True
+
+    def _put(self, start, values, offset, count):
+        for col, ring in self._ring.items():
+            value = values[col]
+            ring[start:start + count] = value[offset:offset + count] if np.ndim(value) else value
+
+    def flush(self, timeout=None):
+        """Block until everything logged so far is on disk."""
+        with self._cond:
+            target = self._counts["logged"]
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: self._counts["written"] + self._counts["write_errors"] >= target, timeout
+            )
+
+    def close(self):
+        """Flush, stop the writer thread and close the open segment."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    # ------------------ WRITER ------------------
+    def _take(self):
+        """Copy the waiting records out of the ring and free their slots (lock held)."""
+        n, tail = self._size, self._tail
+        first = min(n, self.capacity - tail)
+        batch = {}
+        for col, ring in self._ring.items():
+            batch[col] = ring[tail:tail + first].copy()
+            if n > first:
+                batch[col] = np.concatenate([batch[col], ring[:n - first]])
+        self._tail = (tail + n) % self.capacity
+        self._size = 0
+        return batch, n
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._size >= self.flush_rows or self._flush_requested or self._stopping,
+                    self.flush_seconds,
+                )
+                self._flush_requested = False
+                stopping = self._stopping
+                batch, n = self._take() if self._size else (None, 0)
+                # Room in the ring again for callers waiting with block=True
+                self._cond.notify_all()
+
+            if n:
+                start = time.perf_counter()
+                try:
+                    self._write(batch)
+                    written, failed = n, 0
+                except Exception as exc:
+                    self._last_error = repr(exc)
+                    written, failed = 0, n
+                with self._cond:
+                    self._counts["written"] += written
+                    self._counts["write_errors"] += failed
+                    self._last_flush_ms = (time.perf_counter() - start) * 1000
+                    self._cond.notify_all()
+            if stopping and not n:
+                break
+        self._close_segment()
+
+    def _write(self, batch):
+        import pyarrow as pa
+
+        schema = audit_schema()
+        days = batch["Timestamp"] // MICROS_PER_DAY
+        unique_days = np.unique(days)
+        for day in unique_days:
+            # Only a flush around midnight spans two days
+            rows = slice(None) if len(unique_days) == 1 else np.flatnonzero(days == day)
+            arrays = []
+            for field in schema:
+                values = batch[field.name][rows]
+                if field.name == ID_COL:
+                    arrays.append(pa.array(values, mask=values < 0, type=field.type))
+                else:
+                    arrays.append(pa.array(values, type=field.type))
+            record_batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+            self._segment_writer(int(day) * MICROS_PER_DAY).write_batch(record_batch)
+            self._segment["rows"] += record_batch.num_rows
+
+    def _segment_writer(self, day_micros):
+        """Writer of the open segment, rotating on a new day / size / age."""
+        import pyarrow as pa
+
+        day = _day(day_micros)
+        segment = self._segment
+        if segment is not None and (segment["day"] != day
+                                    or segment["rows"] >= self.segment_rows
+                                    or time.monotonic() - segment["opened"] >= self.segment_seconds):
+            self._close_segment()
+            segment = None
+
+        if segment is None:
+            folder = os.path.join(self.audit_dir, day)
+            os.makedirs(folder, exist_ok=True)
+            self._segment_seq += 1
+            stamp = datetime.now(timezone.utc).strftime("%H%M%S")
+            path = os.path.join(folder, f"audit-{stamp}-{os.getpid()}-{self._segment_seq}{SEGMENT_SUFFIX}")
+            sink = pa.OSFile(path, "wb")
+            options = pa.ipc.IpcWriteOptions(compression="lz4" if pa.Codec.is_available("lz4") else None)
+            segment = self._segment = {
+                "day": day, "path": path, "rows": 0, "opened": time.monotonic(), "sink": sink,
+                "writer": pa.ipc.new_stream(sink, audit_schema(), options=options),
+            }
+            self._counts["segments"] += 1
+        return segment["writer"]
+
+    def _close_segment(self):
+        if self._segment is not None:
+            self._segment["writer"].close()
+            self._segment["sink"].close()
+            self._segment = None
+
+    # ------------------ COUNTERS ------------------
+    def stats(self):
+        with self._cond:
+            return dict(
+                self._counts,
+                queued=self._size,
+                last_flush_ms=self._last_flush_ms,
+                last_error=self._last_error,
+                segment=self._segment["path"] if self._segment else None,
+            )
+
+
+# ------------------ SHARED INSTANCE ------------------
+_lock = threading.Lock()
+_loggers = {}
+
+
+def get_audit_log(audit_dir=AUDIT_DIR):
+    """One logger per folder and process; flushed and closed at interpreter exit."""
+    with _lock:
+        logger = _loggers.get(audit_dir)
+        if logger is None:
+            logger = _loggers[audit_dir] = AuditLogger(audit_dir)
+            atexit.register(logger.close)
+    return logger
+
+
+# ------------------ READER ------------------
+def day_segments(day, audit_dir=AUDIT_DIR):
+    """Segment files of one UTC day ("YYYY-MM-DD"), oldest first."""
+    return sorted(glob.glob(os.path.join(audit_dir, str(day), "*" + SEGMENT_SUFFIX)),
+                  key=os.path.getmtime)
+
+
+def read_day(day, audit_dir=AUDIT_DIR, columns=None, customer_id=None, model_version=None,
+             source=None):
+    """One day's audit records as a pyarrow Table.
+
+    Segments are memory-mapped and read batch by batch; a segment that is
+    still being written is read up to its last complete batch. Filters are
+    applied per segment with pyarrow.compute, `columns` selects a subset.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    schema = audit_schema()
+    tables = []
+    for path in day_segments(day, audit_dir):
+        reader = pa.ipc.open_stream(pa.memory_map(path))
+        batches = []
+        try:
+            for record_batch in reader:
+                batches.append(record_batch)
+        except (pa.ArrowInvalid, OSError):
+            pass
+        table = pa.Table.from_batches(batches, schema=schema)
+
+        mask = None
+        for col, value in ((ID_COL, customer_id), ("Model_Version", model_version), ("Source", source)):
+            if value is not None:
+                condition = pc.equal(table[col], value)
+                mask = condition if mask is None else pc.and_(mask, condition)
+        if mask is not None:
+            table = table.filter(mask)
+        tables.append(table.select(columns) if columns else table)
+
+    if not tables:
+        empty = schema.empty_table()
+        return empty.select(columns) if columns else empty
+    return pa.concat_tables(tables)
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prediction audit log")
+    parser.add_argument("--audit-dir", default=AUDIT_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    read_cmd = commands.add_parser("read", help="Query one day's audit records")
+    read_cmd.add_argument("--day", default=datetime.now(timezone.utc).strftime("%Y-%m-%d"))
+    read_cmd.add_argument("--customer-id", type=int, default=None)
+    read_cmd.add_argument("--model-version", default=None)
+    read_cmd.add_argument("--source", default=None)
+    read_cmd.add_argument("--output", default=None, help="Write the records to CSV / Parquet")
+
+    bench_cmd = commands.add_parser("benchmark", help="Caller latency, write and read throughput")
+    bench_cmd.add_argument("--rows", type=int, default=1_000_000)
+
+    args = parser.parse_args()
+
+    if args.command == "read":
+        start = time.perf_counter()
+        table = read_day(args.day, args.audit_dir, customer_id=args.customer_id,
+                         model_version=args.model_version, source=args.source)
+        elapsed = time.perf_counter() - start
+        print(f"{table.num_rows:,} records on {args.day} from "
+              f"{len(day_segments(args.day, args.audit_dir))} segments in {elapsed * 1000:.1f} ms")
+        df = table.to_pandas()
+        if args.output and args.output.lower().endswith(".parquet"):
+            df.to_parquet(args.output, index=False)
+        elif args.output:
+            df.to_csv(args.output, index=False)
+        else:
+            print(df.tail(10).to_string(index=False))
+
+    else:
+        from synthetic_data import load_customers
+
+        logger = AuditLogger(args.audit_dir)
+        df = load_customers(args.rows)
+        probs = np.random.default_rng(0).random(len(df), dtype=np.float32)
+        predictions = (probs > 0.5).astype(np.int8)
+
+        # Live page: one customer per call while the writer flushes in the background
+        customer = {col: df[col].iloc[0] for col in RAW_NUM_COLS + CAT_COLS}
+        latencies = []
+        for i in range(20_000):
+            start = time.perf_counter()
+            logger.log(customer, probs[i], predictions[i], "benchmark", "live_page")
+            latencies.append(time.perf_counter() - start)
+        latencies = np.array(latencies) * 1e6
+        print(f"Single record log(): p50 {np.percentile(latencies, 50):.1f} us | "
+              f"p99 {np.percentile(latencies, 99):.1f} us | max {latencies.max():.0f} us")
+
+        # Batch scorer: 250k-row chunks with block=True, flushed to disk
+        start = time.perf_counter()
+        for i in range(0, len(df), 250_000):
+            logger.log(df.iloc[i:i + 250_000], probs[i:i + 250_000], predictions[i:i + 250_000],
+                       "benchmark", "batch", block=True)
+        logger.flush()
+        elapsed = time.perf_counter() - start
+        print(f"Batch: {len(df):,} records logged and written in {elapsed:.2f}s "
+              f"({len(df) / elapsed:,.0f} records/s)")
+        logger.close()
+        print(logger.stats())
+
+        day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        start = time.perf_counter()
+        table = read_day(day, args.audit_dir)
+        read_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        one = read_day(day, args.audit_dir, customer_id=int(df[ID_COL].iloc[-1]))
+        filter_seconds = time.perf_counter() - start
+        print(f"Read {table.num_rows:,} records of {day} in {read_seconds * 1000:.0f} ms; "
+              f"one customer ({one.num_rows} records) in {filter_seconds * 1000:.0f} ms")
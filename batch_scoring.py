@@ -0,0 +1,166 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import ARTIFACT_DIR, get_artifacts
+
+ID_COL = "Customer_ID"
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+# ------------------ CHUNKED READERS ------------------
+def _source_name(source):
+    return str(getattr(source, "name", source)).lower()
+
+
+def iter_chunks(source, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrame chunks from a CSV / Parquet path or uploaded file object."""
+    if _source_name(source).endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        # pre_buffer keeps read-ahead buffers alive across row groups; off, memory
+        # stays bounded by the chunk size however large the file is
+        parquet_file = pq.ParquetFile(source, pre_buffer=False)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunksize)
+
+
+# ------------------ SCORING ------------------
+def score_chunk(chunk, model, transformer, threshold=0.5, explainer=None, monitor=None,
+                audit=None):
+    """Score one chunk: one vectorized transform and a single predict_proba call.
+
+    With an `explain.Explainer`, the top reason codes are added per customer;
+    with a `drift_monitor.DriftMonitor`, the chunk and its scores are added to it.
+    `audit` is called with (chunk, probabilities, predictions), e.g. a bound
+    audit_log.AuditLogger.log.
+    """
+    X_final = transformer.transform(chunk)
+
+    prob = model.predict_proba(X_final)[:, 1]
+
+    result = pd.DataFrame(index=chunk.index)
+    if ID_COL in chunk.columns:
+        result[ID_COL] = chunk[ID_COL].to_numpy()
+    result["Churn_Probability"] = prob.astype(np.float32)
+    # Same rule XGBClassifier.predict applies, without a second pass over the trees
+    result["Churn_Prediction"] = (prob > threshold).astype(np.int8)
+
+    if explainer is not None:
+        for col, values in explainer.reason_columns(explainer.explain(X_final)).items():
+            result[col] = values
+    if monitor is not None:
+        monitor.update(chunk, prob)
+    if audit is not None:
+        audit(chunk, prob, result["Churn_Prediction"].to_numpy())
+    return result
+
+
+def score_file(source, model, transformer, chunksize=DEFAULT_CHUNKSIZE,
+               threshold=0.5, progress=None, explainer=None, monitor=None, audit=None):
+    """Score a whole file chunk by chunk.
+
+    Returns the scored frame and a stats dict with rows, seconds and rows/sec.
+    `progress` is an optional callback receiving the number of rows done so far.
+    """
+    start = time.perf_counter()
+    results = []
+    rows = 0
+
+    for chunk in iter_chunks(source, chunksize):
+        results.append(score_chunk(chunk, model, transformer, threshold, explainer, monitor, audit))
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+
+    scored = pd.concat(results, ignore_index=True) if results else pd.DataFrame()
+    seconds = time.perf_counter() - start
+
+    stats = {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else 0.0,
+    }
+    return scored, stats
+
+
+# ------------------ CLI (NIGHTLY SCORING) ------------------
+if __name__ == "__main__":
+    from compiled_model import ENGINE, ENGINES, get_engine
+
+    parser = argparse.ArgumentParser(description="Batch churn scoring for CSV / Parquet files")
+    parser.add_argument("input", help="CSV or Parquet file with raw customer columns")
+    parser.add_argument("output", help="Where to write the scored CSV / Parquet file")
+    parser.add_argument("--artifacts", default=None, help="Folder with the pickled artifacts")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--reasons", action="store_true",
+                        help="Add the top TreeSHAP reason codes per customer")
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINE,
+                        help="Inference engine (default: CHURN_INFERENCE_ENGINE or xgboost)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Score in this many processes over shared memory (0: in-process)")
+    parser.add_argument("--drift", action="store_true",
+                        help="Compare the inputs and scores with the training baseline and save a report")
+    parser.add_argument("--audit", action="store_true",
+                        help="Record every score in the prediction audit log")
+    args = parser.parse_args()
+
+    artifacts = get_artifacts(args.artifacts or ARTIFACT_DIR)
+    model = get_engine(artifacts, args.engine)
+    if args.workers:
+        from parallel_scoring import ParallelScorer
+
+        model = ParallelScorer(args.artifacts or ARTIFACT_DIR, args.workers, args.engine)
+
+    explainer = None
+    if args.reasons:
+        from explain import get_explainer
+
+        explainer = get_explainer(artifacts)
+
+    monitor = None
+    if args.drift:
+        import drift_monitor
+
+        baseline = drift_monitor.load_baseline(artifacts)
+        if baseline is None:
+            parser.error("no drift baseline in the bundle; run `python drift_monitor.py baseline` first")
+        monitor = drift_monitor.DriftMonitor(baseline)
+
+    audit = None
+    if args.audit:
+        from functools import partial
+
+        from audit_log import get_audit_log
+
+        # Waits for room when the ring buffer is full rather than dropping records
+        audit = partial(get_audit_log().log, model_version=artifacts.model_version,
+                        source="batch", block=True)
+
+    try:
+        scored, stats = score_file(
+            args.input, model, artifacts.transformer,
+            chunksize=args.chunksize, threshold=artifacts.thresholds["decision"],
+            explainer=explainer, monitor=monitor, audit=audit
+        )
+    finally:
+        if args.workers:
+            model.close()
+
+    if args.output.lower().endswith(".parquet"):
+        scored.to_parquet(args.output, index=False)
+    else:
+        scored.to_csv(args.output, index=False)
+
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec)")
+
+    if monitor is not None:
+        report = monitor.report(args.input, artifacts.model_version)
+        drift_monitor.print_report(report)
+        print(f"Drift report: {drift_monitor.save_report(report)}")
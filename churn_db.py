@@ -0,0 +1,544 @@
+import argparse
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import DEFAULT_CHUNKSIZE, ID_COL, iter_chunks
+from data_access import DATA_DIR, RAW_CSV
+from features import CAT_COLS, ENGINEERED_COLS, engineer_features
+
+# ------------------ LOCATION ------------------
+# Set CHURN_DB to keep the store somewhere else
+DB_PATH = os.environ.get("CHURN_DB", os.path.join(DATA_DIR, "churn.db"))
+
+# ------------------ SCHEMA ------------------
+CUSTOMER_COLS = [
+    ID_COL, "Age", "Gender", "State", "Tenure_Years", "Balance_INR", "Num_Products",
+    "Has_Credit_Card", "Is_Active_Member", "Estimated_Salary_INR", "Credit_Score",
+    "Account_Type", "Churn",
+]
+REAL_COLS = ["Balance_INR", "Estimated_Salary_INR", "Balance_to_Salary"]
+
+# Filters a segment query accepts: exact-match columns and numeric ranges
+SEGMENT_COLS = ["State", "Account_Type", "Is_Active_Member", "Gender",
+                "Has_Credit_Card", "Num_Products"]
+RANGE_COLS = ["Age", "Tenure_Years", "Credit_Score", "Balance_INR", "Estimated_Salary_INR"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    Customer_ID INTEGER PRIMARY KEY,
+    Age INTEGER, Gender TEXT, State TEXT, Tenure_Years INTEGER, Balance_INR REAL,
+    Num_Products INTEGER, Has_Credit_Card INTEGER, Is_Active_Member INTEGER,
+    Estimated_Salary_INR REAL, Credit_Score INTEGER, Account_Type TEXT, Churn INTEGER
+);
+CREATE TABLE IF NOT EXISTS features (
+    Customer_ID INTEGER PRIMARY KEY,
+    Balance_to_Salary REAL, Tenure_NumProducts INTEGER,
+    Low_Credit_Score INTEGER, HighBalance_LowActivity INTEGER
+);
+CREATE TABLE IF NOT EXISTS model_versions (
+    model_version TEXT PRIMARY KEY,
+    registered_at TEXT, n_trees INTEGER, decision_threshold REAL
+);
+CREATE TABLE IF NOT EXISTS predictions (
+    model_version TEXT, Customer_ID INTEGER, Churn_Probability REAL, scored_at TEXT,
+    PRIMARY KEY (model_version, Customer_ID)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS segments (
+    State TEXT, Account_Type TEXT, Is_Active_Member INTEGER, Gender TEXT,
+    Has_Credit_Card INTEGER, Num_Products INTEGER, Churn INTEGER, Customers INTEGER
+);
+CREATE TABLE IF NOT EXISTS segment_scores (
+    model_version TEXT, State TEXT, Account_Type TEXT, Is_Active_Member INTEGER,
+    Gender TEXT, Has_Credit_Card INTEGER, Num_Products INTEGER,
+    Customers INTEGER, Probability_Sum REAL
+);
+CREATE INDEX IF NOT EXISTS idx_segment_scores ON segment_scores (model_version);
+CREATE TABLE IF NOT EXISTS box_stats (
+    col TEXT, Churn INTEGER, q1 REAL, median REAL, q3 REAL,
+    lowerfence REAL, upperfence REAL, count INTEGER, outliers INTEGER,
+    PRIMARY KEY (col, Churn)
+);
+CREATE TABLE IF NOT EXISTS box_outliers (
+    col TEXT, Churn INTEGER, rank INTEGER, value REAL,
+    PRIMARY KEY (col, Churn, rank)
+) WITHOUT ROWID;
+"""
+
+# Segment rollups (segments: customers per SEGMENT_COLS x Churn at ingest;
+# segment_scores: probability sums per scored model) are a few thousand rows,
+# so equality-filter segment queries never touch the customers table.
+# Indexes are built after a bulk load (one sort each instead of per-row updates).
+# Segment index: narrows range-filtered segment queries on State / Account_Type /
+# activity; (Churn, value) indexes: whisker and outlier range scans.
+INDEXES = {
+    "idx_customers_segment":
+        "customers (State, Account_Type, Is_Active_Member, Gender, Churn)",
+    "idx_customers_credit": "customers (Churn, Credit_Score)",
+    "idx_customers_salary": "customers (Churn, Estimated_Salary_INR)",
+}
+
+# Box plots precomputed at ingest (box_stats / box_outliers): a quantile is an
+# OFFSET walk along the index, O(rows), too slow to repeat on every cube build.
+BOX_COLS = ["Credit_Score", "Estimated_Salary_INR"]
+BOX_OUTLIER_SAMPLE = 200
+
+_local = threading.local()
+
+
+# ------------------ CONNECTIONS ------------------
+def available(path=DB_PATH):
+    return os.path.exists(path)
+
+
+def connect(path=DB_PATH, readonly=False):
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(path)
+    conn.execute("PRAGMA cache_size = -262144")  # 256 MB page cache
+    conn.execute("PRAGMA mmap_size = 1073741824")
+    return conn
+
+
+def get_connection(path=DB_PATH):
+    """Read-only connection for the calling thread (Streamlit runs each session in its own).
+
+    Reopened when the store version changes: ingest swaps in a new file, and a
+    connection to the old one would keep reading the unlinked copy.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    version = store_version(path)
+    cached = conns.get(path)
+    if cached is None or cached[0] != version:
+        if cached is not None:
+            cached[1].close()
+        cached = conns[path] = (version, connect(path, readonly=True))
+    return cached[1]
+
+
+def store_version(path=DB_PATH):
+    """Version key for anything derived from the store."""
+    return path, os.path.getmtime(path)
+
+
+# ------------------ BULK INGEST ------------------
+def _sql_rows(frame, cols):
+    # Plain Python scalars (sqlite3 does not bind numpy types), column by column;
+    # missing values become NULL
+    values = []
+    for col in cols:
+        series = frame[col]
+        if col in REAL_COLS:
+            values.append(series.to_numpy(dtype=np.float64).tolist())  # NaN binds as NULL
+        elif col in CAT_COLS or series.dtype == object:
+            values.append(series.astype(str).where(series.notna(), None).tolist())
+        elif series.hasnans:
+            values.append(series.astype(object).where(series.notna(), None).tolist())
+        else:
+            values.append(series.to_numpy(dtype=np.int64).tolist())
+    return zip(*values)
+
+
+def ingest(source, path=DB_PATH, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Load a raw churn CSV / Parquet file into a fresh store at `path`.
+
+    Builds the database next to the target with journaling off, one
+    transaction and one executemany per chunk, then creates the indexes,
+    runs ANALYZE and swaps the file in; readers never see a half-built store.
+    """
+    start = time.perf_counter()
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;"
+                       "PRAGMA cache_size = -262144;")
+    conn.executescript(SCHEMA)
+
+    customer_sql = (f"INSERT INTO customers ({', '.join(CUSTOMER_COLS)}) "
+                    f"VALUES ({', '.join('?' * len(CUSTOMER_COLS))})")
+    feature_cols = [ID_COL] + ENGINEERED_COLS
+    feature_sql = (f"INSERT INTO features ({', '.join(feature_cols)}) "
+                   f"VALUES ({', '.join('?' * len(feature_cols))})")
+
+    rows = 0
+    rollup = None
+    for chunk in iter_chunks(source, chunksize):
+        engineered = pd.DataFrame(engineer_features(chunk), index=chunk.index)
+        engineered[ID_COL] = chunk[ID_COL]
+        with conn:
+            conn.executemany(customer_sql, _sql_rows(chunk, CUSTOMER_COLS))
+            conn.executemany(feature_sql, _sql_rows(engineered, feature_cols))
+
+        part = _rollup(chunk, SEGMENT_COLS + ["Churn"], Customers=1)
+        rollup = part if rollup is None else rollup.add(part, fill_value=0)
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+    if rollup is not None:
+        _write_rollup(conn, "segments", rollup.reset_index())
+    load_seconds = time.perf_counter() - start
+
+    for name, target in INDEXES.items():
+        conn.execute(f"CREATE INDEX {name} ON {target}")
+    _store_box_stats(conn)
+    conn.execute("ANALYZE")
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, path)
+
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "load_seconds": load_seconds,
+        "index_seconds": seconds - load_seconds,
+        "seconds": seconds,
+        "rows_per_sec": rows / load_seconds if load_seconds > 0 else 0.0,
+        "size_mb": os.path.getsize(path) / 1e6,
+    }
+
+
+def _rollup(chunk, dims, **values):
+    # Text dims as plain strings, so chunks with different category sets add up.
+    # Rows with a missing key stay in (as a NULL segment), so the rollups count
+    # the same customers as the customers table
+    frame = chunk[dims].assign(**{
+        col: chunk[col].astype(str).where(chunk[col].notna(), None)
+        for col in dims if col in CAT_COLS
+    }).assign(**values)
+    return frame.groupby(dims, dropna=False).sum()
+
+
+def _write_rollup(conn, table, rollup, model_version=None):
+    cols = list(rollup.columns)
+    prefix = [] if model_version is None else [model_version]
+    names = ([] if model_version is None else ["model_version"]) + cols
+    with conn:
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+            (prefix + row for row in rollup.astype(object).values.tolist()),
+        )
+
+
+# ------------------ PREDICTIONS ------------------
+def register_model(conn, artifacts):
+    conn.execute(
+        "INSERT OR REPLACE INTO model_versions VALUES (?, ?, ?, ?)",
+        (artifacts.model_version, datetime.now(timezone.utc).isoformat(timespec="seconds"),
+         int(artifacts.model.get_booster().num_boosted_rounds()),
+         float(artifacts.thresholds["decision"])),
+    )
+
+
+def write_predictions(conn, ids, probs, model_version):
+    """Upsert one model version's probabilities in a single transaction."""
+    scored_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+            zip([model_version] * len(ids), np.asarray(ids, dtype=np.int64).tolist(),
+                np.asarray(probs, dtype=np.float64).tolist(), [scored_at] * len(ids)),
+        )
+
+
+def score_customers(conn, artifacts, chunksize=DEFAULT_CHUNKSIZE, progress=None):
+    """Score every stored customer with the deployed model, reading the table in chunks."""
+    start = time.perf_counter()
+    conn.executescript(SCHEMA)
+    with conn:
+        register_model(conn, artifacts)
+    booster = artifacts.model.get_booster()
+
+    rows = 0
+    rollup = None
+    reader = conn.cursor()
+    reader.execute(f"SELECT {', '.join(CUSTOMER_COLS)} FROM customers ORDER BY {ID_COL}")
+    while True:
+        batch = reader.fetchmany(chunksize)
+        if not batch:
+            break
+        chunk = pd.DataFrame(batch, columns=CUSTOMER_COLS)
+        probs = booster.inplace_predict(artifacts.transformer.transform(chunk))
+        write_predictions(conn, chunk[ID_COL].to_numpy(), probs, artifacts.model_version)
+
+        part = _rollup(chunk, SEGMENT_COLS, Customers=1, Probability_Sum=probs.astype(np.float64))
+        rollup = part if rollup is None else rollup.add(part, fill_value=0)
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+
+    with conn:
+        conn.execute("DELETE FROM segment_scores WHERE model_version = ?", (artifacts.model_version,))
+    if rollup is not None:
+        _write_rollup(conn, "segment_scores", rollup.reset_index(), artifacts.model_version)
+
+    # Fresh statistics, or the planner drives segment joins from predictions
+    conn.execute("ANALYZE predictions")
+    conn.commit()
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "seconds": seconds}
+
+
+# ------------------ QUERIES ------------------
+def _where(filters=None, ranges=None, extra=()):
+    """WHERE clause and parameters; column names come only from the allow-lists
+    (`extra` adds fixed (clause, value) pairs)."""
+    clauses = [clause for clause, _ in extra]
+    params = [value for _, value in extra]
+    for col, value in (filters or {}).items():
+        if col not in SEGMENT_COLS:
+            raise ValueError(f"Cannot filter on {col!r}; choose from {SEGMENT_COLS}")
+        clauses.append(f"c.{col} = ?")
+        params.append(value)
+    for col, (low, high) in (ranges or {}).items():
+        if col not in RANGE_COLS:
+            raise ValueError(f"Cannot filter on a range of {col!r}; choose from {RANGE_COLS}")
+        # With equality filters present, unary + keeps the planner on the segment
+        # index instead of a wide (Churn, value) range scan
+        clauses.append(f"{'+' if filters else ''}c.{col} BETWEEN ? AND ?")
+        params.extend([low, high])
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def segment_stats(conn, filters=None, ranges=None, model_version=None):
+    """Customers, churners and churn rate of one segment (plus the average
+    predicted probability under `model_version`, when it has been scored).
+
+    Equality filters on SEGMENT_COLS are summed from the rollup tables;
+    numeric ranges run on the customers table (joining predictions for the
+    average).
+    """
+    start = time.perf_counter()
+    avg_probability = None
+
+    if ranges:
+        where, params = _where(filters, ranges)
+        customers, churned = conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(c.Churn), 0) FROM customers c{where}", params
+        ).fetchone()
+        if model_version is not None:
+            where, params = _where(filters, ranges, [("p.model_version = ?", model_version)])
+            avg_probability = conn.execute(
+                f"SELECT AVG(p.Churn_Probability) FROM customers c "
+                f"JOIN predictions p ON p.Customer_ID = c.Customer_ID{where}", params
+            ).fetchone()[0]
+    else:
+        where, params = _where(filters)
+        customers, churned = conn.execute(
+            f"SELECT COALESCE(SUM(c.Customers), 0), COALESCE(SUM(c.Customers * c.Churn), 0) "
+            f"FROM segments c{where}", params
+        ).fetchone()
+        if model_version is not None:
+            where, params = _where(filters, extra=[("c.model_version = ?", model_version)])
+            avg_probability = conn.execute(
+                f"SELECT SUM(c.Probability_Sum) / SUM(c.Customers) FROM segment_scores c{where}",
+                params
+            ).fetchone()[0]
+
+    return {
+        "customers": int(customers),
+        "churned": int(churned),
+        "churn_rate": churned / customers if customers else 0.0,
+        "avg_probability": avg_probability,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def churn_by(conn, dim, filters=None, ranges=None):
+    """Customers and churners per value of `dim` within a segment, grouped in SQL."""
+    if dim not in SEGMENT_COLS:
+        raise ValueError(f"Cannot group by {dim!r}; choose from {SEGMENT_COLS}")
+    where, params = _where(filters, ranges)
+    if ranges:
+        query = (f"SELECT c.{dim} AS {dim}, COUNT(*) AS Customers, SUM(c.Churn) AS Churned "
+                 f"FROM customers c{where} GROUP BY c.{dim} ORDER BY c.{dim}")
+    else:
+        query = (f"SELECT c.{dim} AS {dim}, SUM(c.Customers) AS Customers, "
+                 f"SUM(c.Customers * c.Churn) AS Churned "
+                 f"FROM segments c{where} GROUP BY c.{dim} ORDER BY c.{dim}")
+    frame = pd.read_sql_query(query, conn, params=params)
+    frame["Churn_Rate"] = frame["Churned"] / frame["Customers"]
+    return frame
+
+
+def has_predictions(conn, model_version):
+    return conn.execute(
+        "SELECT 1 FROM predictions WHERE model_version = ? LIMIT 1", (model_version,)
+    ).fetchone() is not None
+
+
+def featured_preview(conn, limit=10):
+    """First customers with their engineered features, and the joined column count."""
+    preview = pd.read_sql_query(
+        f"SELECT c.*, {', '.join('f.' + col for col in ENGINEERED_COLS)} FROM customers c "
+        f"JOIN features f ON f.Customer_ID = c.Customer_ID ORDER BY c.Customer_ID LIMIT ?",
+        conn, params=(limit,),
+    )
+    return preview, preview.shape[1]
+
+
+# ------------------ CUBE (FOR aggregates.py) ------------------
+def cube_counts(conn, dims):
+    """Customers per combination of `dims` (SEGMENT_COLS / Churn), from the segments rollup."""
+    cols = ", ".join(dims)
+    return pd.read_sql_query(
+        f"SELECT {cols}, SUM(Customers) AS Customers FROM segments GROUP BY {cols}", conn
+    )
+
+
+def _quantile(conn, col, group, n, q):
+    # Linear interpolation between the two order statistics, like pandas.
+    # OFFSET steps through the (Churn, col) index entry by entry: O(rows)
+    position = q * (n - 1)
+    low = int(np.floor(position))
+    values = [row[0] for row in conn.execute(
+        f"SELECT {col} FROM customers WHERE Churn = ? AND {col} IS NOT NULL "
+        f"ORDER BY {col} LIMIT 2 OFFSET ?",
+        (group, low),
+    )]
+    if len(values) == 1:
+        return float(values[0])
+    return float(values[0] + (position - low) * (values[1] - values[0]))
+
+
+def _box_stats_live(conn, col, max_outliers):
+    # Missing values and rows without a churn label are left out, like aggregates.box_stats
+    records, outlier_parts = {}, []
+    for group, n in conn.execute(
+        f"SELECT Churn, COUNT({col}) FROM customers WHERE Churn IS NOT NULL "
+        f"GROUP BY Churn HAVING COUNT({col}) > 0"
+    ).fetchall():
+        q1, median, q3 = (_quantile(conn, col, group, n, q) for q in (0.25, 0.5, 0.75))
+        low, high = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        lowerfence, upperfence, outliers = conn.execute(
+            f"SELECT (SELECT MIN({col}) FROM customers WHERE Churn = ?1 AND {col} >= ?2), "
+            f"(SELECT MAX({col}) FROM customers WHERE Churn = ?1 AND {col} <= ?3), "
+            f"(SELECT COUNT(*) FROM customers WHERE Churn = ?1 AND ({col} < ?2 OR {col} > ?3))",
+            (group, low, high),
+        ).fetchone()
+        records[group] = {"q1": q1, "median": median, "q3": q3, "lowerfence": float(lowerfence),
+                          "upperfence": float(upperfence), "count": n, "outliers": outliers}
+
+        # Deterministic pseudo-random sample: order by a multiplicative hash of the ID
+        sample = [row[0] for row in conn.execute(
+            f"SELECT {col} FROM customers WHERE Churn = ?1 AND ({col} < ?2 OR {col} > ?3) "
+            f"ORDER BY (Customer_ID * 2654435761) % 4294967296 LIMIT ?4",
+            (group, low, high, max_outliers),
+        )]
+        outlier_parts.append(pd.Series(sample, index=[group] * len(sample), dtype=np.float64))
+
+    stats = pd.DataFrame.from_dict(records, orient="index").sort_index()
+    outliers = pd.concat(outlier_parts) if outlier_parts else pd.Series(dtype=np.float64)
+    return stats, outliers
+
+
+def _store_box_stats(conn):
+    # Once per ingest, so cube builds read a few rows instead of walking the indexes
+    for col in BOX_COLS:
+        stats, outliers = _box_stats_live(conn, col, BOX_OUTLIER_SAMPLE)
+        conn.executemany(
+            "INSERT INTO box_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(col, int(group), *row) for group, row in
+             zip(stats.index, stats.astype(object).values.tolist())],
+        )
+        ranks = outliers.groupby(level=0).cumcount()
+        conn.executemany(
+            "INSERT INTO box_outliers VALUES (?, ?, ?, ?)",
+            [(col, int(group), int(rank), float(value))
+             for group, rank, value in zip(outliers.index, ranks, outliers)],
+        )
+
+
+def _has_box_stats(conn, col):
+    # Stores ingested before the box_stats table existed answer live
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'box_stats'"
+                    ).fetchone() is None:
+        return False
+    return conn.execute("SELECT 1 FROM box_stats WHERE col = ? LIMIT 1", (col,)).fetchone() is not None
+
+
+def box_stats(conn, col, max_outliers=200):
+    """Same (stats, outliers) as aggregates.box_stats.
+
+    BOX_COLS are read from the rows precomputed at ingest; other columns (and
+    larger outlier samples) walk the customers table, O(rows) per quantile.
+    """
+    if col not in RANGE_COLS:
+        raise ValueError(f"No box statistics for {col!r}")
+    if col not in BOX_COLS or max_outliers > BOX_OUTLIER_SAMPLE or not _has_box_stats(conn, col):
+        return _box_stats_live(conn, col, max_outliers)
+
+    stats = pd.read_sql_query(
+        "SELECT Churn, q1, median, q3, lowerfence, upperfence, count, outliers "
+        "FROM box_stats WHERE col = ? ORDER BY Churn",
+        conn, params=(col,), index_col="Churn",
+    )
+    stats.index.name = None
+    sample = conn.execute(
+        "SELECT Churn, value FROM box_outliers WHERE col = ? AND rank < ? ORDER BY Churn, rank",
+        (col, max_outliers),
+    ).fetchall()
+    outliers = pd.Series([value for _, value in sample], index=[group for group, _ in sample],
+                         dtype=np.float64)
+    return stats, outliers
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embedded SQLite store for customers and predictions")
+    parser.add_argument("--db", default=DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_cmd = commands.add_parser("ingest", help="Bulk-load a raw churn CSV / Parquet file")
+    ingest_cmd.add_argument("input", nargs="?", default=os.path.join(DATA_DIR, RAW_CSV))
+    ingest_cmd.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+
+    score_cmd = commands.add_parser("score", help="Store the deployed model's predictions")
+    score_cmd.add_argument("--artifacts", default=None)
+
+    query_cmd = commands.add_parser("query", help="Churn rate of one segment")
+    query_cmd.add_argument("--state")
+    query_cmd.add_argument("--account-type")
+    query_cmd.add_argument("--active", type=int, choices=[0, 1])
+    query_cmd.add_argument("--gender")
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        stats = ingest(args.input, args.db, args.chunksize,
+                       progress=lambda rows: print(f"\rLoaded {rows:,} rows", end=""))
+        print(f"\n{stats['rows']:,} customers in {stats['seconds']:.1f}s "
+              f"(load {stats['load_seconds']:.1f}s at {stats['rows_per_sec']:,.0f} rows/s, "
+              f"indexes {stats['index_seconds']:.1f}s) -> {args.db} ({stats['size_mb']:,.0f} MB)")
+
+    elif args.command == "score":
+        from artifacts import ARTIFACT_DIR, get_artifacts
+
+        artifacts = get_artifacts(args.artifacts or ARTIFACT_DIR)
+        stats = score_customers(connect(args.db), artifacts)
+        print(f"Stored {stats['rows']:,} predictions of model {artifacts.model_version} "
+              f"in {stats['seconds']:.1f}s")
+
+    else:
+        filters = {col: value for col, value in (
+            ("State", args.state), ("Account_Type", args.account_type),
+            ("Is_Active_Member", args.active), ("Gender", args.gender),
+        ) if value is not None}
+        conn = connect(args.db, readonly=True)
+        versions = [row[0] for row in conn.execute(
+            "SELECT model_version FROM model_versions ORDER BY registered_at DESC LIMIT 1")]
+        stats = segment_stats(conn, filters, model_version=versions[0] if versions else None)
+        print(f"{filters or 'All customers'}: {stats['customers']:,} customers, "
+              f"churn rate {stats['churn_rate']:.2%}"
+              + (f", avg predicted {stats['avg_probability']:.2%}"
+                 if stats["avg_probability"] is not None else "")
+              + f" ({stats['seconds'] * 1000:.1f} ms)")
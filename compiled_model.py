@@ -0,0 +1,371 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+# ------------------ CONFIG ------------------
+# "xgboost" (booster.inplace_predict) or "compiled" (CompiledForest below)
+ENGINE = os.environ.get("CHURN_INFERENCE_ENGINE", "xgboost")
+ENGINES = ("xgboost", "compiled")
+
+# Ahead-of-time compiled forest, written next to the other artifacts
+COMPILED_FILE = "compiled_model.npz"
+
+# Size of the (trees x nodes, rows) leaf-mask block evaluated at once; the rows
+# per block follow from it (about 4,800 for 500 depth-3 trees, 66 at depth 6)
+BLOCK_BYTES = 16 * 2 ** 20
+
+# Parity tolerance on probabilities
+PARITY_TOLERANCE = 1e-5
+
+# Leaf bitmask type per tree depth (one bit per leaf); tuning.py searches depth <= 6
+MASK_DTYPES = {0: np.uint8, 1: np.uint8, 2: np.uint8, 3: np.uint8,
+               4: np.uint16, 5: np.uint32, 6: np.uint64}
+
+
+# ------------------ COMPILER ------------------
+def _parse_base_score(value):
+    # Stored as "5E-1" or, in newer models, "[5E-1]"
+    return float(str(value).strip("[]"))
+
+
+def _fill_subtree(feature, threshold, default_left, leaf_value, tree, node, slot, depth, max_depth):
+    """Copy XGBoost node `node` into complete-tree slot `slot`; shallow leaves are
+    padded into always-left splits whose leaves all carry the leaf value."""
+    if depth == max_depth:
+        leaf_value[slot - (2 ** max_depth - 1)] = tree["split_conditions"][node]
+        return
+
+    left = tree["left_children"][node]
+    if left == -1:
+        threshold[slot] = np.inf  # x >= inf is never true: always left (NaN too)
+        default_left[slot] = True
+        for child in (2 * slot + 1, 2 * slot + 2):
+            _fill_subtree(feature, threshold, default_left, leaf_value, tree, node,
+                          child, depth + 1, max_depth)
+        return
+
+    feature[slot] = tree["split_indices"][node]
+    threshold[slot] = tree["split_conditions"][node]
+    default_left[slot] = bool(tree["default_left"][node])
+    _fill_subtree(feature, threshold, default_left, leaf_value, tree, left,
+                  2 * slot + 1, depth + 1, max_depth)
+    _fill_subtree(feature, threshold, default_left, leaf_value, tree,
+                  tree["right_children"][node], 2 * slot + 2, depth + 1, max_depth)
+
+
+def _tree_depth(tree, node=0):
+    left = tree["left_children"][node]
+    if left == -1:
+        return 0
+    return 1 + max(_tree_depth(tree, left), _tree_depth(tree, tree["right_children"][node]))
+
+
+class CompiledForest:
+    """A binary:logistic gbtree flattened into dense node arrays.
+
+    Every tree is padded to a complete tree of the forest's max depth D and
+    evaluated QuickScorer-style: each node carries a bitmask of the leaves in
+    its left subtree, and a row that goes right at a node rules those leaves
+    out. For a block of rows, every node of every tree is compared at once
+    (rows along the last axis, one broadcast comparison per feature), the
+    ruled-out masks are OR-ed per tree, and the exit leaf is the lowest leaf
+    left. For D <= 3 the 8-bit mask indexes a per-tree table of leaf values
+    directly. There is no Python loop over trees, only over features and row
+    blocks.
+    """
+
+    def __init__(self, feature, threshold, default_left, leaf_value, base_margin,
+                 feature_names=None, model_version=None):
+        self.feature = feature              # (trees, 2^D - 1) int32
+        self.threshold = threshold          # (trees, 2^D - 1) float32
+        self.default_left = default_left    # (trees, 2^D - 1) bool
+        self.leaf_value = leaf_value        # (trees, 2^D) float32
+        self.base_margin = float(base_margin)
+        self.feature_names = feature_names
+        self.model_version = model_version
+
+        self.n_trees, n_nodes = feature.shape
+        self.depth = int(np.log2(n_nodes + 1))
+        if self.depth not in MASK_DTYPES:
+            raise ValueError(f"Trees deeper than {max(MASK_DTYPES)} levels are not supported")
+        self._mask_dtype = MASK_DTYPES[self.depth]
+        n_leaves = 2 ** self.depth
+        self.block_rows = max(1, BLOCK_BYTES // (feature.size * np.dtype(self._mask_dtype).itemsize))
+
+        # Node k (level l, position p) rules out leaves [p * w, p * w + w / 2), w = 2^(D - l)
+        node_mask = np.zeros(n_nodes, dtype=np.uint64)
+        for k in range(n_nodes):
+            level = int(np.log2(k + 1))
+            width = 2 ** (self.depth - level)
+            first = (k - (2 ** level - 1)) * width
+            node_mask[k] = ((1 << (width // 2)) - 1) << first
+        flat_mask = np.tile(node_mask.astype(self._mask_dtype), self.n_trees)
+
+        flat_feature = feature.ravel()
+        # Per feature: the flat node positions splitting on it, thresholds, missing
+        # direction and the leaves a right turn there rules out
+        self._feature_nodes = [
+            (f, nodes, threshold.ravel()[nodes][:, None],
+             ~default_left.ravel()[nodes][:, None], flat_mask[nodes][:, None])
+            for f in np.unique(flat_feature)
+            for nodes in [np.flatnonzero(flat_feature == f)]
+        ]
+
+        if self.depth <= 3:
+            # Lowest leaf not ruled out, for every possible 8-bit mask
+            lowest = np.array([next((j for j in range(n_leaves) if not (v >> j) & 1), 0)
+                               for v in range(256)])
+            self._table = leaf_value[:, lowest].ravel()
+            self._table_offset = (np.arange(self.n_trees, dtype=np.int32) * 256)[:, None]
+        else:
+            self._leaf_flat = leaf_value.ravel()
+            self._tree_offset = (np.arange(self.n_trees) * n_leaves)[:, None]
+
+    @classmethod
+    def from_booster(cls, booster, model_version=None):
+        model = json.loads(booster.save_raw("json"))
+        learner = model["learner"]
+        if learner["objective"]["name"] != "binary:logistic":
+            raise ValueError(f"Only binary:logistic models compile, not {learner['objective']['name']}")
+        if learner["gradient_booster"]["name"] != "gbtree":
+            raise ValueError(f"Only gbtree models compile, not {learner['gradient_booster']['name']}")
+
+        trees = learner["gradient_booster"]["model"]["trees"]
+        if any(any(tree["split_type"]) for tree in trees):
+            raise ValueError("Categorical splits are not supported")
+
+        max_depth = max(_tree_depth(tree) for tree in trees)
+        n_nodes = 2 ** max_depth - 1
+        feature = np.zeros((len(trees), n_nodes), dtype=np.int32)
+        threshold = np.zeros((len(trees), n_nodes), dtype=np.float32)
+        default_left = np.zeros((len(trees), n_nodes), dtype=bool)
+        leaf_value = np.zeros((len(trees), 2 ** max_depth), dtype=np.float32)
+        for t, tree in enumerate(trees):
+            _fill_subtree(feature[t], threshold[t], default_left[t], leaf_value[t],
+                          tree, 0, 0, 0, max_depth)
+
+        base_score = _parse_base_score(learner["learner_model_param"]["base_score"])
+        return cls(feature, threshold, default_left, leaf_value,
+                   np.log(base_score / (1 - base_score)),
+                   booster.feature_names, model_version)
+
+    # ------------------ PERSISTENCE ------------------
+    def save(self, path):
+        with open(path + ".tmp", "wb") as f:
+            np.savez(
+                f, feature=self.feature, threshold=self.threshold,
+                default_left=self.default_left, leaf_value=self.leaf_value,
+                base_margin=self.base_margin,
+                feature_names=np.array(self.feature_names or [], dtype=str),
+                model_version=np.array(self.model_version or ""),
+            )
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data["feature"], data["threshold"], data["default_left"], data["leaf_value"],
+                float(data["base_margin"]), data["feature_names"].tolist() or None,
+                str(data["model_version"]) or None,
+            )
+
+    # ------------------ INFERENCE ------------------
+    def _margin_block(self, X):
+        XT = np.ascontiguousarray(X.T)
+
+        # Leaves ruled out at every node of every tree: (trees x nodes, rows). XGBoost
+        # goes left when x < threshold, and missing values follow default_left
+        ruled_out = np.empty((self.feature.size, len(X)), dtype=self._mask_dtype)
+        for f, nodes, thresholds, missing_right, masks in self._feature_nodes:
+            go_right = XT[f] >= thresholds
+            missing = np.isnan(XT[f])
+            if missing.any():
+                go_right = np.where(missing, missing_right, go_right)
+            ruled_out[nodes] = go_right * masks
+        ruled_out = np.bitwise_or.reduce(ruled_out.reshape(self.n_trees, -1, len(X)), axis=1)
+
+        if self.depth <= 3:
+            return self._table[ruled_out + self._table_offset].sum(axis=0, dtype=np.float64)
+
+        # Exit leaf = lowest bit still set after inverting (exact powers of two in float64)
+        remaining = ~ruled_out
+        lowest_bit = remaining & (~remaining + self._mask_dtype(1))
+        leaf = np.log2(lowest_bit.astype(np.float64)).astype(np.intp)
+        return self._leaf_flat[leaf + self._tree_offset].sum(axis=0, dtype=np.float64)
+
+    def predict_margin(self, X, block_rows=None):
+        block_rows = block_rows or self.block_rows
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        margin = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), block_rows):
+            margin[start:start + block_rows] = self._margin_block(X[start:start + block_rows])
+        return margin + self.base_margin
+
+    def predict(self, X, block_rows=None):
+        """Churn probability per row (float32), like booster.inplace_predict."""
+        return (1.0 / (1.0 + np.exp(-self.predict_margin(X, block_rows)))).astype(np.float32)
+
+    def predict_proba(self, X):
+        """(n, 2) class probabilities, so it can stand in for the XGBClassifier."""
+        prob = self.predict(X)
+        return np.column_stack([1 - prob, prob])
+
+
+# ------------------ ENGINE SELECTION ------------------
+class XGBoostEngine:
+    """The booster itself behind the same predict(X) interface."""
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, X):
+        return self.booster.inplace_predict(X)
+
+    def predict_proba(self, X):
+        prob = self.predict(X)
+        return np.column_stack([1 - prob, prob])
+
+
+_lock = threading.Lock()
+_compiled = {}
+
+
+def compiled_path(folder=None):
+    from artifacts import ARTIFACT_DIR
+
+    return os.path.join(folder or ARTIFACT_DIR, COMPILED_FILE)
+
+
+def compile_artifacts(artifacts, folder=None):
+    """Compile the deployed booster and write compiled_model.npz next to it."""
+    forest = CompiledForest.from_booster(artifacts.model.get_booster(), artifacts.model_version)
+    forest.save(compiled_path(folder))
+    return forest
+
+
+def get_compiled(artifacts, folder=None):
+    """The compiled forest for this model version: read from compiled_model.npz
+    when it was compiled ahead of time for the same version, compiled in memory
+    otherwise. Shared per process."""
+    with _lock:
+        forest = _compiled.get(artifacts.model_version)
+        if forest is None:
+            path = compiled_path(folder)
+            if os.path.exists(path):
+                forest = CompiledForest.load(path)
+            if forest is None or forest.model_version != artifacts.model_version:
+                forest = CompiledForest.from_booster(artifacts.model.get_booster(),
+                                                     artifacts.model_version)
+            _compiled.clear()
+            _compiled[artifacts.model_version] = forest
+    return forest
+
+
+def get_engine(artifacts, engine=None):
+    """Inference engine chosen by `engine` or CHURN_INFERENCE_ENGINE; both expose
+    predict(X) -> probabilities and predict_proba(X)."""
+    engine = engine or ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown inference engine {engine!r}; choose from {ENGINES}")
+    if engine == "compiled":
+        return get_compiled(artifacts)
+    return XGBoostEngine(artifacts.model.get_booster())
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    import argparse
+    import pickle
+
+    from artifacts import ARTIFACT_DIR, ARTIFACT_FILES, load_artifacts
+
+    parser = argparse.ArgumentParser(description="Compiled tree-ensemble inference engine")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("compile", help=f"Write {COMPILED_FILE} for the deployed model")
+
+    parity_cmd = commands.add_parser("parity", help="Compare with XGBoost on the holdout split")
+    parity_cmd.add_argument("--data", default=None, help="Labelled churn CSV / Parquet")
+    parity_cmd.add_argument("--tolerance", type=float, default=PARITY_TOLERANCE)
+
+    bench_cmd = commands.add_parser("benchmark", help="Rows/sec and load time vs predict_proba")
+    bench_cmd.add_argument("--rows", type=int, nargs="+", default=[1, 1_000, 1_000_000])
+
+    args = parser.parse_args()
+    artifacts = load_artifacts(args.artifacts)
+
+    if args.command == "compile":
+        start = time.perf_counter()
+        forest = compile_artifacts(artifacts, args.artifacts)
+        print(f"Compiled {forest.n_trees} trees (depth {forest.depth}) of model "
+              f"{artifacts.model_version} in {time.perf_counter() - start:.2f}s "
+              f"-> {compiled_path(args.artifacts)}")
+
+    elif args.command == "parity":
+        from sklearn.model_selection import train_test_split
+
+        from training import RANDOM_STATE, TEST_SIZE, load_training_frame
+
+        df = load_training_frame(args.data)
+        _, test_rows = train_test_split(np.arange(len(df)), test_size=TEST_SIZE,
+                                        random_state=RANDOM_STATE)
+        X = artifacts.transformer.transform(df.iloc[np.sort(test_rows)])
+        forest = get_compiled(artifacts, args.artifacts)
+
+        reference = artifacts.model.predict_proba(X)[:, 1]
+        compiled = forest.predict(X)
+        diff = np.abs(compiled.astype(np.float64) - reference)
+        labels_match = np.mean((compiled > 0.5) == (reference > 0.5))
+
+        # Rows with NaN inputs take the learned default branches
+        X_missing = X[:1000].copy()
+        X_missing[np.random.default_rng(0).random(X_missing.shape) < 0.2] = np.nan
+        missing_diff = np.abs(forest.predict(X_missing) - artifacts.model.predict_proba(X_missing)[:, 1])
+
+        print(f"Holdout: {len(X):,} rows | max |diff| {diff.max():.2e} | mean {diff.mean():.2e} | "
+              f"labels identical on {labels_match:.4%}")
+        print(f"With 20% missing values: max |diff| {missing_diff.max():.2e}")
+        if max(diff.max(), missing_diff.max()) > args.tolerance:
+            raise SystemExit(f"Parity FAILED (tolerance {args.tolerance:g})")
+        print(f"Parity OK (tolerance {args.tolerance:g})")
+
+    else:
+        from synthetic_data import load_customers
+
+        path = compiled_path(args.artifacts)
+        if not os.path.exists(path):
+            compile_artifacts(artifacts, args.artifacts)
+
+        start = time.perf_counter()
+        with open(os.path.join(args.artifacts, ARTIFACT_FILES["model"]), "rb") as f:
+            model = pickle.load(f)
+        pickle_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        forest = CompiledForest.load(path)
+        npz_seconds = time.perf_counter() - start
+        print(f"Load: pickle {pickle_seconds * 1000:.1f} ms | compiled npz {npz_seconds * 1000:.1f} ms")
+
+        booster = model.get_booster()
+        X_all = artifacts.transformer.transform(load_customers(max(args.rows)))
+        for n in args.rows:
+            X = X_all[:n]
+            runs = max(1, min(200, 200_000 // n))
+            results = {}
+            for label, fn in (("predict_proba", lambda: model.predict_proba(X)[:, 1]),
+                              ("inplace_predict", lambda: booster.inplace_predict(X)),
+                              ("compiled", lambda: forest.predict(X))):
+                fn()
+                start = time.perf_counter()
+                for _ in range(runs):
+                    fn()
+                results[label] = (time.perf_counter() - start) / runs
+            print(f"{n:>9,} rows: " + " | ".join(
+                f"{label} {n / seconds:>12,.0f} rows/s ({seconds * 1000:.3f} ms)"
+                for label, seconds in results.items()))
@@ -0,0 +1,214 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import add_engineered_features
+
+# ------------------ DATA LOCATION ------------------
+# Defaults to the project folder; set CHURN_DATA_DIR to point somewhere else
+DATA_DIR = os.environ.get(
+    "CHURN_DATA_DIR", os.path.dirname(os.path.abspath(__file__))
+)
+
+RAW_CSV = "indian_bank_customer_churn.csv"
+FEATURED_CSV = "indian_bank_customer_churn_featured1.csv"
+
+# ------------------ COLUMN TYPES ------------------
+CATEGORY_COLS = ["Gender", "State", "Account_Type"]
+FLAG_COLS = [
+    "Has_Credit_Card", "Is_Active_Member", "Churn",
+    "Low_Credit_Score", "HighBalance_LowActivity", "Num_Products"
+]
+INT_COLS = ["Customer_ID", "Age", "Tenure_Years", "Credit_Score", "Tenure_NumProducts"]
+MONEY_COLS = ["Balance_INR", "Estimated_Salary_INR", "Balance_to_Salary"]
+
+_lock = threading.Lock()
+_frames = {}
+_stats = {}
+
+
+def downcast(df):
+    """Categoricals for text columns, int8/int16 flags and counts, float32 money."""
+    for col in df.columns:
+        if col in CATEGORY_COLS:
+            df[col] = df[col].astype("category")
+        elif col in FLAG_COLS and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = df[col].astype(np.int8)
+        elif col in INT_COLS and pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif col in MONEY_COLS:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def _columnar_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".feather"
+
+
+def _read_columnar(csv_path):
+    """Read the typed Feather copy of a CSV, building it first if it is missing or stale."""
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return downcast(pd.read_csv(csv_path)), "csv"
+
+    columnar_path = _columnar_path(csv_path)
+    if (not os.path.exists(columnar_path)
+            or os.path.getmtime(columnar_path) < os.path.getmtime(csv_path)):
+        df = downcast(pd.read_csv(csv_path))
+        # Uncompressed so later loads can memory-map the file; written next to it
+        # and swapped in, so a failed write never leaves a half file behind
+        tmp_path = columnar_path + ".tmp"
+        try:
+            feather.write_feather(df, tmp_path, compression="uncompressed")
+            os.replace(tmp_path, columnar_path)
+        except OSError:
+            # Read-only data folder (or disk full): serve the parsed frame uncached
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return df, "csv (feather cache not writable)"
+        return df, "csv -> feather"
+
+    table = feather.read_table(columnar_path, memory_map=True)
+    return table.to_pandas(split_blocks=True), "feather (memory-mapped)"
+
+
+def _rss_mb():
+    """Resident memory of this process in MB (/proc on Linux; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _evict(path, mtime):
+    """Drop frames built from older versions of `path` (call with the lock held)."""
+    for key in [key for key in _frames if key[-2] == path and key[-1] != mtime]:
+        del _frames[key]
+
+
+def _load(csv_path):
+    mtime = os.path.getmtime(csv_path)
+    key = (csv_path, mtime)
+    if key in _frames:
+        return _frames[key]
+
+    with _lock:
+        if key not in _frames:
+            _evict(csv_path, mtime)
+            rss_before = _rss_mb()
+            start = time.perf_counter()
+            df, source = _read_columnar(csv_path)
+            _frames[key] = df
+            _stats[csv_path] = {
+                "source": source,
+                "seconds": time.perf_counter() - start,
+                # Size of the frame's columns, and what the load added to process RSS
+                # (memory-mapped columns only count once their pages are touched)
+                "frame_mb": float(df.memory_usage(deep=True).sum()) / 1e6,
+                "rss_added_mb": _rss_mb() - rss_before,
+            }
+    return _frames[key]
+
+
+# ------------------ PUBLIC LOADERS ------------------
+# Returned frames are shared by every page and session: treat them as read-only.
+def load_raw(data_dir=DATA_DIR):
+    """Raw customer data, parsed once per process and file version."""
+    return _load(os.path.join(data_dir, RAW_CSV))
+
+
+def load_featured(data_dir=DATA_DIR):
+    """Raw data plus the four engineered features.
+
+    Built on top of the shared raw frame, so only the four new columns take
+    extra memory. Falls back to the notebook's featured CSV when the raw file
+    is not available.
+    """
+    raw_path = os.path.join(data_dir, RAW_CSV)
+    if not os.path.exists(raw_path):
+        return _load(os.path.join(data_dir, FEATURED_CSV))
+
+    raw = load_raw(data_dir)
+    mtime = os.path.getmtime(raw_path)
+    key = ("featured", raw_path, mtime)
+    if key not in _frames:
+        with _lock:
+            if key not in _frames:
+                _evict(raw_path, mtime)
+                _frames[key] = downcast(add_engineered_features(raw.copy(deep=False)))
+    return _frames[key]
+
+
+def load_stats():
+    """Source, load time, frame size and RSS added by every frame loaded so far."""
+    return {path: dict(stats) for path, stats in _stats.items()}
+
+
+def dataset_version(data_dir=DATA_DIR):
+    """Version key for anything derived from the raw data."""
+    raw_path = os.path.join(data_dir, RAW_CSV)
+    return raw_path, os.path.getmtime(raw_path)
+
+
+def clear_cache():
+    with _lock:
+        _frames.clear()
+
+
+# ------------------ BENCHMARK ------------------
+def _measure(mode):
+    """One load in this (fresh) process: seconds, frame MB and RSS added.
+
+    A page then reads every column, so the numeric columns are summed before
+    RSS is taken again; memory-mapped pages count once touched.
+    """
+    import pyarrow.feather  # noqa: F401  library import is not part of the data's footprint
+
+    csv_path = os.path.join(DATA_DIR, RAW_CSV)
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    df = pd.read_csv(csv_path) if mode == "read_csv" else load_raw()
+    seconds = time.perf_counter() - start
+    df.select_dtypes("number").sum()
+    return {
+        "seconds": seconds,
+        "frame_mb": float(df.memory_usage(deep=True).sum()) / 1e6,
+        "rss_added_mb": _rss_mb() - rss_before,
+    }
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["_measure"]:
+        print(json.dumps(_measure(sys.argv[2])))
+        sys.exit()
+
+    csv_path = os.path.join(DATA_DIR, RAW_CSV)
+    if os.path.exists(_columnar_path(csv_path)):
+        os.remove(_columnar_path(csv_path))
+
+    # Each load in its own process, so RSS before / after is not muddied by the others
+    print(f"{'':<30}{'seconds':>8} | {'frame MB':>8} | {'RSS added MB':>12}")
+    for label, mode in [("pd.read_csv (default dtypes)", "read_csv"),
+                        ("Cold (csv -> feather)", "load"),
+                        ("Warm (memory-mapped feather)", "load")]:
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), "_measure", mode],
+                                capture_output=True, text=True, check=True)
+        r = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{label:<30}{r['seconds']:8.3f} | {r['frame_mb']:8.1f} | {r['rss_added_mb']:12.1f}")
+
+    load_raw()
+    start = time.perf_counter()
+    load_raw()
+    print(f"{'Cached (same process)':<30}{(time.perf_counter() - start) * 1000:.3f} ms")
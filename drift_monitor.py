@@ -0,0 +1,364 @@
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from data_access import DATA_DIR
+from features import CAT_COLS, NUM_COLS, engineer_features
+
+# ------------------ CONFIG ------------------
+# One JSON report per monitored batch
+REPORT_DIR = os.environ.get("CHURN_DRIFT_DIR", os.path.join(DATA_DIR, "drift_reports"))
+
+# Quantile bins per numeric feature in the training baseline
+N_BINS = 20
+
+# Usual PSI reading: < 0.1 stable, 0.1 - 0.25 moderate shift, > 0.25 major shift
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+
+# Model output, monitored like a feature when predictions are passed in
+PROB_COL = "Churn_Probability"
+
+# Floor for empty bins in PSI
+EPSILON = 1e-4
+
+STATUSES = ["ok", "warn", "alert"]
+
+
+# ------------------ BASELINE ------------------
+def _numeric_columns(df):
+    """The 12 scaler inputs as contiguous arrays (the 4 engineered ones recomputed)."""
+    engineered = engineer_features(df)
+    return {col: np.asarray(engineered[col] if col in engineered else df[col]) for col in NUM_COLS}
+
+
+def _quantile_edges(values, n_bins=N_BINS):
+    """Distinct inner quantile edges; integer columns get integer edges."""
+    values = np.asarray(values)
+    if values.dtype.kind == "f":
+        values = values[~np.isnan(values)]
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+    if values.dtype.kind in "iub":
+        edges = np.unique(np.ceil(edges))
+    return edges
+
+
+def build_baseline(df, transformer, probs=None, n_bins=N_BINS):
+    """Reference distributions of the training data: per numeric feature its
+    quantile bin edges and bin shares, mean, std and missing rate; per
+    categorical feature the share of each training category."""
+    columns = _numeric_columns(df)
+    edges = {col: _quantile_edges(values, n_bins) for col, values in columns.items()}
+    if probs is not None:
+        edges[PROB_COL] = _quantile_edges(probs, n_bins)
+
+    monitor = DriftMonitor({
+        "numeric": {col: {"edges": col_edges.tolist()} for col, col_edges in edges.items()},
+        "categorical": {col: dict.fromkeys(transformer.input_categories[col], 0.0)
+                        for col in CAT_COLS},
+    })
+    monitor.update(df, probs)
+    return monitor.summary()
+
+
+def load_baseline(artifacts):
+    """The baseline saved in the bundle manifest, or None."""
+    return (artifacts.manifest or {}).get("drift_baseline")
+
+
+# ------------------ STREAMING MONITOR ------------------
+class DriftMonitor:
+    """Streaming per-feature histograms of scored batches against a baseline.
+
+    update() is called once per scoring chunk. Numeric columns are counted
+    into the baseline's quantile bins with one compare-and-count pass per
+    edge over the contiguous column, plus missing count, sum and sum of
+    squares; categorical columns keep a count per value. Nothing per row is
+    kept, so the state is a few KB however many rows go through.
+    """
+
+    def __init__(self, baseline):
+        self.baseline = baseline
+        self.edges = {col: np.asarray(spec["edges"], dtype=np.float64)
+                      for col, spec in baseline["numeric"].items()}
+        self.categories = {col: list(spec) for col, spec in baseline["categorical"].items()}
+        self._known = {col: set(values) for col, values in self.categories.items()}
+
+        self.rows = 0
+        self.unknown_rows = 0
+        self.seconds = 0.0
+        self._ge = {col: np.zeros(len(edges), dtype=np.int64) for col, edges in self.edges.items()}
+        self._valid = dict.fromkeys(self.edges, 0)
+        self._sum = dict.fromkeys(self.edges, 0.0)
+        self._sumsq = dict.fromkeys(self.edges, 0.0)
+        self._values = {col: {} for col in self.categories}
+
+    def _update_numeric(self, col, values):
+        """Running counts of values >= each edge, non-missing count, sum and sum of squares."""
+        if values.dtype.kind == "f":
+            missing = np.isnan(values)
+            if missing.any():
+                values = values[~missing]
+            edges = self.edges[col].astype(values.dtype)
+        else:
+            # Python ints compare correctly with any integer width
+            edges = [int(edge) for edge in self.edges[col]]
+
+        self._valid[col] += len(values)
+        ge = self._ge[col]
+        for k, edge in enumerate(edges):
+            ge[k] += np.count_nonzero(values >= edge)
+        as_float = values.astype(np.float64)
+        self._sum[col] += float(as_float.sum())
+        self._sumsq[col] += float(np.dot(as_float, as_float))
+
+    def update(self, chunk, probs=None):
+        """Add one batch of raw customer rows (and its predicted probabilities)."""
+        start = time.perf_counter()
+        self.rows += len(chunk)
+
+        for col, values in _numeric_columns(chunk).items():
+            self._update_numeric(col, values)
+        if probs is not None and PROB_COL in self.edges:
+            self._update_numeric(PROB_COL, np.asarray(probs))
+
+        unknown = None
+        for col, known in self._known.items():
+            counts = chunk[col].value_counts(sort=False, dropna=False)
+            seen = self._values[col]
+            has_unknown = False
+            for value, count in counts[counts > 0].items():
+                value = str(value)
+                seen[value] = seen.get(value, 0) + int(count)
+                has_unknown = has_unknown or value not in known
+            # Per-row mask only for the rare chunks that have an unseen value
+            if has_unknown:
+                mask = ~chunk[col].astype(str).isin(known).to_numpy()
+                unknown = mask if unknown is None else unknown | mask
+        if unknown is not None:
+            self.unknown_rows += int(unknown.sum())
+
+        self.seconds += time.perf_counter() - start
+
+    # ------------------ SUMMARY / REPORT ------------------
+    def _shares(self, col):
+        """Bin shares from the running >= edge counts."""
+        valid, ge = self._valid[col], self._ge[col]
+        counts = -np.diff(np.concatenate([[valid], ge, [0]]))
+        return counts / max(valid, 1)
+
+    def summary(self):
+        """Distributions seen so far, in the baseline format."""
+        numeric = {}
+        for col, edges in self.edges.items():
+            if col == PROB_COL and not self._valid[col]:
+                continue  # monitored without predictions
+            valid = max(self._valid[col], 1)
+            mean = self._sum[col] / valid
+            numeric[col] = {
+                "edges": edges.tolist(),
+                "shares": self._shares(col).tolist(),
+                "mean": mean,
+                "std": float(np.sqrt(max(self._sumsq[col] / valid - mean ** 2, 0.0))),
+                "missing_rate": 1 - self._valid[col] / max(self.rows, 1),
+            }
+        categorical = {
+            col: {value: count / max(self.rows, 1) for value, count in sorted(self._values[col].items())}
+            for col in self.categories
+        }
+        return {"rows": self.rows, "numeric": numeric, "categorical": categorical}
+
+    def report(self, source=None, model_version=None):
+        """PSI and KS (on the baseline bins) per feature, unknown categories and
+        an ok / warn / alert status per feature and overall."""
+        live = self.summary()
+        numeric, categorical = {}, {}
+
+        for col, spec in live["numeric"].items():
+            base = self.baseline["numeric"][col]
+            shift = (spec["mean"] - base["mean"]) / base["std"] if base["std"] > 0 else 0.0
+            entry = {
+                "psi": population_stability_index(base["shares"], spec["shares"]),
+                "ks": ks_statistic(base["shares"], spec["shares"]),
+                "mean": spec["mean"],
+                "baseline_mean": base["mean"],
+                "mean_shift_sd": shift,
+                "missing_rate": spec["missing_rate"],
+            }
+            entry["status"] = _status(entry["psi"])
+            numeric[col] = entry
+
+        for col, known in self.categories.items():
+            base = self.baseline["categorical"][col]
+            shares = live["categorical"][col]
+            unknown = {value: self._values[col][value] for value in shares
+                       if value not in self._known[col]}
+            base_shares = [base.get(value, 0.0) for value in known] + [0.0]
+            live_shares = [shares.get(value, 0.0) for value in known] + [sum(
+                shares[value] for value in unknown)]
+            entry = {
+                "psi": population_stability_index(base_shares, live_shares),
+                "unknown_values": unknown,
+            }
+            entry["status"] = _status(entry["psi"], minimum="warn" if unknown else "ok")
+            categorical[col] = entry
+
+        statuses = [entry["status"] for entry in list(numeric.values()) + list(categorical.values())]
+        return _rounded({
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "source": None if source is None else str(source),
+            "model_version": model_version,
+            "rows": self.rows,
+            "baseline_rows": self.baseline["rows"],
+            "unknown_category_rows": self.unknown_rows,
+            "monitor_seconds": self.seconds,
+            "status": max(statuses, key=STATUSES.index) if statuses else "ok",
+            "alerts": [col for col, entry in {**numeric, **categorical}.items()
+                       if entry["status"] != "ok"],
+            "numeric": numeric,
+            "categorical": categorical,
+        })
+
+
+# ------------------ STATISTICS ------------------
+def population_stability_index(expected, actual, epsilon=EPSILON):
+    expected = np.clip(np.asarray(expected, dtype=np.float64), epsilon, None)
+    actual = np.clip(np.asarray(actual, dtype=np.float64), epsilon, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_statistic(expected, actual):
+    """Largest gap between the two CDFs at the bin edges."""
+    return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected)), initial=0.0))
+
+
+def _status(psi, minimum="ok"):
+    status = "alert" if psi >= PSI_ALERT else "warn" if psi >= PSI_WARN else "ok"
+    return max(status, minimum, key=STATUSES.index)
+
+
+def _rounded(value, digits=6):
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: _rounded(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_rounded(item, digits) for item in value]
+    return value
+
+
+# ------------------ REPORT FILES ------------------
+def save_report(report, report_dir=REPORT_DIR):
+    os.makedirs(report_dir, exist_ok=True)
+    stamp = report["created_at"].replace(":", "").replace("-", "")[:15]
+    path = os.path.join(report_dir, f"drift_{stamp}_{report['model_version'] or 'unknown'}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+    return path
+
+
+def print_report(report):
+    print(f"Drift: {report['status'].upper()} | {report['rows']:,} rows vs {report['baseline_rows']:,} "
+          f"baseline | {report['unknown_category_rows']:,} rows with unknown categories | "
+          f"monitor {report['monitor_seconds']:.2f}s")
+    for col, entry in report["numeric"].items():
+        if entry["status"] != "ok":
+            print(f"  {entry['status']:>5} {col}: PSI {entry['psi']:.3f}, KS {entry['ks']:.3f}, "
+                  f"mean shift {entry['mean_shift_sd']:+.2f} sd")
+    for col, entry in report["categorical"].items():
+        if entry["status"] != "ok":
+            print(f"  {entry['status']:>5} {col}: PSI {entry['psi']:.3f}, "
+                  f"unknown {entry['unknown_values']}")
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    import argparse
+
+    from artifacts import ARTIFACT_DIR, load_artifacts
+    from batch_scoring import DEFAULT_CHUNKSIZE, iter_chunks, score_chunk
+    from pipeline_bundle import BUNDLE_FILE, update_manifest
+
+    parser = argparse.ArgumentParser(description="Feature drift monitoring against the training baseline")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    baseline_cmd = commands.add_parser("baseline", help="Build the baseline from the training split")
+    baseline_cmd.add_argument("--data", default=None, help="Labelled churn CSV / Parquet")
+    baseline_cmd.add_argument("--dry-run", action="store_true", help="Print, do not save")
+
+    check_cmd = commands.add_parser("check", help="Monitor a file without scoring it")
+    check_cmd.add_argument("input", help="CSV or Parquet file with raw customer columns")
+    check_cmd.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    check_cmd.add_argument("--report-dir", default=REPORT_DIR)
+
+    bench_cmd = commands.add_parser("benchmark", help="Monitoring overhead on batch scoring")
+    bench_cmd.add_argument("--rows", type=int, default=1_000_000)
+
+    args = parser.parse_args()
+    artifacts = load_artifacts(args.artifacts)
+
+    if args.command == "baseline":
+        from training import load_training_frame, split_frame
+
+        train_df, _ = split_frame(load_training_frame(args.data))
+        probs = artifacts.model.get_booster().inplace_predict(artifacts.transformer.transform(train_df))
+        start = time.perf_counter()
+        baseline = build_baseline(train_df, artifacts.transformer, probs)
+        print(f"Baseline from {baseline['rows']:,} training rows in {time.perf_counter() - start:.2f}s "
+              f"({len(json.dumps(baseline)) / 1024:.1f} KB)")
+
+        bundle_path = os.path.join(args.artifacts, BUNDLE_FILE)
+        if args.dry_run:
+            pass
+        elif artifacts.manifest is None:
+            print(f"No {BUNDLE_FILE} to save into; run `python pipeline_bundle.py export` first")
+        else:
+            update_manifest(bundle_path, {"drift_baseline": baseline})
+            print(f"Saved the drift baseline into {bundle_path}")
+
+    else:
+        baseline = load_baseline(artifacts)
+        if baseline is None:
+            raise SystemExit("No drift baseline in the bundle; run `python drift_monitor.py baseline` first")
+
+        if args.command == "check":
+            monitor = DriftMonitor(baseline)
+            for chunk in iter_chunks(args.input, args.chunksize):
+                monitor.update(chunk)
+            report = monitor.report(args.input, artifacts.model_version)
+            print_report(report)
+            print(f"Report: {save_report(report, args.report_dir)}")
+
+        else:
+            from synthetic_data import load_customers
+
+            df = load_customers(args.rows)
+            chunks = [df.iloc[i:i + DEFAULT_CHUNKSIZE] for i in range(0, len(df), DEFAULT_CHUNKSIZE)]
+            threshold = artifacts.thresholds["decision"]
+
+            # Wall-time differences of ~2% drown in run-to-run noise, so the
+            # monitor's own time is compared with the rest of the scoring run
+            monitor = DriftMonitor(baseline)
+            start = time.perf_counter()
+            for chunk in chunks:
+                score_chunk(chunk, artifacts.model, artifacts.transformer, threshold, monitor=monitor)
+            scoring = time.perf_counter() - start - monitor.seconds
+
+            print(f"{args.rows:,} rows: scoring {scoring:.2f}s | monitor {monitor.seconds:.3f}s "
+                  f"({monitor.seconds / scoring:.1%} of scoring)")
+            print_report(monitor.report("synthetic", artifacts.model_version))
+
+            # Same customers with salaries up 30% and a state the encoder never saw
+            drifted = df.copy()
+            drifted["Estimated_Salary_INR"] *= np.float32(1.3)
+            states = drifted["State"].astype(str).to_numpy()
+            states[::100] = "Punjab"
+            drifted["State"] = states
+            monitor = DriftMonitor(baseline)
+            monitor.update(drifted)
+            print("\nDrifted copy:")
+            print_report(monitor.report("synthetic-drifted", artifacts.model_version))
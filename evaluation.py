@@ -0,0 +1,264 @@
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_access import DATA_DIR, RAW_CSV
+from thresholds import rank_scores
+
+# ------------------ HOLDOUT SOURCES ------------------
+# The notebook's transformed test matrix and labels, when exported next to the data
+X_TEST_CSV = "X_test.csv"
+Y_TEST_CSV = "y_test.csv"
+
+# Scored holdouts: <model_version>_<data key>.probs.npy (float32) + .labels.npy (int8)
+CACHE_DIR = os.environ.get(
+    "CHURN_EVAL_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "eval_cache")
+)
+
+# Points kept when drawing ROC / PR curves
+MAX_CURVE_POINTS = 2_000
+
+_lock = threading.Lock()
+_holdouts = {}
+
+
+def holdout_source(data_dir=DATA_DIR):
+    """(kind, paths) of the holdout to evaluate on, or None when there is none.
+
+    Prefers the notebook's X_test.csv / y_test.csv; otherwise the raw CSV's
+    20% test split (the same rows training.py holds out).
+    """
+    x_path, y_path = os.path.join(data_dir, X_TEST_CSV), os.path.join(data_dir, Y_TEST_CSV)
+    if os.path.exists(x_path) and os.path.exists(y_path):
+        return "test_csv", (x_path, y_path)
+
+    raw_path = os.path.join(data_dir, RAW_CSV)
+    if os.path.exists(raw_path):
+        return "raw_split", (raw_path,)
+    return None
+
+
+def _data_key(paths):
+    stamp = "|".join(f"{path}:{os.path.getmtime(path)}:{os.path.getsize(path)}" for path in paths)
+    return hashlib.sha1(stamp.encode()).hexdigest()[:10]
+
+
+def confusion_metrics(cm):
+    """Churn-class accuracy / precision / recall / F1 / specificity from [[TN, FP], [FN, TP]]."""
+    tn, fp, fn, tp = (int(count) for count in np.ravel(cm))
+    total = tn + fp + fn + tp
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    return {
+        "accuracy": (tp + tn) / total if total else 0.0,
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "specificity": tn / (tn + fp) if tn + fp else 0.0,
+    }
+
+
+# ------------------ SCORING (ONCE PER MODEL VERSION) ------------------
+def score_holdout(artifacts, kind, paths):
+    """Labels and churn probabilities of the holdout under the given artifacts."""
+    booster = artifacts.model.get_booster()
+
+    if kind == "test_csv":
+        X = pd.read_csv(paths[0], dtype=np.float32)
+        # Same column order as the model, whatever order the file has
+        X = X.reindex(columns=artifacts.feature_names, fill_value=0).to_numpy(dtype=np.float32)
+        labels = pd.read_csv(paths[1]).iloc[:, -1].to_numpy(dtype=np.int8)
+    else:
+        from sklearn.model_selection import train_test_split
+
+        from training import RANDOM_STATE, TARGET_COL, TEST_SIZE, load_training_frame
+
+        df = load_training_frame(paths[0])
+        _, test_rows = train_test_split(np.arange(len(df)), test_size=TEST_SIZE,
+                                        random_state=RANDOM_STATE)
+        holdout = df.iloc[np.sort(test_rows)]
+        X = artifacts.transformer.transform(holdout)
+        labels = holdout[TARGET_COL].to_numpy(dtype=np.int8)
+
+    return labels, booster.inplace_predict(X).astype(np.float32)
+
+
+class HoldoutScores:
+    """Cached holdout probabilities plus their ranking; every metric is read off these.
+
+    The scores are sorted once (O(n log n)); after that the confusion matrix
+    at any threshold is a binary search, and the ROC / PR curves are one
+    cumulative pass.
+    """
+
+    def __init__(self, labels, probs, model_version, source):
+        self.labels = labels
+        self.probs = probs
+        self.model_version = model_version
+        self.source = source
+
+        self.n_rows = len(probs)
+        self.scores, self.true_positives = rank_scores(labels, probs)
+        self.positives = int(self.true_positives[-1]) if self.n_rows else 0
+        self.negatives = self.n_rows - self.positives
+
+    # ------------------ THRESHOLD METRICS ------------------
+    def confusion(self, threshold):
+        """[[TN, FP], [FN, TP]] for `prob > threshold`, as sklearn lays it out."""
+        flagged = int(np.searchsorted(-self.scores, -threshold, side="left"))
+        tp = int(self.true_positives[flagged - 1]) if flagged else 0
+        fp = flagged - tp
+        return np.array([[self.negatives - fp, fp], [self.positives - tp, tp]])
+
+    def metrics(self, threshold):
+        return confusion_metrics(self.confusion(threshold))
+
+    def class_report(self, threshold):
+        """classification_report-style table (precision / recall / F1 / support per class)."""
+        (tn, fp), (fn, tp) = self.confusion(threshold)
+        rows = {}
+        for label, (hit, wrong_pred, missed) in {
+            "Retained (0)": (tn, fn, fp),
+            "Churned (1)": (tp, fp, fn),
+        }.items():
+            precision = hit / (hit + wrong_pred) if hit + wrong_pred else 0.0
+            recall = hit / (hit + missed) if hit + missed else 0.0
+            rows[label] = {
+                "precision": precision,
+                "recall": recall,
+                "f1-score": (2 * precision * recall / (precision + recall)
+                             if precision + recall else 0.0),
+                "support": hit + missed,
+            }
+        report = pd.DataFrame(rows).T
+        report["support"] = report["support"].astype(int)
+        return report
+
+    # ------------------ CURVES ------------------
+    def _cuts(self):
+        # Cut only where the score changes, so tied scores move together
+        cuts = np.flatnonzero(np.r_[self.scores[1:] != self.scores[:-1], True])
+        tp = np.r_[0, self.true_positives[cuts]]
+        flagged = np.r_[0, cuts + 1]
+        return tp, flagged - tp, np.r_[1.0, self.scores[cuts]]
+
+    def roc_curve(self):
+        """(fpr, tpr, thresholds) at every distinct score."""
+        tp, fp, thresholds = self._cuts()
+        return fp / max(self.negatives, 1), tp / max(self.positives, 1), thresholds
+
+    def pr_curve(self):
+        """(precision, recall, thresholds) at every distinct score."""
+        tp, fp, thresholds = self._cuts()
+        flagged = tp + fp
+        precision = np.where(flagged > 0, tp / np.maximum(flagged, 1), 1.0)
+        return precision, tp / max(self.positives, 1), thresholds
+
+    def roc_auc(self):
+        fpr, tpr, _ = self.roc_curve()
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+
+    def average_precision(self):
+        precision, recall, _ = self.pr_curve()
+        return float(np.sum(np.diff(recall) * precision[1:]))
+
+
+def thin_curve(*arrays, max_points=MAX_CURVE_POINTS):
+    """Evenly spaced subset of curve points (end points kept) for plotting."""
+    n = len(arrays[0])
+    if n <= max_points:
+        return arrays
+    keep = np.unique(np.linspace(0, n - 1, max_points).astype(np.int64))
+    return tuple(array[keep] for array in arrays)
+
+
+# ------------------ CACHE ------------------
+def _cache_paths(model_version, data_key, cache_dir):
+    stem = os.path.join(cache_dir, f"{model_version}_{data_key}")
+    return stem + ".probs.npy", stem + ".labels.npy"
+
+
+def load_holdout_scores(artifacts, data_dir=DATA_DIR, cache_dir=CACHE_DIR):
+    """HoldoutScores for this model version, scoring the holdout only on a cache miss.
+
+    Returns None when there is no holdout data to evaluate on.
+    """
+    source = holdout_source(data_dir)
+    if source is None:
+        return None
+    kind, paths = source
+
+    probs_path, labels_path = _cache_paths(artifacts.model_version, _data_key(paths), cache_dir)
+    if os.path.exists(probs_path) and os.path.exists(labels_path):
+        probs = np.load(probs_path, mmap_mode="r")
+        labels = np.load(labels_path, mmap_mode="r")
+    else:
+        labels, probs = score_holdout(artifacts, kind, paths)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename, so a concurrent reader never sees a partial file
+        for path, values in ((probs_path, probs), (labels_path, labels)):
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, values)
+            os.replace(path + ".tmp", path)
+
+    return HoldoutScores(labels, probs, artifacts.model_version, kind)
+
+
+def get_holdout_scores(artifacts, data_dir=DATA_DIR, cache_dir=CACHE_DIR):
+    """Process-wide HoldoutScores for the current model version and holdout files."""
+    source = holdout_source(data_dir)
+    if source is None:
+        return None
+    key = (artifacts.model_version, _data_key(source[1]))
+    if key not in _holdouts:
+        with _lock:
+            if key not in _holdouts:
+                _holdouts.clear()
+                _holdouts[key] = load_holdout_scores(artifacts, data_dir, cache_dir)
+    return _holdouts[key]
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    import shutil
+    import tempfile
+
+    from artifacts import get_artifacts
+
+    artifacts = get_artifacts()
+    cache_dir = tempfile.mkdtemp()
+
+    start = time.perf_counter()
+    holdout = load_holdout_scores(artifacts, cache_dir=cache_dir)
+    if holdout is None:
+        raise SystemExit(f"No {X_TEST_CSV} / {Y_TEST_CSV} or {RAW_CSV} in {DATA_DIR}")
+    print(f"Cold (score {holdout.n_rows:,} rows + write cache): "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    holdout = load_holdout_scores(artifacts, cache_dir=cache_dir)
+    print(f"Warm (memory-map cache + rank): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    runs = 1000
+    start = time.perf_counter()
+    for threshold in np.linspace(0, 1, runs):
+        holdout.metrics(threshold)
+    print(f"Metrics at one threshold: {(time.perf_counter() - start) / runs * 1e6:.1f} us")
+
+    start = time.perf_counter()
+    holdout.roc_auc(), holdout.average_precision()
+    print(f"ROC AUC + average precision: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    from sklearn.metrics import confusion_matrix
+
+    y = np.asarray(holdout.labels)
+    start = time.perf_counter()
+    confusion_matrix(y, np.asarray(holdout.probs) > 0.5)
+    print(f"sklearn confusion_matrix at one threshold: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    shutil.rmtree(cache_dir)
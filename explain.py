@@ -0,0 +1,194 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from features import CAT_COLS, NUM_COLS
+
+# ------------------ CONFIG ------------------
+# Reason codes reported per customer
+TOP_REASONS = 3
+
+# Rows per TreeSHAP call in batch explanations
+EXPLAIN_CHUNK_ROWS = 20_000
+
+# Single-row explanations kept per model (live page, repeated lookups)
+CACHE_SIZE = int(os.environ.get("CHURN_EXPLAIN_CACHE", 4096))
+
+
+def feature_groups(feature_names):
+    """Source feature of every model column: "State_Gujarat" -> "State", numerics -> themselves."""
+    groups = []
+    for name in feature_names:
+        source = next((col for col in CAT_COLS if name.startswith(col + "_")), None)
+        groups.append(source if source is not None and name not in NUM_COLS else name)
+    return groups
+
+
+class Explainer:
+    """Per-customer reason codes from the booster's native TreeSHAP (pred_contribs=True).
+
+    SHAP values of the one-hot columns are summed back to their source
+    feature (State, Gender, Account_Type), so every customer gets one value
+    per input feature plus the bias; the values add up to the model's
+    log-odds output. Batches run as parallel chunks, each worker on its own
+    single-threaded booster copy; single rows go through an LRU cache keyed
+    on the feature-row bytes.
+    """
+
+    def __init__(self, booster, feature_names, cache_size=CACHE_SIZE):
+        self.booster = booster
+        self.feature_names = list(feature_names)
+
+        groups = feature_groups(self.feature_names)
+        self.group_names = list(dict.fromkeys(groups))
+        # (n_features + bias, n_groups) 0/1 matrix: contributions @ grouping sums one-hots
+        self.grouping = np.zeros((len(groups) + 1, len(self.group_names)), dtype=np.float32)
+        for j, group in enumerate(groups):
+            self.grouping[j, self.group_names.index(group)] = 1.0
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._counts = {"hits": 0, "misses": 0}
+        self._local = threading.local()
+
+    # ------------------ TREESHAP ------------------
+    def _worker_booster(self):
+        # One single-threaded copy per worker thread: chunks run side by side
+        # instead of every call fighting over all cores
+        booster = getattr(self._local, "booster", None)
+        if booster is None:
+            booster = self.booster.copy()
+            booster.set_param({"nthread": 1})
+            self._local.booster = booster
+        return booster
+
+    def contributions(self, X, booster=None):
+        """Grouped SHAP values (n_rows, n_groups) and bias (n_rows,) in log-odds."""
+        booster = booster or self.booster
+        dmatrix = xgb.DMatrix(np.asarray(X, dtype=np.float32), feature_names=self.feature_names)
+        raw = booster.predict(dmatrix, pred_contribs=True)
+        return raw @ self.grouping, raw[:, -1]
+
+    def explain_row(self, row):
+        """Grouped SHAP values of one (1, n_features) row, cached on the row's bytes."""
+        row = np.asarray(row, dtype=np.float32).reshape(1, -1)
+        key = hashlib.blake2b(row.tobytes(), digest_size=16).digest()
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._counts["hits"] += 1
+                return cached
+
+        values, _ = self.contributions(row)
+        values = values[0]
+        with self._cache_lock:
+            self._counts["misses"] += 1
+            self._cache[key] = values
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return values
+
+    def explain(self, X, chunk_rows=EXPLAIN_CHUNK_ROWS, workers=None):
+        """Grouped SHAP values for a whole matrix, computed in parallel chunks."""
+        workers = workers or os.cpu_count() or 1
+        starts = range(0, len(X), chunk_rows)
+        if workers == 1 or len(starts) == 1:
+            return self.contributions(X)[0]
+
+        def run(start):
+            return self.contributions(X[start:start + chunk_rows], self._worker_booster())[0]
+
+        with ThreadPoolExecutor(workers) as pool:
+            return np.concatenate(list(pool.map(run, starts)))
+
+    # ------------------ REASON CODES ------------------
+    def top_reasons(self, values, k=TOP_REASONS):
+        """Indices of the k groups pushing each customer's churn risk up the most."""
+        values = np.atleast_2d(values)
+        k = min(k, values.shape[1])
+        top = np.argpartition(-values, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(values, top, axis=1), axis=1)
+        return np.take_along_axis(top, order, axis=1)
+
+    def reason_columns(self, values, k=TOP_REASONS):
+        """Reason_1..k (feature name) and Reason_1..k_Impact (log-odds) columns for batch output."""
+        values = np.atleast_2d(values)
+        top = self.top_reasons(values, k)
+        names = np.array(self.group_names, dtype=object)
+        columns = {}
+        for i in range(top.shape[1]):
+            impact = values[np.arange(len(values)), top[:, i]]
+            # Only features that actually raise the risk count as reasons
+            columns[f"Reason_{i + 1}"] = np.where(impact > 0, names[top[:, i]], "")
+            columns[f"Reason_{i + 1}_Impact"] = np.round(np.maximum(impact, 0), 4).astype(np.float32)
+        return columns
+
+    def stats(self):
+        with self._cache_lock:
+            return dict(self._counts, cached=len(self._cache))
+
+
+# ------------------ SHARED INSTANCE ------------------
+_lock = threading.Lock()
+_explainers = {}
+
+
+def get_explainer(artifacts):
+    """One explainer (and cache) per model version, shared by every session in the process."""
+    with _lock:
+        explainer = _explainers.get(artifacts.model_version)
+        if explainer is None:
+            _explainers.clear()
+            explainer = Explainer(artifacts.model.get_booster(), artifacts.feature_names)
+            _explainers[artifacts.model_version] = explainer
+    return explainer
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    import argparse
+
+    from artifacts import get_artifacts
+    from synthetic_data import load_customers
+
+    parser = argparse.ArgumentParser(description="TreeSHAP reason-code benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    artifacts = get_artifacts()
+    explainer = get_explainer(artifacts)
+    X = artifacts.transformer.transform(load_customers(args.rows))
+
+    start = time.perf_counter()
+    values = explainer.explain(X, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    pd.DataFrame(explainer.reason_columns(values))
+    print(f"Batch: {args.rows:,} rows in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s, "
+          f"{args.workers} workers)")
+
+    margin = artifacts.model.get_booster().inplace_predict(X[:1000], predict_type="margin")
+    bias = explainer.contributions(X[:1000])[1]
+    print(f"Max |sum(SHAP) + bias - margin|: {np.abs(values[:1000].sum(1) + bias - margin).max():.2e}")
+
+    runs = 200
+    rows = X[:runs]
+    start = time.perf_counter()
+    for i in range(runs):
+        explainer.explain_row(rows[i])
+    miss = (time.perf_counter() - start) / runs
+    start = time.perf_counter()
+    for i in range(runs):
+        explainer.explain_row(rows[i])
+    hit = (time.perf_counter() - start) / runs
+    print(f"Single row: {miss * 1000:.2f} ms uncached, {hit * 1e6:.1f} us from the LRU cache")
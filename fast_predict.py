@@ -0,0 +1,122 @@
+import threading
+import time
+
+import numpy as np
+
+from features import CAT_COLS, NUM_COLS, engineer_features
+
+
+class FastPredictor:
+    """Single-customer scoring without pandas or sklearn.
+
+    Scaler means / scales and one-hot positions are kept as precomputed
+    vectors and dicts; each call fills a preallocated float32 row (one per
+    thread, so concurrent Streamlit sessions never share a buffer) and calls
+    the booster's inplace_predict once.
+    """
+
+    def __init__(self, model, transformer, threshold=0.5):
+        self.booster = model.get_booster() if hasattr(model, "get_booster") else model
+        self.threshold = threshold
+
+        self.n_num = len(NUM_COLS)
+        self.n_features = transformer.n_features
+        self.mean = transformer.mean.copy()
+        self.scale = transformer.scale.copy()
+
+        # Categorical value -> absolute column in the feature row
+        self.cat_index = {}
+        j = self.n_num
+        for col in CAT_COLS:
+            self.cat_index[col] = {}
+            for category in transformer.categories[col]:
+                self.cat_index[col][category] = j
+                j += 1
+
+        self._local = threading.local()
+
+    def _row(self):
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = np.zeros((1, self.n_features), dtype=np.float32)
+            self._local.row = row
+        return row
+
+    def feature_row(self, customer, row=None):
+        """Fill a (1, n_features) float32 row for one customer given as a dict of raw scalars.
+
+        Without `row`, the calling thread's preallocated buffer is reused.
+        """
+        engineered = engineer_features(customer)
+        if row is None:
+            row = self._row()
+
+        num = np.array(
+            [engineered[col] if col in engineered else customer[col] for col in NUM_COLS],
+            dtype=np.float64
+        )
+        row[0, :self.n_num] = (num - self.mean) / self.scale
+
+        # handle_unknown='ignore': unseen / baseline categories leave all zeros
+        row[0, self.n_num:] = 0.0
+        for col in CAT_COLS:
+            j = self.cat_index[col].get(customer[col])
+            if j is not None:
+                row[0, j] = 1.0
+
+        return row
+
+    def predict_one(self, customer):
+        """Score one customer given as a dict of raw scalar values.
+
+        Returns (churn probability, 0/1 label).
+        """
+        prob = float(self.booster.inplace_predict(self.feature_row(customer))[0])
+        return prob, int(prob > self.threshold)
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    import pandas as pd
+
+    from artifacts import load_artifacts
+
+    # The legacy pickles carry the sklearn scaler / encoder the old page used
+    artifacts = load_artifacts(use_bundle=False)
+    model, scaler, encoder = artifacts.model, artifacts.scaler, artifacts.encoder
+    predictor = FastPredictor(model, artifacts.transformer)
+
+    customer = {
+        "Age": 35, "Tenure_Years": 5, "Balance_INR": 150000.0, "Num_Products": 2,
+        "Has_Credit_Card": 1, "Is_Active_Member": 0, "Estimated_Salary_INR": 600000.0,
+        "Credit_Score": 580, "Gender": "Male", "State": "Maharashtra", "Account_Type": "Savings",
+    }
+
+    def current_path():
+        """What 5.Live_prediction.py did before: DataFrames, sklearn transforms, two model calls."""
+        engineered = {col: float(v) for col, v in engineer_features(customer).items()}
+        input_df = pd.DataFrame({col: [value] for col, value in {**customer, **engineered}.items()})
+        X_num = scaler.transform(input_df[NUM_COLS])
+        X_cat = encoder.transform(input_df[CAT_COLS])
+        X_final = pd.DataFrame(
+            np.concatenate([X_num, X_cat], axis=1), columns=artifacts.feature_names
+        )
+        return model.predict_proba(X_final)[0][1], model.predict(X_final)[0]
+
+    def latencies(fn, runs=2000):
+        fn()
+        timings = np.empty(runs)
+        for i in range(runs):
+            start = time.perf_counter()
+            fn()
+            timings[i] = time.perf_counter() - start
+        return np.percentile(timings * 1e3, [50, 99])
+
+    fast_prob, fast_label = predictor.predict_one(customer)
+    ref_prob, ref_label = current_path()
+    assert abs(fast_prob - ref_prob) < 1e-6 and fast_label == ref_label
+
+    for label, fn in (("current path", current_path),
+                      ("fast path", lambda: predictor.predict_one(customer))):
+        p50, p99 = latencies(fn)
+        print(f"{label:>12}: p50 {p50:.3f} ms | p99 {p99:.3f} ms")
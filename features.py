@@ -0,0 +1,245 @@
+import time
+
+import numpy as np
+
+# ------------------ FEATURE LAYOUT ------------------
+RAW_NUM_COLS = [
+    "Age", "Tenure_Years", "Balance_INR", "Num_Products",
+    "Has_Credit_Card", "Is_Active_Member",
+    "Estimated_Salary_INR", "Credit_Score"
+]
+
+ENGINEERED_COLS = [
+    "Balance_to_Salary", "Tenure_NumProducts",
+    "Low_Credit_Score", "HighBalance_LowActivity"
+]
+
+# Same column order the scaler / encoder were fitted on in the training notebook
+NUM_COLS = RAW_NUM_COLS + ENGINEERED_COLS
+
+CAT_COLS = ["Gender", "State", "Account_Type"]
+
+# The 15 model input columns (raw + engineered), before scaling / encoding
+INPUT_COLS = NUM_COLS + CAT_COLS
+
+
+# ------------------ FEATURE ENGINEERING ------------------
+def engineer_features(columns):
+    """The four engineered features, computed column-wise.
+
+    `columns` is anything indexable by column name that yields array-likes:
+    a DataFrame, a dict of NumPy arrays, a pyarrow-backed batch, ...
+    Balance_to_Salary is 0 when the salary is 0 (no division by zero).
+    """
+    balance = np.asarray(columns["Balance_INR"], dtype=np.float64)
+    salary = np.asarray(columns["Estimated_Salary_INR"], dtype=np.float64)
+    tenure = np.asarray(columns["Tenure_Years"], dtype=np.int32)
+    num_products = np.asarray(columns["Num_Products"], dtype=np.int32)
+    credit_score = np.asarray(columns["Credit_Score"])
+    active = np.asarray(columns["Is_Active_Member"])
+
+    return {
+        "Balance_to_Salary": np.divide(
+            balance, salary, out=np.zeros_like(balance), where=salary > 0
+        ),
+        "Tenure_NumProducts": tenure * num_products,
+        "Low_Credit_Score": (credit_score < 600).astype(np.int8),
+        "HighBalance_LowActivity": ((balance > 100000) & (active == 0)).astype(np.int8),
+    }
+
+
+def add_engineered_features(df):
+    """Add the four engineered features to a DataFrame in place and return it."""
+    for col, values in engineer_features(df).items():
+        df[col] = values
+    return df
+
+
+# ------------------ TRANSFORMER ------------------
+def _present_categories(values):
+    """Sorted distinct values of a column (pandas categorical: only the used ones)."""
+    if hasattr(values, "cat"):
+        codes = values.cat.codes.to_numpy()
+        return sorted(str(v) for v in values.cat.categories[np.unique(codes[codes >= 0])])
+    return sorted(str(v) for v in np.unique(np.asarray(values)))
+
+
+class FeatureTransformer:
+    """Feature engineering + scaling + one-hot encoding as plain NumPy.
+
+    Reproduces the training notebook's StandardScaler / OneHotEncoder
+    (drop='first', handle_unknown='ignore') column layout, so the live page,
+    batch jobs and training all build exactly the same float32 matrix.
+    """
+
+    def __init__(self, mean, scale, categories, input_categories=None):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        # Per categorical column: categories that get their own one-hot column
+        self.categories = {col: list(categories[col]) for col in CAT_COLS}
+        # Per categorical column: every category seen in training, baseline included
+        self.input_categories = {
+            col: list(input_categories[col]) if input_categories else list(self.categories[col])
+            for col in CAT_COLS
+        }
+
+        self.feature_names = list(NUM_COLS)
+        for col in CAT_COLS:
+            self.feature_names += [f"{col}_{value}" for value in self.categories[col]]
+        self.n_features = len(self.feature_names)
+
+    @classmethod
+    def from_fitted(cls, scaler, encoder):
+        """Build from the pickled StandardScaler and OneHotEncoder."""
+        categories, input_categories = {}, {}
+        for col, values, drop in zip(CAT_COLS, encoder.categories_, encoder.drop_idx_):
+            input_categories[col] = [str(value) for value in values]
+            values = list(values)
+            if drop is not None:
+                values.pop(int(drop))
+            categories[col] = values
+        return cls(scaler.mean_, scaler.scale_, categories, input_categories)
+
+    @classmethod
+    def fit(cls, columns):
+        """Fit on training columns the same way the notebook's scaler / encoder do."""
+        return TransformerFitter().partial_fit(columns).transformer()
+
+    def transform(self, columns, out=None):
+        """Raw customer columns -> scaled / one-hot float32 matrix in model feature order.
+
+        Engineered columns are computed here, so only the 11 raw input
+        columns are required. Pass `out` to reuse a preallocated buffer.
+        """
+        engineered = engineer_features(columns)
+        n_rows = len(engineered["Balance_to_Salary"])
+
+        if out is None:
+            out = np.empty((n_rows, self.n_features), dtype=np.float32)
+
+        for j, col in enumerate(NUM_COLS):
+            values = engineered[col] if col in engineered else columns[col]
+            out[:, j] = (np.asarray(values, dtype=np.float64) - self.mean[j]) / self.scale[j]
+
+        j = len(NUM_COLS)
+        for col in CAT_COLS:
+            values = columns[col]
+            if hasattr(values, "cat"):
+                # pandas categorical: compare small integer codes, not strings
+                codes = values.cat.codes.to_numpy()
+                lookup = {category: code for code, category in enumerate(values.cat.categories)}
+                for category in self.categories[col]:
+                    out[:, j] = codes == lookup.get(category, -2)
+                    j += 1
+            else:
+                values = np.asarray(values)
+                for category in self.categories[col]:
+                    out[:, j] = values == category
+                    j += 1
+
+        return out
+
+
+class TransformerFitter:
+    """Fits a FeatureTransformer one chunk at a time.
+
+    Keeps StandardScaler.partial_fit-style running means / variances (Chan's
+    pairwise update) and the set of categories seen so far, so the training
+    data never has to be in memory at once.
+    """
+
+    def __init__(self):
+        self.n_rows = 0
+        self.mean = np.zeros(len(NUM_COLS))
+        self.m2 = np.zeros(len(NUM_COLS))
+        self.seen = {col: set() for col in CAT_COLS}
+
+    def partial_fit(self, columns):
+        engineered = engineer_features(columns)
+        n_chunk = len(engineered["Balance_to_Salary"])
+        if n_chunk == 0:
+            return self
+
+        # One column at a time: never holds a float64 copy of all the numerics
+        chunk_mean = np.empty(len(NUM_COLS))
+        chunk_m2 = np.empty(len(NUM_COLS))
+        for j, col in enumerate(NUM_COLS):
+            values = np.asarray(engineered[col] if col in engineered else columns[col],
+                                dtype=np.float64)
+            chunk_mean[j] = values.mean()
+            chunk_m2[j] = np.square(values - chunk_mean[j]).sum()
+
+        total = self.n_rows + n_chunk
+        delta = chunk_mean - self.mean
+        self.mean += delta * n_chunk / total
+        self.m2 += chunk_m2 + delta ** 2 * self.n_rows * n_chunk / total
+        self.n_rows = total
+
+        for col in CAT_COLS:
+            self.seen[col].update(_present_categories(columns[col]))
+        return self
+
+    def transformer(self):
+        if self.n_rows == 0:
+            raise ValueError("No training rows were seen")
+        scale = np.sqrt(self.m2 / self.n_rows)
+        scale[scale == 0] = 1.0
+
+        input_categories = {col: sorted(self.seen[col]) for col in CAT_COLS}
+        # drop='first': the alphabetically first category is the baseline
+        categories = {col: values[1:] for col, values in input_categories.items()}
+        return FeatureTransformer(self.mean, scale, categories, input_categories)
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    import pandas as pd
+
+    from artifacts import load_artifacts
+
+    # The pickles: the sklearn reference path needs the fitted scaler / encoder
+    artifacts = load_artifacts(use_bundle=False)
+    transformer = FeatureTransformer.from_fitted(artifacts.scaler, artifacts.encoder)
+    rng = np.random.default_rng(42)
+
+    def sample(n):
+        return {
+            "Age": rng.integers(18, 80, n),
+            "Tenure_Years": rng.integers(0, 15, n),
+            "Balance_INR": rng.uniform(0, 500000, n),
+            "Num_Products": rng.integers(1, 5, n),
+            "Has_Credit_Card": rng.integers(0, 2, n),
+            "Is_Active_Member": rng.integers(0, 2, n),
+            "Estimated_Salary_INR": rng.uniform(0, 3000000, n),
+            "Credit_Score": rng.integers(300, 900, n),
+            "Gender": rng.choice(["Male", "Female"], n),
+            "State": rng.choice(artifacts.encoder.categories_[1], n),
+            "Account_Type": rng.choice(artifacts.encoder.categories_[2], n),
+        }
+
+    def sklearn_path(columns):
+        df = add_engineered_features(pd.DataFrame(columns))
+        return np.concatenate([
+            artifacts.scaler.transform(df[NUM_COLS]),
+            artifacts.encoder.transform(df[CAT_COLS])
+        ], axis=1)
+
+    for n in (1, 1_000, 1_000_000):
+        columns = sample(n)
+        runs = max(1, 2_000 // n) if n < 1_000_000 else 1
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            fast = transformer.transform(columns)
+        fast_seconds = (time.perf_counter() - start) / runs
+
+        start = time.perf_counter()
+        for _ in range(runs):
+            reference = sklearn_path(columns)
+        sklearn_seconds = (time.perf_counter() - start) / runs
+
+        assert np.allclose(fast, reference, atol=1e-5)
+        print(f"{n:>9,} rows | transformer {fast_seconds * 1e3:9.3f} ms "
+              f"({fast_seconds / n * 1e6:.3f} us/row) | "
+              f"DataFrame + sklearn {sklearn_seconds * 1e3:9.3f} ms "
+              f"({sklearn_seconds / n * 1e6:.3f} us/row)")
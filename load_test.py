@@ -0,0 +1,79 @@
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+SAMPLE_CUSTOMER = {
+    "Age": 42, "Tenure_Years": 3, "Balance_INR": 185000.0, "Num_Products": 2,
+    "Has_Credit_Card": 1, "Is_Active_Member": 0, "Estimated_Salary_INR": 720000.0,
+    "Credit_Score": 610, "Gender": "Female", "State": "Karnataka", "Account_Type": "Savings",
+}
+
+
+def _worker(url, path, body, n_requests, latencies, errors):
+    """One client: keep-alive connection, sequential requests."""
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        try:
+            conn.request("POST", path, body, headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except OSError as exc:
+            errors.append(str(exc))
+            conn.close()
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run(base_url, concurrency, requests_per_client, batch_size):
+    url = urlparse(base_url)
+    if batch_size > 1:
+        path = "/predict/batch"
+        body = json.dumps({"customers": [SAMPLE_CUSTOMER] * batch_size})
+    else:
+        path = "/predict"
+        body = json.dumps(SAMPLE_CUSTOMER)
+
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=_worker,
+                         args=(url, path, body, requests_per_client, latencies, errors))
+        for _ in range(concurrency)
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99]) if len(ms) else (0, 0, 0)
+    print(f"{path} | clients {concurrency} | batch {batch_size}")
+    print(f"  requests : {len(latencies):,} ok, {len(errors):,} failed in {elapsed:.2f}s")
+    print(f"  throughput: {len(latencies) / elapsed:,.0f} req/s "
+          f"({len(latencies) * batch_size / elapsed:,.0f} customers/s)")
+    print(f"  latency  : p50 {p50:.1f} ms | p95 {p95:.1f} ms | p99 {p99:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for scoring_service.py")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    run(args.url, args.concurrency, args.requests, args.batch_size)
@@ -0,0 +1,218 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import numpy as np
+
+# ------------------ CONFIG ------------------
+MAX_BATCH = int(os.environ.get("CHURN_MAX_BATCH", 256))
+MAX_WAIT_MS = float(os.environ.get("CHURN_MAX_WAIT_MS", 3))
+
+# Seconds a blocking predict() waits for its batch before giving up
+PREDICT_TIMEOUT = float(os.environ.get("CHURN_PREDICT_TIMEOUT", 10))
+
+# Upper edges of the batch-size histogram buckets
+BATCH_BUCKETS = [1, 4, 16, 64, 256]
+
+
+class MicroBatcher:
+    """Shared in-process queue that turns many small predict calls into a few large ones.
+
+    Callers (Streamlit script threads, the HTTP service, ...) submit float32
+    feature rows; one worker thread flushes them to the booster as soon as
+    `max_batch` rows are waiting or the oldest has waited `max_wait_ms`,
+    then hands each caller its slice of the probabilities.
+    """
+
+    def __init__(self, booster, n_features, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.booster = booster
+        self.n_features = n_features
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        # Held while enqueueing, so nothing can be queued behind the stop sentinel
+        self._submit_lock = threading.Lock()
+        self._buffer = np.empty((max_batch, n_features), dtype=np.float32)
+        self._stopped = threading.Event()
+
+        self._batch_sizes = np.zeros(len(BATCH_BUCKETS) + 1, dtype=np.int64)
+        self._waits = deque(maxlen=10_000)
+        self._counts = {"batches": 0, "rows": 0}
+
+        self._thread = threading.Thread(target=self._run, name="churn-micro-batcher", daemon=True)
+        self._thread.start()
+
+    # ------------------ CALLER SIDE ------------------
+    @property
+    def stopped(self):
+        return self._stopped.is_set()
+
+    def submit(self, rows):
+        """Queue a (n_rows, n_features) block; returns a Future of its probabilities.
+        Raises RuntimeError once the batcher is stopped (e.g. the model was reloaded)."""
+        # Copy: callers may reuse their row buffer as soon as they get the result
+        rows = np.array(rows, dtype=np.float32).reshape(-1, self.n_features)
+        future = Future()
+        with self._submit_lock:
+            if self._stopped.is_set():
+                raise RuntimeError("Micro-batcher is stopped; the model was reloaded")
+            self._queue.put((rows, future, time.perf_counter()))
+        return future
+
+    def predict(self, rows, timeout=PREDICT_TIMEOUT):
+        """Blocking submit: probabilities for `rows`; TimeoutError after `timeout` seconds."""
+        try:
+            return self.submit(rows).result(timeout)
+        except FutureTimeout as exc:
+            # The builtin one (the same class from Python 3.11 on)
+            raise TimeoutError(f"No micro-batch result within {timeout}s") from exc
+
+    def stop(self, timeout=PREDICT_TIMEOUT):
+        """Stop the worker; rows it never picked up get a RuntimeError."""
+        with self._submit_lock:
+            self._stopped.set()
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+        error = RuntimeError("Micro-batcher stopped before scoring these rows")
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None and not item[1].done():
+                item[1].set_exception(error)
+
+    # ------------------ WORKER ------------------
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return []
+        pending = [first]
+        size = len(first[0])
+        deadline = first[2] + self.max_wait
+
+        while size < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped.set()
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    def _flush(self, pending):
+        # Callers may have cancelled their Future; once marked running it can no longer be
+        pending = [item for item in pending if item[1].set_running_or_notify_cancel()]
+        if not pending:
+            return
+
+        flushed_at = time.perf_counter()
+        size = sum(len(rows) for rows, _, _ in pending)
+        if size <= self.max_batch:
+            X = self._buffer[:size]
+            np.concatenate([rows for rows, _, _ in pending], out=X)
+        else:
+            # One oversized block (e.g. a batch request): score it as-is
+            X = np.concatenate([rows for rows, _, _ in pending])
+
+        probs = self.booster.inplace_predict(X)
+
+        self._counts["batches"] += 1
+        self._counts["rows"] += size
+        self._batch_sizes[np.searchsorted(BATCH_BUCKETS, size)] += 1
+
+        offset = 0
+        for rows, future, queued_at in pending:
+            self._waits.append(flushed_at - queued_at)
+            future.set_result(np.array(probs[offset:offset + len(rows)]))
+            offset += len(rows)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            pending = self._collect()
+            try:
+                self._flush(pending)
+            except Exception as exc:
+                # A failed batch fails its own callers; the shared thread keeps running
+                for _, future, _ in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+
+    # ------------------ COUNTERS ------------------
+    def stats(self):
+        """Batch-size histogram, average batch size and queue-wait percentiles."""
+        labels = [f"<={edge}" for edge in BATCH_BUCKETS] + [f">{BATCH_BUCKETS[-1]}"]
+        waits = np.array(self._waits) * 1000
+        batches = self._counts["batches"]
+        return {
+            "batches": batches,
+            "rows": self._counts["rows"],
+            "avg_batch_size": self._counts["rows"] / batches if batches else 0.0,
+            "batch_size_hist": dict(zip(labels, self._batch_sizes.tolist())),
+            "queue_wait_ms_p50": float(np.percentile(waits, 50)) if len(waits) else 0.0,
+            "queue_wait_ms_p99": float(np.percentile(waits, 99)) if len(waits) else 0.0,
+        }
+
+
+# ------------------ SHARED INSTANCE ------------------
+_lock = threading.Lock()
+_batchers = {}
+
+
+def get_batcher(artifacts):
+    """One batcher per model version, shared by every session in the process."""
+    retired = []
+    with _lock:
+        batcher = _batchers.get(artifacts.model_version)
+        if batcher is None:
+            retired = list(_batchers.values())
+            _batchers.clear()
+            batcher = MicroBatcher(artifacts.model.get_booster(), artifacts.transformer.n_features)
+            _batchers[artifacts.model_version] = batcher
+    # Outside the lock: stopping waits for the old worker's last batch
+    for old in retired:
+        old.stop()
+    return batcher
+
+
+# ------------------ BENCHMARK ------------------
+if __name__ == "__main__":
+    from artifacts import get_artifacts
+
+    artifacts = get_artifacts()
+    booster = artifacts.model.get_booster()
+    rows = np.random.default_rng(0).standard_normal((1, artifacts.transformer.n_features))
+    rows = rows.astype(np.float32)
+
+    def run(label, call, sessions=32, calls=100):
+        def session():
+            for _ in range(calls):
+                call(rows)
+
+        threads = [threading.Thread(target=session) for _ in range(sessions)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print(f"{label:>22}: {sessions * calls / elapsed:,.0f} predictions/s "
+              f"({sessions} sessions x {calls} calls)")
+
+    run("one call per session", booster.inplace_predict)
+
+    batcher = get_batcher(artifacts)
+    run("shared micro-batcher", batcher.predict)
+    print(batcher.stats())
@@ -0,0 +1,205 @@
+import math
+import multiprocessing as mp
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from artifacts import ARTIFACT_DIR, get_artifacts
+from compiled_model import ENGINE, get_engine
+
+# ------------------ CONFIG ------------------
+# Scoring processes; one per core unless CHURN_SCORING_WORKERS says otherwise
+DEFAULT_WORKERS = int(os.environ.get("CHURN_SCORING_WORKERS", os.cpu_count() or 1))
+
+# Largest row range handed to a worker in one task
+TASK_ROWS = 50_000
+
+# spawn, not fork: a child forked after XGBoost has started its OpenMP threads can hang
+START_METHOD = "spawn"
+
+# Seconds to wait for every worker to load the model
+STARTUP_TIMEOUT = 300
+
+
+# ------------------ SHARED ARRAYS ------------------
+class SharedArray:
+    """A NumPy array over a named shared_memory block; created when `name` is
+    None, attached to an existing block otherwise."""
+
+    def __init__(self, shape, dtype, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        size = max(math.prod(self.shape) * self.dtype.itemsize, 1)
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @property
+    def spec(self):
+        """What a worker needs to attach: (name, shape, dtype)."""
+        return self.shm.name, self.shape, self.dtype.str
+
+    def close(self):
+        # The ndarray holds an export of the buffer; drop it before closing
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+# ------------------ WORKERS ------------------
+# Per worker process: the scoring engine and the blocks it is attached to
+_worker = {}
+
+
+def _init_worker(folder, engine, barrier):
+    """Load the artifacts once per worker, single-threaded so workers do not
+    oversubscribe the cores."""
+    model = get_engine(get_artifacts(folder), engine)
+    if hasattr(model, "booster"):
+        model.booster.set_param({"nthread": 1})
+    _worker["model"] = model
+    _worker["blocks"] = {}
+    barrier.wait()
+
+
+def _attach(spec):
+    blocks = _worker["blocks"]
+    block = blocks.get(spec[0])
+    if block is None:
+        # The parent replaced its blocks; let go of the old ones
+        if len(blocks) >= 2:
+            for old in blocks.values():
+                old.close()
+            blocks.clear()
+        block = blocks[spec[0]] = SharedArray(spec[1], spec[2], name=spec[0])
+    return block.array
+
+
+def _score_range(x_spec, out_spec, start, stop):
+    """Score rows [start, stop) of the shared features into the shared output."""
+    X, out = _attach(x_spec), _attach(out_spec)
+    out[start:stop] = _worker["model"].predict(X[start:stop])
+    return stop - start
+
+
+# ------------------ DRIVER ------------------
+class ParallelScorer:
+    """Pool of scoring processes over a shared-memory feature matrix.
+
+    Workers load the booster once; predict(X) splits the rows into disjoint
+    ranges that workers score in place, writing probabilities into a shared
+    output array, so only (block name, start, stop) is pickled per task. Write
+    the features straight into feature_block(n) to skip the copy into shared
+    memory. Has predict_proba, so it can be passed as the model to
+    batch_scoring.score_file. Use as a context manager, or call close().
+    """
+
+    def __init__(self, folder=ARTIFACT_DIR, workers=DEFAULT_WORKERS, engine=None,
+                 task_rows=TASK_ROWS):
+        start = time.perf_counter()
+        self.workers = workers
+        self.task_rows = task_rows
+        context = mp.get_context(START_METHOD)
+        barrier = context.Barrier(workers + 1)
+        self.pool = context.Pool(workers, initializer=_init_worker,
+                                 initargs=(os.path.abspath(folder), engine or ENGINE, barrier))
+        barrier.wait(timeout=STARTUP_TIMEOUT)
+        self._x = self._out = None
+        self.startup_seconds = time.perf_counter() - start
+
+    def feature_block(self, n_rows, n_features):
+        """Shared (n_rows, n_features) float32 buffer; pass it to
+        FeatureTransformer.transform(out=...) and then to predict(). Reused while
+        batches fit; drop the view before asking for a larger one."""
+        if self._x is None or self._x.shape[0] < n_rows or self._x.shape[1] != n_features:
+            self._release()
+            self._x = SharedArray((n_rows, n_features), np.float32)
+            self._out = SharedArray((n_rows,), np.float32)
+        return self._x.array[:n_rows]
+
+    def predict(self, X):
+        """Churn probability per row (float32)."""
+        n = len(X)
+        shared = self.feature_block(n, X.shape[1])
+        if not np.shares_memory(X, shared):
+            shared[:] = X
+
+        step = max(1, min(self.task_rows, math.ceil(n / self.workers)))
+        tasks = [(self._x.spec, self._out.spec, s, min(s + step, n)) for s in range(0, n, step)]
+        self.pool.starmap(_score_range, tasks, chunksize=1)
+        return self._out.array[:n].copy()
+
+    def predict_proba(self, X):
+        prob = self.predict(X)
+        return np.column_stack([1 - prob, prob])
+
+    def _release(self):
+        for block in (self._x, self._out):
+            if block is not None:
+                block.close()
+        self._x = self._out = None
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ------------------ BENCHMARK ------------------
+def _rows_per_sec(fn, n, min_seconds=1.0):
+    runs, start = 0, time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        seconds = time.perf_counter() - start
+        if seconds >= min_seconds:
+            return n * runs / seconds
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from compiled_model import ENGINES
+    from synthetic_data import load_customers
+
+    parser = argparse.ArgumentParser(description="Multi-process scoring: core scaling and break-even size")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, DEFAULT_WORKERS}))
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINE)
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    args = parser.parse_args()
+
+    artifacts = get_artifacts(args.artifacts)
+    single = get_engine(artifacts, args.engine)
+    df = load_customers(max(args.rows))
+    X_all = artifacts.transformer.transform(df)
+    print(f"{os.cpu_count()} CPUs | engine {args.engine} | single process uses all cores")
+
+    baseline = {n: _rows_per_sec(lambda: single.predict(X_all[:n]), n) for n in args.rows}
+    for w in args.workers:
+        with ParallelScorer(args.artifacts, workers=w, engine=args.engine) as scorer:
+            print(f"\n{w} workers (startup {scorer.startup_seconds:.2f}s):")
+            scorer.feature_block(max(args.rows), X_all.shape[1])
+            expected = single.predict(X_all[:1000])
+            assert np.allclose(scorer.predict(X_all[:1000]), expected, atol=1e-6)
+
+            break_even = None
+            for n in args.rows:
+                X = scorer.feature_block(n, X_all.shape[1])
+                artifacts.transformer.transform(df.iloc[:n], out=X)
+                rate = _rows_per_sec(lambda: scorer.predict(X), n)
+                if break_even is None and rate > baseline[n]:
+                    break_even = n
+                print(f"  {n:>10,} rows: {rate:>12,.0f} rows/s | single process "
+                      f"{baseline[n]:>12,.0f} rows/s | x{rate / baseline[n]:.2f}")
+            print(f"  break-even: {f'{break_even:,} rows' if break_even else 'not reached'}")
@@ -0,0 +1,202 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import time
+import warnings
+import zipfile
+from datetime import datetime, timezone
+
+import numpy as np
+
+from features import CAT_COLS, RAW_NUM_COLS, FeatureTransformer
+
+# ------------------ BUNDLE LAYOUT ------------------
+# One zip file: manifest.json (schema, preprocessing, versions) + model.ubj (booster)
+BUNDLE_FILE = "churn_pipeline.zip"
+FORMAT_VERSION = 1
+
+MANIFEST_NAME = "manifest.json"
+MODEL_NAME = "model.ubj"
+
+REQUIRED_KEYS = [
+    "format_version", "model_version", "model_sha256", "feature_names",
+    "input_schema", "preprocessing", "library_versions"
+]
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _library_versions():
+    import sklearn
+    import xgboost
+
+    return {
+        "xgboost": xgboost.__version__,
+        "scikit-learn": sklearn.__version__,
+        "numpy": np.__version__,
+    }
+
+
+# ------------------ EXPORT ------------------
+def export_bundle(model, transformer, path, training_data=None, extra=None):
+    """Write model + preprocessing + manifest into one bundle file.
+
+    `transformer` is a FeatureTransformer (from the pickled scaler / encoder
+    or fitted by training.py). `training_data` is an optional path whose
+    SHA-256 is recorded in the manifest; `extra` is merged into the manifest as-is.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, MODEL_NAME)
+        model.save_model(model_path)
+        with open(model_path, "rb") as f:
+            model_bytes = f.read()
+
+    model_sha256 = _sha256(model_bytes)
+
+    input_schema = [{"name": col, "type": "numeric"} for col in RAW_NUM_COLS]
+    input_schema += [
+        {"name": col, "type": "categorical",
+         "categories": [str(v) for v in transformer.input_categories[col]]}
+        for col in CAT_COLS
+    ]
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "model_version": model_sha256[:12],
+        "model_sha256": model_sha256,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "feature_names": transformer.feature_names,
+        "input_schema": input_schema,
+        "preprocessing": {
+            "mean": transformer.mean.tolist(),
+            "scale": transformer.scale.tolist(),
+            "categories": transformer.categories,
+        },
+        "training_data_sha256": _file_sha256(training_data) if training_data else None,
+        "library_versions": _library_versions(),
+    }
+    manifest.update(extra or {})
+
+    # Stored uncompressed: loading is a straight read, no inflate step
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as bundle:
+        bundle.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+        bundle.writestr(MODEL_NAME, model_bytes)
+
+    return manifest
+
+
+def update_manifest(path, updates):
+    """Merge `updates` into an existing bundle's manifest (model bytes untouched)."""
+    with zipfile.ZipFile(path) as bundle:
+        manifest = json.loads(bundle.read(MANIFEST_NAME))
+        model_bytes = bundle.read(MODEL_NAME)
+
+    manifest.update(updates)
+    validate_manifest(manifest, model_bytes)
+
+    # Write next to it and swap, so readers never see a half-written bundle
+    tmp_path = path + ".tmp"
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_STORED) as bundle:
+        bundle.writestr(MANIFEST_NAME, json.dumps(manifest, indent=2))
+        bundle.writestr(MODEL_NAME, model_bytes)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+# ------------------ LOAD ------------------
+def validate_manifest(manifest, model_bytes):
+    """One pass over the manifest; raises ValueError on anything that would mis-score."""
+    missing = [key for key in REQUIRED_KEYS if key not in manifest]
+    if missing:
+        raise ValueError(f"Bundle manifest is missing {missing}")
+
+    if manifest["format_version"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format {manifest['format_version']}")
+
+    if _sha256(model_bytes) != manifest["model_sha256"]:
+        raise ValueError("Booster bytes do not match the manifest checksum")
+
+    schema_cols = [field["name"] for field in manifest["input_schema"]]
+    if schema_cols != RAW_NUM_COLS + CAT_COLS:
+        raise ValueError(f"Bundle input schema {schema_cols} does not match the app's columns")
+
+    n_features = len(manifest["feature_names"])
+    if (len(manifest["preprocessing"]["mean"]) + sum(
+            len(v) for v in manifest["preprocessing"]["categories"].values()) != n_features):
+        raise ValueError("Preprocessing layout does not match feature_names")
+
+    trained_with = manifest["library_versions"].get("xgboost", "")
+    import xgboost
+
+    if trained_with.split(".")[0] != xgboost.__version__.split(".")[0]:
+        warnings.warn(
+            f"Bundle was written with xgboost {trained_with}, running {xgboost.__version__}"
+        )
+
+
+def load_bundle(path):
+    """Read and validate a bundle; returns (model, transformer, manifest)."""
+    from xgboost import XGBClassifier
+
+    with zipfile.ZipFile(path) as bundle:
+        manifest = json.loads(bundle.read(MANIFEST_NAME))
+        model_bytes = bundle.read(MODEL_NAME)
+
+    validate_manifest(manifest, model_bytes)
+
+    model = XGBClassifier()
+    model.load_model(bytearray(model_bytes))
+    if model.get_booster().num_features() != len(manifest["feature_names"]):
+        raise ValueError("Booster feature count does not match the manifest")
+
+    preprocessing = manifest["preprocessing"]
+    transformer = FeatureTransformer(
+        preprocessing["mean"], preprocessing["scale"], preprocessing["categories"],
+        {field["name"]: field["categories"]
+         for field in manifest["input_schema"] if field["type"] == "categorical"}
+    )
+    if transformer.feature_names != manifest["feature_names"]:
+        raise ValueError("Preprocessing layout does not match feature_names")
+
+    return model, transformer, manifest
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    from artifacts import ARTIFACT_DIR, load_artifacts
+
+    parser = argparse.ArgumentParser(description="Export / benchmark the bundled inference pipeline")
+    parser.add_argument("command", choices=["export", "benchmark"])
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    parser.add_argument("--training-data", default=None, help="CSV the model was trained on")
+    args = parser.parse_args()
+
+    bundle_path = os.path.join(args.artifacts, BUNDLE_FILE)
+
+    if args.command == "export":
+        pickled = load_artifacts(args.artifacts, use_bundle=False)
+        manifest = export_bundle(
+            pickled.model, FeatureTransformer.from_fitted(pickled.scaler, pickled.encoder),
+            bundle_path, training_data=args.training_data
+        )
+        print(f"Wrote {bundle_path} (model version {manifest['model_version']})")
+    else:
+        runs = 20
+        for label, use_bundle in (("pickles", False), ("bundle", True)):
+            load_artifacts(args.artifacts, use_bundle=use_bundle)
+            start = time.perf_counter()
+            for _ in range(runs):
+                load_artifacts(args.artifacts, use_bundle=use_bundle)
+            print(f"{label:>8}: {(time.perf_counter() - start) / runs * 1000:.1f} ms per load")
@@ -0,0 +1,204 @@
+import argparse
+import os
+import shutil
+import time
+
+import numpy as np
+import xgboost as xgb
+
+from artifacts import ARTIFACT_DIR, load_artifacts
+from drift_monitor import build_baseline
+from pipeline_bundle import BUNDLE_FILE, export_bundle
+from thresholds import ACTION_COSTS, RETAINED_CUSTOMER_VALUE_INR, TIER_ACTIONS, optimize_thresholds
+from training import (RANDOM_STATE, TARGET_COL, TEST_SIZE, TUNED_PARAMS, booster_params,
+                      holdout_metrics, load_training_frame, quantile_dmatrix, scale_pos_weight)
+
+# ------------------ REFRESH SETUP ------------------
+# Trees appended per monthly refresh: cost scales with the new slice, not the history
+MAX_NEW_TREES = 50
+
+# Accept the refreshed model only if holdout recall at the deployed decision
+# cut-off drops by no more than this
+RECALL_TOLERANCE = 0.0
+
+# Refreshed bundles are written here as churn_pipeline_<model_version>.zip
+MODELS_DIR = os.path.join(ARTIFACT_DIR, "models")
+
+
+# ------------------ WARM UPDATE ------------------
+def holdout_split(new_df):
+    """(training row positions, holdout frame): the split of a new slice used
+    when no separate holdout is given."""
+    from sklearn.model_selection import train_test_split
+
+    train_rows, test_rows = train_test_split(
+        np.arange(len(new_df)), test_size=TEST_SIZE, random_state=RANDOM_STATE,
+        stratify=new_df[TARGET_COL].to_numpy()
+    )
+    return np.sort(train_rows), new_df.iloc[np.sort(test_rows)]
+
+
+def warm_update(model, transformer, new_df, holdout_df=None, n_trees=MAX_NEW_TREES,
+                params=None, tolerance=RECALL_TOLERANCE, nthread=None, threshold=0.5):
+    """Continue boosting the deployed model on a new labelled slice.
+
+    The deployed preprocessing is kept as-is (the existing trees depend on
+    it); `n_trees` trees are appended through xgb.train(xgb_model=...). Both
+    models are scored on `holdout_df`, or on a held-out part of `new_df`
+    when none is given, with recall taken at `threshold` (pass the deployed
+    decision cut-off). Returns (refreshed model, report).
+    """
+    from xgboost import XGBClassifier
+
+    params = dict(TUNED_PARAMS, **(params or {}))
+    y = new_df[TARGET_COL].to_numpy()
+
+    if holdout_df is None:
+        train_rows, holdout_df = holdout_split(new_df)
+    else:
+        train_rows = np.arange(len(new_df))
+
+    start = time.perf_counter()
+    dtrain = quantile_dmatrix(new_df, transformer=transformer, rows=train_rows, nthread=nthread)
+    base = model.get_booster()
+    # xgb.train copies the base booster, so the deployed model is left untouched
+    booster = xgb.train(
+        booster_params(params, scale_pos_weight(y[train_rows]), nthread), dtrain,
+        num_boost_round=n_trees, xgb_model=base
+    )
+    fit_seconds = time.perf_counter() - start
+
+    X_holdout = transformer.transform(holdout_df)
+    y_holdout = holdout_df[TARGET_COL].to_numpy()
+    before = holdout_metrics(y_holdout, base.inplace_predict(X_holdout), threshold)
+    after = holdout_metrics(y_holdout, booster.inplace_predict(X_holdout), threshold)
+
+    refreshed = XGBClassifier()
+    refreshed.load_model(bytearray(booster.save_raw("ubj")))
+
+    report = {
+        "new_rows": len(train_rows),
+        "holdout_rows": len(holdout_df),
+        "trees_before": base.num_boosted_rounds(),
+        "trees_after": booster.num_boosted_rounds(),
+        "fit_seconds": fit_seconds,
+        "holdout_before": before,
+        "holdout_after": after,
+        "threshold": threshold,
+        "accepted": after["recall"] >= before["recall"] - tolerance,
+    }
+    return refreshed, report
+
+
+# ------------------ THRESHOLDS ------------------
+def refreshed_thresholds(model, transformer, holdout_df, parent_thresholds=None):
+    """Cut-offs re-chosen for the refreshed model on the refresh holdout, with the
+    cost table (action costs, tier actions, customer value) the parent's were chosen with."""
+    parent = parent_thresholds or {}
+    probs = model.get_booster().inplace_predict(transformer.transform(holdout_df))
+    return optimize_thresholds(
+        holdout_df[TARGET_COL].to_numpy(), probs,
+        parent.get("action_costs", ACTION_COSTS),
+        parent.get("tier_actions", TIER_ACTIONS),
+        parent.get("customer_value_inr", RETAINED_CUSTOMER_VALUE_INR),
+    )
+
+
+def refreshed_baseline(model, transformer, train_df):
+    """Drift baseline of the rows the new trees were fitted on, with the refreshed
+    model's probabilities, so later batches are compared with the latest month."""
+    probs = model.get_booster().inplace_predict(transformer.transform(train_df))
+    return build_baseline(train_df, transformer, probs)
+
+
+# ------------------ VERSIONED OUTPUT ------------------
+def write_refreshed(model, transformer, report, parent_version, output_dir=MODELS_DIR,
+                    training_data=None, thresholds=None, drift_baseline=None):
+    """Write churn_pipeline_<model_version>.zip with its lineage in the manifest.
+
+    Pass `thresholds` (refreshed_thresholds()) and `drift_baseline`
+    (refreshed_baseline()) so the bundle keeps its own cut-offs and drift
+    reference; without them the apps fall back to DEFAULT_THRESHOLDS and
+    `--drift` has nothing to compare against.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tmp_path = os.path.join(output_dir, f".{BUNDLE_FILE}.tmp")
+    extra = {"parent_model_version": parent_version, "refresh": report}
+    if thresholds is not None:
+        extra["thresholds"] = thresholds
+    if drift_baseline is not None:
+        extra["drift_baseline"] = drift_baseline
+    manifest = export_bundle(model, transformer, tmp_path, training_data=training_data, extra=extra)
+    path = os.path.join(output_dir, f"churn_pipeline_{manifest['model_version']}.zip")
+    os.replace(tmp_path, path)
+    return path, manifest
+
+
+def promote(path, artifact_dir=ARTIFACT_DIR, archive_dir=MODELS_DIR):
+    """Make `path` the deployed bundle; the current one is kept under `archive_dir`.
+
+    get_artifacts() notices the new file (mtime / size) on the next lookup.
+    """
+    deployed = os.path.join(artifact_dir, BUNDLE_FILE)
+    if os.path.exists(deployed):
+        current = load_artifacts(artifact_dir, use_bundle=True)
+        archived = os.path.join(archive_dir, f"churn_pipeline_{current.model_version}.zip")
+        if not os.path.exists(archived):
+            os.makedirs(archive_dir, exist_ok=True)
+            shutil.copy2(deployed, archived)
+
+    tmp_path = deployed + ".tmp"
+    shutil.copy2(path, tmp_path)
+    os.replace(tmp_path, deployed)
+    return deployed
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monthly warm refresh of the deployed churn model")
+    parser.add_argument("data", help="Newest labelled slice (CSV / Parquet)")
+    parser.add_argument("--holdout", default=None,
+                        help="Labelled holdout to compare on (default: 20%% of the new slice)")
+    parser.add_argument("--trees", type=int, default=MAX_NEW_TREES, help="Trees to append")
+    parser.add_argument("--tolerance", type=float, default=RECALL_TOLERANCE,
+                        help="Largest holdout recall drop still accepted")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="Folder of the deployed model")
+    parser.add_argument("--output", default=MODELS_DIR, help="Where refreshed bundles go")
+    parser.add_argument("--promote", action="store_true",
+                        help="Also make an accepted model the deployed churn_pipeline.zip")
+    args = parser.parse_args()
+
+    deployed = load_artifacts(args.artifacts)
+    new_df = load_training_frame(args.data)
+    holdout_df = load_training_frame(args.holdout) if args.holdout else None
+
+    model, report = warm_update(deployed.model, deployed.transformer, new_df, holdout_df,
+                                args.trees, tolerance=args.tolerance,
+                                threshold=deployed.thresholds["decision"])
+    before, after = report["holdout_before"], report["holdout_after"]
+    print(f"Appended {args.trees} trees ({report['trees_before']} -> {report['trees_after']}) "
+          f"on {report['new_rows']:,} rows in {report['fit_seconds']:.1f}s")
+    print(f"Holdout ({report['holdout_rows']:,} rows, cut-off {report['threshold']:.3f}): "
+          f"recall {before['recall']:.4f} -> "
+          f"{after['recall']:.4f} | AUC {before['roc_auc']:.4f} -> {after['roc_auc']:.4f}")
+
+    if not report["accepted"]:
+        print("Recall regressed: refreshed model discarded, deployed model unchanged")
+    else:
+        if holdout_df is None:
+            train_rows, holdout_df = holdout_split(new_df)
+            train_df = new_df.iloc[train_rows]
+        else:
+            train_df = new_df
+        thresholds = refreshed_thresholds(model, deployed.transformer, holdout_df,
+                                          (deployed.manifest or {}).get("thresholds"))
+        print(f"Thresholds re-chosen on the holdout: decision {thresholds['decision']:.3f}, "
+              f"medium > {thresholds['medium']:.3f}, high > {thresholds['high']:.3f}")
+        baseline = refreshed_baseline(model, deployed.transformer, train_df)
+        path, manifest = write_refreshed(model, deployed.transformer, report,
+                                         deployed.model_version, args.output, args.data,
+                                         thresholds, baseline)
+        print(f"Wrote {path} (model version {manifest['model_version']}, "
+              f"parent {deployed.model_version})")
+        if args.promote:
+            print(f"Promoted to {promote(path, args.artifacts, args.output)}")
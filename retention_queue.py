@@ -0,0 +1,210 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import DEFAULT_CHUNKSIZE, ID_COL, iter_chunks
+from compiled_model import ENGINE, ENGINES, get_engine
+from thresholds import ACTION_COSTS, RETAINED_CUSTOMER_VALUE_INR, TIER_ACTIONS, tier_economics
+
+# ------------------ CONFIG ------------------
+TIERS = ["low", "medium", "high"]
+
+# Customers kept in the retention work queue
+DEFAULT_TOP_K = 10_000
+
+# Rows per exported queue page
+DEFAULT_PAGE_SIZE = 1_000
+
+
+# ------------------ TIERS & VALUE ------------------
+def assign_tiers(probs, thresholds):
+    """0 / 1 / 2 (low / medium / high) per customer, the bands used on the pages."""
+    tiers = (probs > thresholds["medium"]).astype(np.int8)
+    tiers[probs > thresholds["high"]] = 2
+    return tiers
+
+
+def expected_saved_value(probs, tiers, economics=None, customer_value=RETAINED_CUSTOMER_VALUE_INR):
+    """Expected INR saved by acting on each customer with their tier's actions, net of cost.
+
+    prob x customer value x tier save rate - tier cost; low-tier customers get no action (0).
+    """
+    economics = tier_economics() if economics is None else economics
+    save_rate = np.zeros(len(TIERS), dtype=np.float32)
+    cost = np.zeros(len(TIERS), dtype=np.float32)
+    for code, tier in enumerate(TIERS):
+        if tier in economics:
+            save_rate[code] = economics[tier]["save_rate"]
+            cost[code] = economics[tier]["cost_inr"]
+    value = probs * np.float32(customer_value) * save_rate[tiers] - cost[tiers]
+    return np.where(tiers > 0, value, 0).astype(np.float32)
+
+
+def top_k(values, k):
+    """Indices of the k largest values, best first: argpartition O(n), then sort only those k."""
+    if len(values) > k:
+        keep = np.argpartition(-values, k - 1)[:k]
+    else:
+        keep = np.arange(len(values))
+    return keep[np.argsort(-values[keep], kind="stable")]
+
+
+# ------------------ PORTFOLIO SCORING ------------------
+class RetentionQueue:
+    """Ranked work queue plus the portfolio summary it was built from."""
+
+    def __init__(self, queue, tier_counts, tier_value, rows, seconds, model_version):
+        self.queue = queue
+        self.tier_counts = tier_counts
+        self.tier_value = tier_value
+        self.rows = rows
+        self.seconds = seconds
+        self.model_version = model_version
+
+    def n_pages(self, page_size=DEFAULT_PAGE_SIZE):
+        return max(1, -(-len(self.queue) // page_size))
+
+    def page(self, number, page_size=DEFAULT_PAGE_SIZE):
+        """1-based page of the queue."""
+        start = (number - 1) * page_size
+        return self.queue.iloc[start:start + page_size]
+
+    def export_pages(self, out_dir, page_size=DEFAULT_PAGE_SIZE, file_format="csv"):
+        """Write the queue as queue_page_00001.<csv|parquet>, ...; returns the paths."""
+        os.makedirs(out_dir, exist_ok=True)
+        paths = []
+        for number, start in enumerate(range(0, len(self.queue), page_size), start=1):
+            page = self.queue.iloc[start:start + page_size]
+            path = os.path.join(out_dir, f"queue_page_{number:05d}.{file_format}")
+            if file_format == "parquet":
+                page.to_parquet(path, index=False)
+            else:
+                page.to_csv(path, index=False)
+            paths.append(path)
+        return paths
+
+
+def build_queue(source, artifacts, k=DEFAULT_TOP_K, chunksize=DEFAULT_CHUNKSIZE,
+                customer_value=None, explainer=None, progress=None, engine=None,
+                thresholds=None):
+    """Score every customer in `source` chunk by chunk and keep the k with the highest
+    expected saved value.
+
+    Memory stays at one chunk plus the k running candidates (their feature rows
+    included, so `explainer` reason codes are computed for the queue only).
+    Action costs, tier actions and the customer value are the ones the bands
+    were chosen with (thresholds.py --costs), the built-in table otherwise.
+    `progress` is an optional callback receiving the rows scored so far;
+    `engine` picks the inference engine (compiled_model.py); `thresholds`
+    overrides the artifact's risk bands.
+    """
+    start = time.perf_counter()
+    model = get_engine(artifacts, engine)
+    thresholds = artifacts.thresholds if thresholds is None else thresholds
+    tier_actions = thresholds.get("tier_actions", TIER_ACTIONS)
+    economics = tier_economics(thresholds.get("action_costs", ACTION_COSTS), tier_actions)
+    if customer_value is None:
+        customer_value = thresholds.get("customer_value_inr", RETAINED_CUSTOMER_VALUE_INR)
+
+    tier_counts = np.zeros(len(TIERS), dtype=np.int64)
+    tier_value = np.zeros(len(TIERS), dtype=np.float64)
+    kept = None
+    rows = 0
+
+    for chunk in iter_chunks(source, chunksize):
+        X = artifacts.transformer.transform(chunk)
+        probs = model.predict(X).astype(np.float32)
+        tiers = assign_tiers(probs, thresholds)
+        value = expected_saved_value(probs, tiers, economics, customer_value)
+
+        tier_counts += np.bincount(tiers, minlength=len(TIERS))
+        tier_value += np.bincount(tiers, weights=value, minlength=len(TIERS))
+
+        actionable = np.flatnonzero(value > 0)
+        ids = (chunk[ID_COL].to_numpy()[actionable] if ID_COL in chunk.columns
+               else actionable + rows + 1)
+        candidates = {
+            ID_COL: ids,
+            "Churn_Probability": probs[actionable],
+            "tier": tiers[actionable],
+            "Expected_Saved_Value_INR": value[actionable],
+            "X": X[actionable],
+        }
+        if kept is not None:
+            candidates = {key: np.concatenate([kept[key], values])
+                          for key, values in candidates.items()}
+        keep = top_k(candidates["Expected_Saved_Value_INR"], k)
+        kept = {key: values[keep] for key, values in candidates.items()}
+
+        rows += len(chunk)
+        if progress is not None:
+            progress(rows)
+
+    kept = kept or {ID_COL: np.array([]), "Churn_Probability": np.array([], dtype=np.float32),
+                    "tier": np.array([], dtype=np.int8),
+                    "Expected_Saved_Value_INR": np.array([], dtype=np.float32),
+                    "X": np.empty((0, artifacts.transformer.n_features), dtype=np.float32)}
+
+    tier_names = np.array(TIERS, dtype=object)[kept["tier"]]
+    queue = pd.DataFrame({
+        "Rank": np.arange(1, len(kept[ID_COL]) + 1),
+        ID_COL: kept[ID_COL],
+        "Churn_Probability": kept["Churn_Probability"],
+        "Risk_Tier": tier_names,
+        "Actions": [", ".join(tier_actions.get(tier, [])) for tier in tier_names],
+        "Expected_Saved_Value_INR": np.round(kept["Expected_Saved_Value_INR"], 2),
+    })
+    if explainer is not None and len(queue):
+        for col, values in explainer.reason_columns(explainer.explain(kept["X"])).items():
+            queue[col] = values
+
+    return RetentionQueue(
+        queue,
+        dict(zip(TIERS, tier_counts.tolist())),
+        dict(zip(TIERS, tier_value.tolist())),
+        rows,
+        time.perf_counter() - start,
+        artifacts.model_version,
+    )
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    from artifacts import ARTIFACT_DIR, get_artifacts
+
+    parser = argparse.ArgumentParser(description="Score the customer book and build the retention queue")
+    parser.add_argument("input", help="CSV or Parquet file with raw customer columns")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_K, help="Customers in the queue")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument("--output", default="retention_queue", help="Folder for the queue pages")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--reasons", action="store_true",
+                        help="Add TreeSHAP reason codes for the queued customers")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    parser.add_argument("--engine", choices=ENGINES, default=ENGINE)
+    args = parser.parse_args()
+
+    artifacts = get_artifacts(args.artifacts)
+    explainer = None
+    if args.reasons:
+        from explain import get_explainer
+
+        explainer = get_explainer(artifacts)
+
+    result = build_queue(args.input, artifacts, k=args.top, chunksize=args.chunksize,
+                         explainer=explainer, engine=args.engine)
+    start = time.perf_counter()
+    paths = result.export_pages(args.output, args.page_size, args.format)
+    export_seconds = time.perf_counter() - start
+
+    print(f"Scored {result.rows:,} customers in {result.seconds:.2f}s "
+          f"({result.rows / max(result.seconds, 1e-9):,.0f} rows/s)")
+    for tier in reversed(TIERS):
+        print(f"  {tier:>6}: {result.tier_counts[tier]:>12,} customers | "
+              f"expected saved value INR {result.tier_value[tier]:>16,.0f}")
+    print(f"Queue: {len(result.queue):,} customers in {len(paths)} pages under {args.output} "
+          f"({export_seconds:.2f}s)")
@@ -0,0 +1,232 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from batch_scoring import ID_COL
+from data_access import DATA_DIR, MONEY_COLS
+from features import CAT_COLS, RAW_NUM_COLS
+
+# ------------------ CONFIG ------------------
+# Last score of every customer: Customer_ID, Row_Hash, Churn_Probability, Model_Version
+STORE_PATH = os.environ.get("CHURN_SCORE_STORE", os.path.join(DATA_DIR, "score_store.parquet"))
+
+# The 11 raw inputs; the 4 engineered inputs are pure functions of them, so a
+# row hashes the same exactly when all 15 model inputs are the same
+HASH_COLS = RAW_NUM_COLS + CAT_COLS
+
+# Rows scored to estimate the per-row cost when a run rescores (almost) nobody
+COST_SAMPLE_ROWS = 10_000
+
+STORE_COLS = [ID_COL, "Row_Hash", "Churn_Probability", "Model_Version"]
+
+
+# ------------------ HASHING ------------------
+def row_hashes(df):
+    """uint64 hash of each customer's model inputs, stable across CSV / Parquet dtypes.
+
+    Integers hash as int64, money as float32 (the precision the model sees,
+    so CSV float64 and downcast Parquet agree), and text the same whether it
+    is object or categorical.
+    """
+    columns = {}
+    for col in HASH_COLS:
+        values = df[col]
+        if col in CAT_COLS:
+            columns[col] = values.astype(str) if not isinstance(values.dtype, pd.CategoricalDtype) else values
+        elif col in MONEY_COLS or pd.api.types.is_float_dtype(values):
+            columns[col] = values.to_numpy(dtype=np.float32)
+        else:
+            columns[col] = values.to_numpy(dtype=np.int64)
+    return pd.util.hash_pandas_object(pd.DataFrame(columns), index=False).to_numpy()
+
+
+# ------------------ STORE ------------------
+def empty_store():
+    return pd.DataFrame({
+        ID_COL: np.array([], dtype=np.int64),
+        "Row_Hash": np.array([], dtype=np.uint64),
+        "Churn_Probability": np.array([], dtype=np.float32),
+        "Model_Version": pd.Categorical([]),
+    })
+
+
+def load_store(path=STORE_PATH):
+    """The stored scores sorted by Customer_ID (empty on the first run)."""
+    if not os.path.exists(path):
+        return empty_store()
+    return pd.read_parquet(path, columns=STORE_COLS)
+
+
+def save_store(store, path=STORE_PATH):
+    """Write the store via a temp file, so a crash never leaves it half written."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    store.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+# ------------------ INCREMENTAL SCORING ------------------
+def diff_against_store(ids, hashes, store, model_version):
+    """Per incoming customer: store row to reuse (-1 if none) and whether it must be rescored.
+
+    Rows are reused only when the customer is known, the hash matches and the
+    stored score came from the same model version. One searchsorted over the
+    sorted store IDs, no Python loops.
+    """
+    store_ids = store[ID_COL].to_numpy()
+    pos = np.searchsorted(store_ids, ids)
+    pos_safe = np.minimum(pos, max(len(store_ids) - 1, 0))
+
+    if len(store_ids):
+        known = store_ids[pos_safe] == ids
+        same_hash = store["Row_Hash"].to_numpy()[pos_safe] == hashes
+        same_model = (store["Model_Version"].astype(str).to_numpy() == model_version)[pos_safe]
+    else:
+        known = same_hash = same_model = np.zeros(len(ids), dtype=bool)
+
+    reuse = known & same_hash & same_model
+    counts = {
+        "new": int((~known).sum()),
+        "changed": int((known & ~same_hash).sum()),
+        "model_changed": int((known & same_hash & ~same_model).sum()),
+        "unchanged": int(reuse.sum()),
+    }
+    return np.where(reuse, pos_safe, -1), ~reuse, counts
+
+
+def score_incremental(df, artifacts, store=None, threshold=None):
+    """Score a full daily snapshot, re-predicting only new / changed customers.
+
+    Every customer is rescored when the model version differs from the one
+    their stored score came from. Returns (scored frame, new store, report);
+    customers missing from the snapshot drop out of the new store.
+    """
+    start = time.perf_counter()
+    store = empty_store() if store is None else store
+    threshold = artifacts.thresholds["decision"] if threshold is None else threshold
+
+    if ID_COL not in df.columns:
+        raise ValueError(f"Incremental scoring needs a {ID_COL} column")
+    ids = df[ID_COL].to_numpy(dtype=np.int64)
+    order = np.argsort(ids, kind="stable")
+    if len(ids) > 1 and (np.diff(ids[order]) == 0).any():
+        raise ValueError(f"{ID_COL} must be unique within a snapshot")
+
+    hashes = row_hashes(df)
+    store_rows, rescore, counts = diff_against_store(ids, hashes, store, artifacts.model_version)
+    diff_seconds = time.perf_counter() - start
+
+    probs = np.empty(len(df), dtype=np.float32)
+    reused = store_rows >= 0
+    probs[reused] = store["Churn_Probability"].to_numpy()[store_rows[reused]]
+
+    score_start = time.perf_counter()
+    rescore_rows = np.flatnonzero(rescore)
+    if len(rescore_rows):
+        X = artifacts.transformer.transform(df.iloc[rescore_rows])
+        probs[rescore_rows] = artifacts.model.get_booster().inplace_predict(X)
+    score_seconds = time.perf_counter() - score_start
+    sample_seconds = 0.0
+
+    # Per-row model cost, to price what scoring everyone would have taken
+    if len(rescore_rows) >= COST_SAMPLE_ROWS or len(rescore_rows) == len(df):
+        per_row = score_seconds / max(len(rescore_rows), 1)
+    else:
+        sample = df.iloc[:COST_SAMPLE_ROWS]
+        sample_start = time.perf_counter()
+        artifacts.model.get_booster().inplace_predict(artifacts.transformer.transform(sample))
+        sample_seconds = time.perf_counter() - sample_start
+        per_row = sample_seconds / max(len(sample), 1)
+
+    new_store = pd.DataFrame({
+        ID_COL: ids[order],
+        "Row_Hash": hashes[order],
+        "Churn_Probability": probs[order],
+        "Model_Version": pd.Categorical.from_codes(
+            np.zeros(len(ids), dtype=np.int8), [artifacts.model_version]
+        ),
+    })
+
+    scored = pd.DataFrame({
+        ID_COL: ids,
+        "Churn_Probability": probs,
+        "Churn_Prediction": (probs > threshold).astype(np.int8),
+    })
+
+    seconds = time.perf_counter() - start - sample_seconds
+    full_seconds = per_row * len(df)
+    report = dict(
+        counts,
+        rows=len(df),
+        rescored=len(rescore_rows),
+        rescored_fraction=len(rescore_rows) / max(len(df), 1),
+        dropped=int(len(store) - counts["unchanged"] - counts["changed"] - counts["model_changed"]),
+        diff_seconds=diff_seconds,
+        score_seconds=score_seconds,
+        seconds=seconds,
+        full_rescore_seconds=full_seconds,
+        seconds_saved=full_seconds - seconds,
+    )
+    return scored, new_store, report
+
+
+def print_report(report):
+    print(f"{report['rows']:,} customers: {report['new']:,} new, {report['changed']:,} changed, "
+          f"{report['model_changed']:,} on an older model, {report['unchanged']:,} reused, "
+          f"{report['dropped']:,} dropped from the store")
+    print(f"Rescored {report['rescored']:,} ({report['rescored_fraction']:.1%}) in "
+          f"{report['seconds']:.2f}s (hash + diff {report['diff_seconds']:.2f}s, "
+          f"model {report['score_seconds']:.2f}s); rescoring everyone: "
+          f"~{report['full_rescore_seconds']:.2f}s, saved ~{report['seconds_saved']:.2f}s")
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    from artifacts import ARTIFACT_DIR, get_artifacts
+    from training import load_training_frame
+
+    parser = argparse.ArgumentParser(description="Daily incremental churn scoring")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score_cmd = commands.add_parser("score", help="Score a daily snapshot against the store")
+    score_cmd.add_argument("input", help="CSV or Parquet snapshot with Customer_ID and raw columns")
+    score_cmd.add_argument("output", help="Where to write the scored CSV / Parquet file")
+    score_cmd.add_argument("--store", default=STORE_PATH)
+    score_cmd.add_argument("--artifacts", default=ARTIFACT_DIR)
+
+    bench_cmd = commands.add_parser("benchmark", help="Day 1 full run, then day 2 with a few changes")
+    bench_cmd.add_argument("--rows", type=int, default=1_000_000)
+    bench_cmd.add_argument("--changed", type=float, default=0.02, help="Share of customers changed")
+
+    args = parser.parse_args()
+
+    if args.command == "score":
+        artifacts = get_artifacts(args.artifacts)
+        df = load_training_frame(args.input)
+        scored, store, report = score_incremental(df, artifacts, load_store(args.store))
+
+        if args.output.lower().endswith(".parquet"):
+            scored.to_parquet(args.output, index=False)
+        else:
+            scored.to_csv(args.output, index=False)
+        save_store(store, args.store)
+        print_report(report)
+
+    else:
+        from synthetic_data import load_customers
+
+        artifacts = get_artifacts()
+        day1 = load_customers(args.rows)
+        print("Day 1 (empty store):")
+        _, store, report = score_incremental(day1, artifacts)
+        print_report(report)
+
+        rng = np.random.default_rng(0)
+        day2 = day1.copy()
+        moved = rng.choice(len(day2), int(len(day2) * args.changed), replace=False)
+        day2.loc[day2.index[moved], "Balance_INR"] += np.float32(1_000)
+        print(f"\nDay 2 ({args.changed:.0%} of balances changed):")
+        _, store, report = score_incremental(day2, artifacts, store)
+        print_report(report)
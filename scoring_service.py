@@ -0,0 +1,191 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+import numpy as np
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from artifacts import get_artifacts
+from features import CAT_COLS, RAW_NUM_COLS
+from micro_batcher import MAX_BATCH, MAX_WAIT_MS
+
+
+# ------------------ REQUEST SCHEMA ------------------
+class Customer(BaseModel):
+    Age: float
+    Tenure_Years: float
+    Balance_INR: float
+    Num_Products: float
+    Has_Credit_Card: int
+    Is_Active_Member: int
+    Estimated_Salary_INR: float
+    Credit_Score: float
+    Gender: str
+    State: str
+    Account_Type: str
+
+
+class CustomerBatch(BaseModel):
+    customers: list[Customer]
+
+
+# ------------------ MICRO-BATCHER ------------------
+class AsyncMicroBatcher:
+    """Coalesces concurrent requests into one model call.
+
+    Requests queue up until MAX_BATCH rows are waiting or the oldest has
+    waited MAX_WAIT_MS; the whole batch is then transformed and scored in a
+    worker thread so the event loop keeps accepting requests. Collection runs
+    on the event loop itself: handing rows to micro_batcher's thread instead
+    costs a GIL hand-off per request and halves throughput here.
+    """
+
+    def __init__(self, artifacts, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.artifacts = artifacts
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.stats = {"batches": 0, "rows": 0}
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def submit(self, rows):
+        """Queue a list of customer dicts; resolves to their probabilities."""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    def _score(self, rows):
+        columns = {col: [row[col] for row in rows] for col in RAW_NUM_COLS + CAT_COLS}
+        X = self.artifacts.transformer.transform(columns)
+        return self.artifacts.model.get_booster().inplace_predict(X)
+
+    async def _collect(self, loop):
+        pending = [await self.queue.get()]
+        size = len(pending[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while size < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            pending.append(item)
+            size += len(item[0])
+        return pending
+
+    async def _flush(self, loop, pending):
+        rows = [row for item_rows, _ in pending for row in item_rows]
+        probs = await loop.run_in_executor(None, self._score, rows)
+
+        self.stats["batches"] += 1
+        self.stats["rows"] += len(rows)
+
+        offset = 0
+        for item_rows, future in pending:
+            # Callers that timed out or disconnected have cancelled their future
+            if not future.done():
+                future.set_result(probs[offset:offset + len(item_rows)])
+            offset += len(item_rows)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = []
+            try:
+                pending = await self._collect(loop)
+                await self._flush(loop, pending)
+            except Exception as exc:
+                # One bad batch fails its own requests; the collector keeps running
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(exc)
+
+
+# ------------------ APP ------------------
+state = {"ready": False}
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Same artifacts (and loader) as 5.Live_prediction.py, loaded once at startup
+    state["artifacts"] = get_artifacts()
+    state["batcher"] = AsyncMicroBatcher(state["artifacts"])
+    state["batcher"].start()
+    state["started"] = time.time()
+    state["ready"] = True
+    yield
+    state["ready"] = False
+    await state["batcher"].stop()
+
+
+app = FastAPI(title="India Bank Churn Scoring Service", lifespan=lifespan)
+
+
+def _results(probs):
+    version = state["artifacts"].model_version
+    threshold = state["artifacts"].thresholds["decision"]
+    return [
+        {
+            "churn_probability": float(prob),
+            "churn_prediction": int(prob > threshold),
+            "model_version": version,
+        }
+        for prob in np.asarray(probs)
+    ]
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    if not state["ready"]:
+        raise HTTPException(status_code=503, detail="Model not loaded")
+    if not state["batcher"].running:
+        raise HTTPException(status_code=503, detail="Scoring task stopped")
+    return {
+        "status": "ready",
+        "model_version": state["artifacts"].model_version,
+        "uptime_seconds": round(time.time() - state["started"], 1),
+        "batches": state["batcher"].stats["batches"],
+        "rows_scored": state["batcher"].stats["rows"],
+    }
+
+
+@app.post("/predict")
+async def predict(customer: Customer):
+    probs = await state["batcher"].submit([customer.model_dump()])
+    return _results(probs)[0]
+
+
+@app.post("/predict/batch")
+async def predict_batch(batch: CustomerBatch):
+    if not batch.customers:
+        return {"predictions": []}
+    probs = await state["batcher"].submit([c.model_dump() for c in batch.customers])
+    return {"predictions": _results(probs)}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=os.environ.get("CHURN_HOST", "127.0.0.1"),
+                port=int(os.environ.get("CHURN_PORT", 8000)))
@@ -0,0 +1,274 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_access import DATA_DIR, downcast
+
+# ------------------ SCHEMA ------------------
+# Same columns and category values as the bank's churn CSV
+GENDERS = ["Female", "Male"]
+STATES = [
+    "Delhi", "Gujarat", "Karnataka", "Maharashtra",
+    "Tamil Nadu", "Telangana", "Uttar Pradesh", "West Bengal"
+]
+ACCOUNT_TYPES = ["Current", "Salary", "Savings"]
+CATEGORIES = {"Gender": GENDERS, "State": STATES, "Account_Type": ACCOUNT_TYPES}
+
+# Column order of the bank's CSV
+COLUMNS = [
+    "Customer_ID", "Age", "Gender", "State", "Account_Type", "Tenure_Years",
+    "Balance_INR", "Num_Products", "Has_Credit_Card", "Is_Active_Member",
+    "Estimated_Salary_INR", "Credit_Score", "Churn"
+]
+
+# ------------------ CALIBRATION ------------------
+# Marginals of the real file (training notebook describe() and the fitted
+# scaler's means / SDs): uniform ages, tenures and product counts, gamma
+# balances, uniform salaries, normal credit scores
+FIRST_ID = 1_000_001
+AGE_RANGE = (18, 74)
+TENURE_RANGE = (0, 14)
+NUM_PRODUCTS_RANGE = (1, 4)
+BALANCE_GAMMA = (2.0, 75_000.0)
+SALARY_RANGE = (120_000, 3_000_000)
+CREDIT_SCORE_NORMAL = (650.0, 80.0)
+CREDIT_SCORE_RANGE = (300, 900)
+HAS_CREDIT_CARD_RATE = 0.65
+ACTIVE_RATE = 0.60
+
+# Churn log-odds per segment. Inactivity and inactive high balances drive churn
+# (the tuned model's top features); this gives 27.8% churn for active and
+# 52.7% for inactive members, 37.8% overall, as in the real file
+HIGH_BALANCE_INR = 100_000
+CHURN_LOGIT_ACTIVE = -0.96
+CHURN_LOGIT_INACTIVE = -0.37
+CHURN_LOGIT_INACTIVE_HIGH_BALANCE = 0.41
+
+# Smaller, mean-centred effects on top of the segment log-odds
+CHURN_EFFECTS = {
+    "single_product": 0.35,
+    "tenure_year": -0.025,
+    "low_credit_score": 0.15,
+    "male": 0.027,
+}
+
+# The real file's figures, for `--check`
+REAL_STATS = {
+    "churn_rate": 0.3782,
+    "churn_rate_active": 0.2784,
+    "churn_rate_inactive": 0.5274,
+    "churn_rate_female": 0.3751,
+    "churn_rate_male": 0.3813,
+    "mean_age": 46.03,
+    "mean_balance_inr": 150_347.0,
+    "mean_salary_inr": 1_556_881.0,
+    "mean_credit_score": 649.42,
+    "low_credit_score_rate": 0.2654,
+    "high_balance_low_activity_rate": 0.2466,
+}
+
+# Rows generated (and written) per chunk
+CHUNK_ROWS = 1_000_000
+
+
+# ------------------ GENERATOR ------------------
+def _columns(rng, n_rows, first_id):
+    """One chunk of customers as NumPy arrays in the CSV's units; text columns as codes."""
+    gender = rng.integers(0, len(GENDERS), n_rows, dtype=np.int8)
+    tenure = rng.integers(TENURE_RANGE[0], TENURE_RANGE[1] + 1, n_rows, dtype=np.int8)
+    balance = np.round(rng.gamma(*BALANCE_GAMMA, n_rows), 2)
+    num_products = rng.integers(NUM_PRODUCTS_RANGE[0], NUM_PRODUCTS_RANGE[1] + 1, n_rows, dtype=np.int8)
+    active = (rng.random(n_rows, dtype=np.float32) < ACTIVE_RATE).astype(np.int8)
+    credit_score = np.clip(np.rint(rng.normal(*CREDIT_SCORE_NORMAL, n_rows)),
+                           *CREDIT_SCORE_RANGE).astype(np.int16)
+
+    inactive = active == 0
+    logit = np.where(
+        inactive,
+        np.where(balance > HIGH_BALANCE_INR, CHURN_LOGIT_INACTIVE_HIGH_BALANCE, CHURN_LOGIT_INACTIVE),
+        CHURN_LOGIT_ACTIVE,
+    ).astype(np.float32)
+    logit += CHURN_EFFECTS["single_product"] * ((num_products == 1) - np.float32(0.25))
+    logit += CHURN_EFFECTS["tenure_year"] * (tenure - np.float32(7.0))
+    logit += CHURN_EFFECTS["low_credit_score"] * ((credit_score < 600) - np.float32(0.266))
+    logit += CHURN_EFFECTS["male"] * (gender - np.float32(0.5))
+    churn = (rng.random(n_rows, dtype=np.float32) < 1 / (1 + np.exp(-logit))).astype(np.int8)
+
+    return {
+        "Customer_ID": np.arange(first_id, first_id + n_rows, dtype=np.int64),
+        "Age": rng.integers(AGE_RANGE[0], AGE_RANGE[1] + 1, n_rows, dtype=np.int8),
+        "Gender": gender,
+        "State": rng.integers(0, len(STATES), n_rows, dtype=np.int8),
+        "Account_Type": rng.integers(0, len(ACCOUNT_TYPES), n_rows, dtype=np.int8),
+        "Tenure_Years": tenure,
+        "Balance_INR": balance,
+        "Num_Products": num_products,
+        "Has_Credit_Card": (rng.random(n_rows, dtype=np.float32) < HAS_CREDIT_CARD_RATE).astype(np.int8),
+        "Is_Active_Member": active,
+        "Estimated_Salary_INR": rng.integers(SALARY_RANGE[0], SALARY_RANGE[1] + 1, n_rows),
+        "Credit_Score": credit_score,
+        "Churn": churn,
+    }
+
+
+def _chunks(n_rows, chunk_rows, seed, first_id):
+    """Column chunks; chunk i draws from its own seeded stream, so the data
+    only depends on (seed, chunk_rows)."""
+    for index, offset in enumerate(range(0, max(n_rows, 1), chunk_rows)):
+        rng = np.random.default_rng([seed, index])
+        yield _columns(rng, min(chunk_rows, n_rows - offset), first_id + offset)
+
+
+def _frame(columns):
+    df = pd.DataFrame({
+        col: pd.Categorical.from_codes(values, CATEGORIES[col]) if col in CATEGORIES else values
+        for col, values in columns.items()
+    })
+    return downcast(df)
+
+
+def iter_customers(n_rows, chunk_rows=CHUNK_ROWS, seed=42, first_id=FIRST_ID):
+    """Synthetic labelled customers as downcast DataFrames of up to chunk_rows rows."""
+    for columns in _chunks(n_rows, chunk_rows, seed, first_id):
+        yield _frame(columns)
+
+
+def generate_customers(n_rows, seed=42, first_id=FIRST_ID):
+    """Synthetic labelled customers following the churn CSV schema, already downcast."""
+    return pd.concat(iter_customers(n_rows, seed=seed, first_id=first_id), ignore_index=True)
+
+
+# ------------------ FILES ------------------
+def _arrow_table(columns, dictionary):
+    """Arrow table of one chunk; text columns dictionary-encoded (Parquet) or plain (CSV)."""
+    import pyarrow as pa
+
+    arrays = {}
+    for col, values in columns.items():
+        if col in CATEGORIES:
+            categories = pa.array(CATEGORIES[col])
+            codes = pa.array(values)
+            arrays[col] = (pa.DictionaryArray.from_arrays(codes, categories) if dictionary
+                           else categories.take(codes))
+        else:
+            arrays[col] = pa.array(values)
+    return pa.table(arrays)
+
+
+def write_customers(path, n_rows, chunk_rows=CHUNK_ROWS, seed=42, first_id=FIRST_ID,
+                    file_format=None):
+    """Write synthetic customers to CSV / Parquet chunk by chunk (memory stays at
+    two chunks). Returns rows, bytes, seconds, MB/s and rows/s.
+
+    The next chunk is generated on a helper thread while the current one is
+    written; NumPy and Arrow release the GIL, so the two overlap on multi-core
+    machines.
+    """
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    file_format = file_format or ("parquet" if str(path).lower().endswith(".parquet") else "csv")
+    parquet = file_format == "parquet"
+    tables = (_arrow_table(columns, dictionary=parquet)
+              for columns in _chunks(n_rows, chunk_rows, seed, first_id))
+
+    start = time.perf_counter()
+    writer = None
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(next, tables, None)
+            while True:
+                table = pending.result()
+                if table is None:
+                    break
+                pending = pool.submit(next, tables, None)
+                if writer is None:
+                    # Dictionary pages only for the text columns, min / max only for the ID
+                    writer = (pq.ParquetWriter(path, table.schema, compression="snappy",
+                                               use_dictionary=list(CATEGORIES),
+                                               write_statistics=["Customer_ID"])
+                              if parquet else pa_csv.CSVWriter(path, table.schema))
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {
+        "rows": n_rows,
+        "bytes": size,
+        "seconds": seconds,
+        "mb_per_sec": size / 1e6 / seconds if seconds > 0 else 0.0,
+        "rows_per_sec": n_rows / seconds if seconds > 0 else 0.0,
+    }
+
+
+def customers_file(n_rows, file_format="parquet", seed=42, folder=None):
+    """Path of a synthetic customer file, written on first use and reused after.
+
+    The benchmark CLIs share one file per (rows, seed, format) through this
+    and load_customers(), so the data is generated once, not per run.
+    """
+    folder = folder or os.path.join(DATA_DIR, "synthetic")
+    path = os.path.join(folder, f"customers_{n_rows}_{seed}.{file_format}")
+    if not os.path.exists(path):
+        os.makedirs(folder, exist_ok=True)
+        # Written next to it and swapped in, so a crash never leaves a half file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        write_customers(tmp_path, n_rows, seed=seed, file_format=file_format)
+        os.replace(tmp_path, path)
+    return path
+
+
+def load_customers(n_rows, seed=42):
+    """customers_file(n_rows) as a downcast frame: the same rows as
+    generate_customers(n_rows, seed), read from the shared cached file."""
+    return downcast(pd.read_parquet(customers_file(n_rows, "parquet", seed)))
+
+
+# ------------------ CALIBRATION CHECK ------------------
+def calibration_stats(df):
+    """The REAL_STATS figures measured on a generated frame."""
+    churn = df["Churn"].to_numpy()
+    active = df["Is_Active_Member"].to_numpy() == 1
+    male = (df["Gender"] == "Male").to_numpy()
+    balance = df["Balance_INR"].to_numpy(dtype=np.float64)
+    return {
+        "churn_rate": churn.mean(),
+        "churn_rate_active": churn[active].mean(),
+        "churn_rate_inactive": churn[~active].mean(),
+        "churn_rate_female": churn[~male].mean(),
+        "churn_rate_male": churn[male].mean(),
+        "mean_age": df["Age"].mean(),
+        "mean_balance_inr": balance.mean(),
+        "mean_salary_inr": df["Estimated_Salary_INR"].to_numpy(dtype=np.float64).mean(),
+        "mean_credit_score": df["Credit_Score"].mean(),
+        "low_credit_score_rate": (df["Credit_Score"].to_numpy() < 600).mean(),
+        "high_balance_low_activity_rate": ((balance > HIGH_BALANCE_INR) & ~active).mean(),
+    }
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic churn CSV / Parquet file")
+    parser.add_argument("output", help="Output file; .parquet for Parquet, anything else for CSV")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--check", action="store_true",
+                        help="Compare the first chunk with the real file's figures")
+    args = parser.parse_args()
+
+    stats = write_customers(args.output, args.rows, args.chunk_rows, args.seed)
+    print(f"Wrote {stats['rows']:,} rows ({stats['bytes'] / 1e6:,.0f} MB) to {args.output} in "
+          f"{stats['seconds']:.2f}s: {stats['mb_per_sec']:,.0f} MB/s, {stats['rows_per_sec']:,.0f} rows/s")
+
+    if args.check:
+        measured = calibration_stats(next(iter_customers(args.rows, args.chunk_rows, args.seed)))
+        for key, real in REAL_STATS.items():
+            print(f"  {key:<32} real {real:>14,.4f} | synthetic {measured[key]:>14,.4f}")
@@ -0,0 +1,235 @@
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+# ------------------ COST TABLE ------------------
+# Average value (INR) of keeping a customer who would otherwise have churned
+RETAINED_CUSTOMER_VALUE_INR = 20_000
+
+# Per retention action: cost per customer targeted, and the share of
+# would-be churners it keeps
+ACTION_COSTS = {
+    "rm_intervention": {"cost_inr": 2_000, "save_rate": 0.30},
+    "fee_waiver": {"cost_inr": 1_000, "save_rate": 0.20},
+    "engagement_offer": {"cost_inr": 250, "save_rate": 0.08},
+}
+
+# Risk tier -> actions it triggers (the lists on 6.Retention_strategy.py)
+TIER_ACTIONS = {
+    "high": ["rm_intervention", "fee_waiver"],
+    "medium": ["engagement_offer"],
+}
+
+# Used when the deployed artifact carries no thresholds (e.g. the legacy pickles):
+# model.predict's 0.5 and the live prediction page's original 40% / 70% bands
+DEFAULT_THRESHOLDS = {"decision": 0.5, "medium": 0.4, "high": 0.7}
+
+# The retention strategy page's own original bands (30% / 60%), kept there
+# until thresholds.py has chosen bands for the deployed model
+DEFAULT_STRATEGY_BANDS = {"medium": 0.30, "high": 0.60}
+
+# Points of the threshold grid stored in the manifest for charts
+CURVE_POINTS = 101
+
+
+def tier_economics(action_costs=ACTION_COSTS, tier_actions=TIER_ACTIONS):
+    """Per tier: combined cost per customer and share of churners kept."""
+    tiers = {}
+    for tier, actions in tier_actions.items():
+        missed = 1.0
+        for action in actions:
+            missed *= 1 - action_costs[action]["save_rate"]
+        tiers[tier] = {
+            "cost_inr": sum(action_costs[action]["cost_inr"] for action in actions),
+            "save_rate": 1 - missed,
+        }
+    return tiers
+
+
+# ------------------ CURVES ------------------
+def rank_scores(y_true, probs):
+    """Scores sorted high -> low and the running count of churners: the one O(n log n) step."""
+    order = np.argsort(-np.asarray(probs, dtype=np.float64), kind="stable")
+    scores = np.asarray(probs, dtype=np.float64)[order]
+    true_positives = np.cumsum(np.asarray(y_true)[order] == 1)
+    return scores, true_positives
+
+
+def _metrics(true_positives, flagged, positives, tiers, customer_value):
+    flagged_safe = np.maximum(flagged, 1)
+    metrics = {
+        "flagged": flagged,
+        "precision": np.where(flagged > 0, true_positives / flagged_safe, 1.0),
+        "recall": true_positives / positives if positives else np.zeros(len(flagged)),
+        "f1": 2 * true_positives / np.maximum(flagged + positives, 1),
+    }
+    for tier, economics in tiers.items():
+        # Targeting everyone flagged with this tier's actions
+        metrics[f"net_value_{tier}_inr"] = (
+            true_positives * customer_value * economics["save_rate"]
+            - flagged * economics["cost_inr"]
+        )
+    return metrics
+
+
+def threshold_curves(y_true, probs, tiers=None, customer_value=RETAINED_CUSTOMER_VALUE_INR,
+                     ranked=None):
+    """Precision, recall, F1 and per-tier net value at every distinct threshold.
+
+    Entry i flags the customers with probability > threshold[i]; entry 0
+    flags nobody. Thresholds sit halfway between consecutive distinct scores,
+    so `prob > threshold` and `prob >= threshold` flag the same customers.
+    `ranked` reuses a rank_scores() result instead of sorting again.
+    """
+    tiers = tier_economics() if tiers is None else tiers
+    scores, true_positives = ranked or rank_scores(y_true, probs)
+
+    # Cut only where the score changes, so ties are flagged together
+    cuts = np.flatnonzero(np.r_[scores[1:] != scores[:-1], True])
+    # Last cut flags everyone, customers scored exactly 0 included
+    below = np.r_[scores[cuts[1:]], min(0.0, scores[-1] - 1e-6)]
+    thresholds = np.r_[1.0, (scores[cuts] + below) / 2]
+
+    true_positives = np.r_[0, true_positives[cuts]]
+    flagged = np.r_[0, cuts + 1]
+    curves = _metrics(true_positives, flagged, true_positives[-1], tiers, customer_value)
+    curves["threshold"] = thresholds
+    return curves
+
+
+def curves_on_grid(y_true, probs, tiers=None, customer_value=RETAINED_CUSTOMER_VALUE_INR,
+                   points=CURVE_POINTS, ranked=None):
+    """The same curves at evenly spaced thresholds (compact enough for the manifest)."""
+    tiers = tier_economics() if tiers is None else tiers
+    scores, true_positives = ranked or rank_scores(y_true, probs)
+    grid = np.linspace(0.0, 1.0, points)
+
+    flagged = np.searchsorted(-scores, -grid, side="left")
+    flagged_tp = np.where(flagged > 0, true_positives[np.maximum(flagged - 1, 0)], 0)
+    positives = true_positives[-1] if len(true_positives) else 0
+    curves = _metrics(flagged_tp, flagged, positives, tiers, customer_value)
+    curves["threshold"] = grid
+    return {key: np.round(values, 6).tolist() for key, values in curves.items()}
+
+
+# ------------------ CHOICE ------------------
+def choose_thresholds(curves):
+    """Decision cut-off (best F1) and the medium / high action bands (best total net value).
+
+    Customers above `high` get the high-tier actions, those between
+    `medium` and `high` the medium-tier ones. For every possible `high` the
+    best `medium` is a suffix maximum, so the search is O(n), not O(n^2).
+    """
+    high_value = curves["net_value_high_inr"]
+    medium_value = curves["net_value_medium_inr"]
+
+    best_medium_from = np.maximum.accumulate(medium_value[::-1])[::-1]
+    total = high_value - medium_value + best_medium_from
+    high_idx = int(np.argmax(total))
+    medium_idx = high_idx + int(np.argmax(medium_value[high_idx:]))
+    decision_idx = int(np.argmax(curves["f1"]))
+
+    return {
+        "decision": float(curves["threshold"][decision_idx]),
+        "medium": float(curves["threshold"][medium_idx]),
+        "high": float(curves["threshold"][high_idx]),
+        "decision_precision": float(curves["precision"][decision_idx]),
+        "decision_recall": float(curves["recall"][decision_idx]),
+        "decision_f1": float(curves["f1"][decision_idx]),
+        "flagged_high": int(curves["flagged"][high_idx]),
+        "flagged_medium": int(curves["flagged"][medium_idx] - curves["flagged"][high_idx]),
+        "expected_net_value_inr": float(total[high_idx]),
+    }
+
+
+def optimize_thresholds(y_true, probs, action_costs=ACTION_COSTS, tier_actions=TIER_ACTIONS,
+                        customer_value=RETAINED_CUSTOMER_VALUE_INR):
+    """Everything saved into the bundle manifest under "thresholds"."""
+    tiers = tier_economics(action_costs, tier_actions)
+    ranked = rank_scores(y_true, probs)
+    chosen = choose_thresholds(threshold_curves(y_true, probs, tiers, customer_value, ranked))
+    return dict(
+        chosen,
+        holdout_rows=int(len(probs)),
+        computed_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        customer_value_inr=customer_value,
+        action_costs=action_costs,
+        tier_actions=tier_actions,
+        curve=curves_on_grid(y_true, probs, tiers, customer_value, ranked=ranked),
+    )
+
+
+def artifact_thresholds(manifest=None):
+    """Thresholds of a loaded artifact, falling back to DEFAULT_THRESHOLDS."""
+    saved = (manifest or {}).get("thresholds") or {}
+    return dict(DEFAULT_THRESHOLDS, **saved)
+
+
+def strategy_thresholds(thresholds):
+    """Bands for the retention strategy page: the optimised ones once
+    thresholds.py has run, the page's original DEFAULT_STRATEGY_BANDS before."""
+    if "computed_at" in thresholds:
+        return thresholds
+    return dict(thresholds, **DEFAULT_STRATEGY_BANDS)
+
+
+# ------------------ CLI ------------------
+if __name__ == "__main__":
+    from sklearn.model_selection import train_test_split
+
+    from artifacts import ARTIFACT_DIR, load_artifacts
+    from pipeline_bundle import BUNDLE_FILE, update_manifest
+    from training import RANDOM_STATE, TARGET_COL, TEST_SIZE, load_training_frame
+
+    parser = argparse.ArgumentParser(description="Choose churn thresholds from holdout cost curves")
+    parser.add_argument("--data", default=None,
+                        help="Labelled churn CSV / Parquet; its 20%% test split is the holdout")
+    parser.add_argument("--costs", default=None,
+                        help="JSON with action_costs / tier_actions / customer_value_inr overrides")
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR)
+    parser.add_argument("--dry-run", action="store_true", help="Print, do not save")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.costs:
+        with open(args.costs) as f:
+            overrides = json.load(f)
+
+    artifacts = load_artifacts(args.artifacts)
+    df = load_training_frame(args.data)
+    _, test_rows = train_test_split(np.arange(len(df)), test_size=TEST_SIZE,
+                                    random_state=RANDOM_STATE)
+    holdout = df.iloc[np.sort(test_rows)]
+    probs = artifacts.model.get_booster().inplace_predict(artifacts.transformer.transform(holdout))
+    y_true = holdout[TARGET_COL].to_numpy()
+
+    start = time.perf_counter()
+    thresholds = optimize_thresholds(
+        y_true, probs,
+        overrides.get("action_costs", ACTION_COSTS),
+        overrides.get("tier_actions", TIER_ACTIONS),
+        overrides.get("customer_value_inr", RETAINED_CUSTOMER_VALUE_INR),
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Model {artifacts.model_version} | {len(probs):,} holdout rows | "
+          f"curves + choice in {elapsed * 1000:.1f} ms")
+    print(f"Decision threshold {thresholds['decision']:.3f} (best F1): precision "
+          f"{thresholds['decision_precision']:.3f}, recall {thresholds['decision_recall']:.3f}, "
+          f"F1 {thresholds['decision_f1']:.3f}")
+    print(f"Bands: medium > {thresholds['medium']:.3f} ({thresholds['flagged_medium']:,} customers), "
+          f"high > {thresholds['high']:.3f} ({thresholds['flagged_high']:,} customers), "
+          f"expected net value INR {thresholds['expected_net_value_inr']:,.0f}")
+
+    bundle_path = os.path.join(args.artifacts, BUNDLE_FILE)
+    if args.dry_run:
+        pass
+    elif artifacts.manifest is None:
+        print(f"No {BUNDLE_FILE} to save into; run `python pipeline_bundle.py export` first")
+    else:
+        update_manifest(bundle_path, {"thresholds": thresholds})
+        print(f"Saved thresholds into {bundle_path}")